@@ -0,0 +1,125 @@
+"""Time the repository page extraction on a corpus of saved pages.
+
+Compares the single-pass `extract_page_record` with the previous
+implementation, which serialized every table, cell and span to search
+its HTML, and checks that all installed parser backends produce the
+same records. Pages can be saved .html files or the bodies in the HTTP cache:
+
+    python scripts/benchmark_extraction.py ./storage/http_cache
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Any
+
+import bs4
+
+from paper_crawler._parse import available_backends, make_soup
+from paper_crawler.filter_and_download_links import REPO_PAGE_TAGS
+from paper_crawler.repo_pages import extract_page_record
+
+
+def _reference_record(soup: bs4.BeautifulSoup) -> dict[str, Any]:
+    """Extract a page record the way process_pages used to."""
+    folders_and_files = list(
+        filter(lambda table: "folders-and-files" in str(table), soup.find_all("table"))
+    )[0]
+    cells = list(
+        filter(lambda td: "row-name-cell" in str(td), folders_and_files.find_all("td"))
+    )
+    folders = []
+    files = []
+    for cell in cells:
+        if "icon-directory" in str(cell):
+            folders.append(cell.text)
+        else:
+            files.append(cell.text)
+    cell_links = []
+    for cell in cells:
+        anchor = cell.find("a")
+        href = anchor.get("href") if isinstance(anchor, bs4.element.Tag) else None
+        cell_links.append([cell.text, href])
+    python = any(map(lambda span: "Python" in str(span), soup.find_all("span")))
+    return {
+        "folders": folders,
+        "files": files,
+        "cell_links": cell_links,
+        "python": python,
+    }
+
+
+def _load_corpus(corpus: Path) -> list[bytes]:
+    pages = []
+    for path in sorted(list(corpus.glob("**/*.html")) + list(corpus.glob("**/*.body"))):
+        content = path.read_bytes()
+        # the cache holds PDFs and listing pages as well.
+        if b"folders-and-files" in content:
+            pages.append(content)
+    return pages
+
+
+def _try_record(soup: bs4.BeautifulSoup) -> Any:
+    try:
+        return extract_page_record(soup)
+    except IndexError:
+        return None
+
+
+def _compare_parsers(pages: list[bytes], repeat: int) -> None:
+    """Time every backend and count pages whose records differ from html.parser."""
+    reference = [_try_record(make_soup(page, backend="html.parser")) for page in pages]
+    for backend in available_backends():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            soups = [
+                make_soup(page, only=REPO_PAGE_TAGS, backend=backend) for page in pages
+            ]
+            best = min(best, time.perf_counter() - start)
+        mismatches = sum(
+            _try_record(soup) != record for soup, record in zip(soups, reference)
+        )
+        print(
+            f"{backend}: {1000 * best / len(pages):.2f} ms per page to parse,"
+            f" {mismatches} pages with different results."
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark page extraction.")
+    parser.add_argument("corpus", type=Path, help="Folder with saved repo pages.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions.")
+    args = parser.parse_args()
+
+    pages = _load_corpus(args.corpus)
+    print(f"Loaded {len(pages)} repository pages.")
+    if not pages:
+        raise SystemExit("No pages with a folders-and-files table found.")
+    _compare_parsers(pages, args.repeat)
+    soups = [make_soup(page, backend="html.parser") for page in pages]
+
+    mismatches = 0
+    for soup in soups:
+        try:
+            reference = _reference_record(soup)
+        except IndexError:
+            continue
+        if reference != extract_page_record(soup):
+            mismatches += 1
+    print(f"Pages with different results: {mismatches}.")
+
+    for name, extract in [
+        ("before", _reference_record),
+        ("after", extract_page_record),
+    ]:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            for soup in soups:
+                try:
+                    extract(soup)
+                except IndexError:
+                    pass
+            best = min(best, time.perf_counter() - start)
+        print(f"{name}: {1000 * best / len(soups):.2f} ms per page.")
@@ -0,0 +1,75 @@
+"""Compare the fast GitHub URL scan with pdfx on a corpus of PDFs.
+
+Counts how many of the GitHub URLs pdfx finds the fast scan finds as
+well, how often `process_link` would fall back to pdfx, and how many
+PDFs per second each extractor handles. PDFs can be .pdf files or the
+bodies in the HTTP cache:
+
+    python scripts/benchmark_pdf_links.py ./storage/http_cache
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import pdfx
+
+from paper_crawler._pdf_links import find_github_urls
+
+
+def _load_corpus(corpus: Path) -> list[Path]:
+    paths = []
+    for path in sorted(list(corpus.glob("**/*.pdf")) + list(corpus.glob("**/*.body"))):
+        # the cache holds HTML pages as well.
+        with open(path, "rb") as f_read:
+            if f_read.read(5) == b"%PDF-":
+                paths.append(path)
+    return paths
+
+
+def _pdfx_github_urls(path: Path) -> set[str]:
+    try:
+        urls = pdfx.PDFx(str(path)).get_references_as_dict().get("url", [])
+    except Exception:
+        return set()
+    return {url for url in urls if "http" in url and "github" in url}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GitHub URL extraction.")
+    parser.add_argument("corpus", type=Path, help="Folder with saved PDFs.")
+    args = parser.parse_args()
+
+    paths = _load_corpus(args.corpus)
+    print(f"Loaded {len(paths)} PDFs.")
+    if not paths:
+        raise SystemExit("No PDFs found.")
+
+    start = time.perf_counter()
+    fast = [set(find_github_urls(path.read_bytes())) for path in paths]
+    fast_time = time.perf_counter() - start
+    reference = []
+    pdfx_times = []
+    for path in paths:
+        start = time.perf_counter()
+        reference.append(_pdfx_github_urls(path))
+        pdfx_times.append(time.perf_counter() - start)
+
+    total = sum(len(expected) for expected in reference)
+    found = sum(len(urls & expected) for urls, expected in zip(fast, reference))
+    extra = sum(len(urls - expected) for urls, expected in zip(fast, reference))
+    # process_link runs pdfx whenever the fast scan finds nothing.
+    fallbacks = [index for index, urls in enumerate(fast) if not urls]
+    combined_found = found + sum(len(reference[index]) for index in fallbacks)
+    combined_time = fast_time + sum(pdfx_times[index] for index in fallbacks)
+
+    print(f"pdfx: {len(paths) / sum(pdfx_times):.1f} PDFs/s, {total} GitHub URLs.")
+    print(
+        f"fast: {len(paths) / fast_time:.1f} PDFs/s, found {found} of them"
+        f" ({100 * found / max(total, 1):.1f}%) and {extra} URLs pdfx missed."
+    )
+    print(
+        f"fast with pdfx fallback: pdfx ran for {len(fallbacks)} PDFs,"
+        f" found {combined_found} ({100 * combined_found / max(total, 1):.1f}%),"
+        f" {len(paths) / combined_time:.1f} PDFs/s."
+    )
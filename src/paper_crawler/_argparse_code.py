@@ -1,6 +1,109 @@
 import argparse
 
 
+def _add_crawl_args(parser: argparse.ArgumentParser) -> None:
+    """Options shared by all stages."""
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of parallel downloads, one means sequential.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes parsing PDFs, one means sequential.",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=int,
+        default=0,
+        help="Give up on a single PDF after this many seconds, zero means never.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="./storage/http_cache",
+        help="Directory of the HTTP cache, an empty string disables caching.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=float,
+        default=20.0,
+        help="Maximum size of the HTTP cache in GB.",
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=None,
+        help="Revalidate cached pages older than this many days. Default: never.",
+    )
+    parser.add_argument(
+        "--repo-store",
+        type=str,
+        default="./storage/repo_store.sqlite",
+        help="Repository pages and statistics shared by all venues,"
+        " an empty string disables the store.",
+    )
+    parser.add_argument(
+        "--repo-max-age",
+        type=float,
+        default=None,
+        help="Download and analyse stored repositories again after this many days."
+        " Default: never.",
+    )
+    parser.add_argument(
+        "--results-store",
+        type=str,
+        default="./storage/results.sqlite",
+        help="Database with the results of all venues, an empty string disables it.",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=str,
+        action="append",
+        default=None,
+        help="Requests per second for a host, like openreview.net=2. Repeatable.",
+    )
+    parser.add_argument(
+        "--browsers",
+        type=int,
+        default=1,
+        help="Number of headless browsers probing sub-folders in parallel.",
+    )
+    parser.add_argument(
+        "--subfolders",
+        type=str,
+        choices=["http", "http-only", "browser"],
+        default="http",
+        help="Look into sub-folders via static pages, falling back to a browser"
+        " unless http-only, or always with a browser.",
+    )
+    parser.add_argument(
+        "--parser",
+        type=str,
+        choices=["html.parser", "lxml"],
+        default="html.parser",
+        help="The BeautifulSoup backend, lxml is much faster if installed.",
+    )
+    parser.add_argument(
+        "--pdf-extractor",
+        type=str,
+        choices=["fast", "pdfx"],
+        default="pdfx",
+        help="Always run pdfx, or scan the PDF for GitHub links first and"
+        " only run pdfx if there are none. fast is much quicker but can miss"
+        " links pdfx finds.",
+    )
+    parser.add_argument(
+        "--derive-pdf-urls",
+        action="store_true",
+        help="Build NeurIPS PDF links from the abstract links instead of"
+        " loading every abstract page. Skips supplementary PDFs.",
+    )
+
+
 def _parse_args() -> argparse.Namespace:
     """Cmd line args for filtering and downloading and analyzing ML-conferences."""
     parser = argparse.ArgumentParser(description="")
@@ -10,4 +113,82 @@ def _parse_args() -> argparse.Namespace:
         default="icml2024",
         help="Specify the venueid.",
     )
+    _add_crawl_args(parser)
+    return parser.parse_args()
+
+
+def _parse_run_all_args() -> argparse.Namespace:
+    """Cmd line args for running all stages of many venues at once."""
+    parser = argparse.ArgumentParser(description="Reproduce all venues.")
+    parser.add_argument(
+        "venues",
+        type=str,
+        nargs="*",
+        help="The venueids, all venues of the paper by default.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=8,
+        help="Number of stages running at the same time.",
+    )
+    parser.add_argument(
+        "--cpus",
+        type=int,
+        default=None,
+        help="Number of processes parsing PDFs for all venues. Default: all cores.",
+    )
+    parser.add_argument(
+        "--connections",
+        type=int,
+        default=32,
+        help="Budget of parallel downloads shared by all running stages.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only print the stages that are not up to date.",
+    )
+    _add_crawl_args(parser)
+    return parser.parse_args()
+
+
+def _parse_plot_args() -> argparse.Namespace:
+    """Cmd line args for plotting the stored counters."""
+    parser = argparse.ArgumentParser(description="Plot the stored counters.")
+    parser.add_argument(
+        "--results-store",
+        type=str,
+        default="./storage/results.sqlite",
+        help="Database with the results of all venues, see `_results_store`.",
+    )
+    parser.add_argument(
+        "--out-dir",
+        type=str,
+        default="./plots",
+        help="Where the figures are written.",
+    )
+    parser.add_argument(
+        "--formats",
+        type=str,
+        nargs="+",
+        default=["tex"],
+        help="File types to write, tex for TikZ or e.g. png and pdf.",
+    )
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Do not show the figures, render them in parallel on the Agg backend.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of processes rendering figures in batch mode. Default: all cores.",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Render all figures, even if their data did not change.",
+    )
     return parser.parse_args()
@@ -0,0 +1,180 @@
+"""Shared helpers for the headless Chrome browsers.
+
+Starting Chrome takes seconds, so browsers are kept alive in a pool
+and borrowed for every page instead of starting a new one each time.
+"""
+
+import atexit
+import queue
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Union
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver import Chrome
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from tqdm import tqdm
+
+
+def _chrome_options() -> Options:
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")  # Opens the browser up in background
+    # fix for ubuntu https://github.com/SeleniumHQ/selenium/issues/15327
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    # chrome_options.add_argument(f"--user-data-dir=./tmp_{time.time()}")
+    return chrome_options
+
+
+class BrowserPool:
+    """A fixed number of long-lived headless Chrome sessions.
+
+    Browsers are started on first use, checked and reset to a blank page
+    before they are lent out and replaced after `max_pages` pages to keep their memory in check.
+    The pool is thread safe, so up to `size` pages can load at once.
+    """
+
+    def __init__(self, size: int = 1, max_pages: int = 50) -> None:
+        """Create a pool, no browser is started yet.
+
+        Args:
+            size (int): The number of browsers.
+            max_pages (int): Restart a browser after this many pages.
+        """
+        self.size = size
+        self.max_pages = max_pages
+        self._idle: queue.Queue[Union[tuple[Chrome, int], None]] = queue.Queue()
+        for _ in range(size):
+            self._idle.put(None)
+
+    @staticmethod
+    def _reset(browser: Chrome) -> bool:
+        """Leave the last page, False if the browser does not respond."""
+        try:
+            # URLs that differ only in their #fragment would not load the page
+            # again, and waits would find the elements of the last page.
+            browser.get("about:blank")
+            return True
+        except WebDriverException:
+            return False
+
+    @staticmethod
+    def _quit(browser: Chrome) -> None:
+        try:
+            browser.quit()
+        except WebDriverException:
+            pass
+
+    @contextmanager
+    def borrow(self) -> Iterator[Chrome]:
+        """Borrow a browser, waiting until one is free.
+
+        Yields:
+            Chrome: A running browser.
+
+        Raises:
+            BaseException: Whatever starting Chrome or the borrower raised.
+                The browser is replaced before the error is passed on.
+        """
+        entry = self._idle.get()
+        if entry is not None and not self._reset(entry[0]):
+            self._quit(entry[0])
+            entry = None
+        if entry is None:
+            try:
+                entry = (Chrome(options=_chrome_options()), 0)
+            except BaseException:
+                self._idle.put(None)
+                raise
+        browser, pages = entry
+        try:
+            yield browser
+            pages += 1
+            if pages >= self.max_pages:
+                self._quit(browser)
+                self._idle.put(None)
+            else:
+                self._idle.put((browser, pages))
+        except BaseException:
+            # the browser might be in a broken state, start a new one next time.
+            self._quit(browser)
+            self._idle.put(None)
+            raise
+
+    def close(self) -> None:
+        """Quit all idle browsers."""
+        for _ in range(self.size):
+            try:
+                entry = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if entry is not None:
+                self._quit(entry[0])
+            self._idle.put(None)
+
+
+_pool: Union[BrowserPool, None] = None
+
+
+def configure_browser_pool(size: int, max_pages: int = 50) -> None:
+    """Replace the shared browser pool.
+
+    Args:
+        size (int): The number of browsers.
+        max_pages (int): Restart a browser after this many pages.
+    """
+    global _pool
+    if _pool is not None:
+        _pool.close()
+    _pool = BrowserPool(size, max_pages)
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the shared browser pool, with a single browser by default."""
+    if _pool is None:
+        configure_browser_pool(1)
+    assert _pool is not None
+    return _pool
+
+
+@atexit.register
+def _close_pool() -> None:
+    if _pool is not None:
+        _pool.close()
+
+
+def wait_for(
+    browser: Chrome, css_selector: str, timeout: float, settle: float = 0.0
+) -> float:
+    """Wait until elements matching a CSS selector are on the page.
+
+    Args:
+        browser (Chrome): The browser that loads the page.
+        css_selector (str): The elements we are waiting for.
+        timeout (float): Give up after this many seconds and
+            continue with whatever the page shows.
+        settle (float): Additionally wait until the number of
+            matching elements did not change for this many seconds.
+            Useful for lists that render in batches.
+
+    Returns:
+        float: The number of seconds we actually waited.
+    """
+    start = time.monotonic()
+    state = {"count": -1, "since": start}
+
+    def _ready(driver: Chrome) -> bool:
+        count = len(driver.find_elements(By.CSS_SELECTOR, css_selector))
+        now = time.monotonic()
+        if count != state["count"]:
+            state["count"], state["since"] = count, now
+        return count > 0 and now - state["since"] >= settle
+
+    try:
+        WebDriverWait(browser, timeout, poll_frequency=0.1).until(_ready)
+    except TimeoutException:
+        tqdm.write(f"{browser.current_url}: no {css_selector} after {timeout}s.")
+    return time.monotonic() - start
@@ -0,0 +1,168 @@
+"""An on-disk HTTP cache for downloaded PDFs and HTML pages.
+
+Entries are addressed by the SHA-256 hash of their URL. Every entry
+consists of the response body and a small JSON file with the
+ETag and Last-Modified headers. Stale entries are revalidated with
+conditional requests, and the least recently used entries are
+evicted once the cache grows beyond its size limit.
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.error
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Union
+
+Request = Callable[[str, dict[str, str]], tuple[int, http.client.HTTPMessage, bytes]]
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}")
+    with open(tmp_path, "wb") as f_write:
+        f_write.write(data)
+    os.replace(tmp_path, path)
+
+
+class HttpCache:
+    """Store response bodies on disk, keyed by URL."""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int,
+        max_age: Union[float, None] = None,
+    ) -> None:
+        """Open or create a cache directory.
+
+        Args:
+            directory (Union[str, Path]): Where the cache lives.
+            max_bytes (int): Evict old entries once the bodies exceed this size.
+            max_age (float, optional): Seconds after which an entry is
+                revalidated with the server. None means entries never go stale.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._size: Union[int, None] = None
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        folder = self.directory / key[:2]
+        return folder / f"{key}.body", folder / f"{key}.json"
+
+    def _load_meta(self, url: str) -> Union[dict[str, Any], None]:
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, "r") as f_read:
+                meta: dict[str, Any] = json.load(f_read)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not body_path.exists():
+            return None
+        return meta
+
+    def _store(self, url: str, body: bytes, headers: http.client.HTTPMessage) -> Path:
+        body_path, meta_path = self._paths(url)
+        body_path.parent.mkdir(exist_ok=True)
+        old_size = body_path.stat().st_size if body_path.exists() else 0
+        _write_atomic(body_path, body)
+        meta = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored_at": time.time(),
+        }
+        _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(body) - old_size
+            if self._size > self.max_bytes:
+                self._evict(keep=body_path)
+        return body_path
+
+    def _scan_size(self) -> int:
+        return sum(path.stat().st_size for path in self.directory.glob("*/*.body"))
+
+    def _evict(self, keep: Path) -> None:
+        """Remove the least recently used bodies until we are below 90% of the limit."""
+        entries = []
+        for path in self.directory.glob("*/*.body"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        self._size = sum(entry[1] for entry in entries)
+        for _, size, path in entries:
+            if self._size <= 0.9 * self.max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            path.with_suffix(".json").unlink(missing_ok=True)
+            self._size -= size
+
+    def fetch_path(self, url: str, request: Request) -> Path:
+        """Return the path of the cached body for a URL, downloading it if needed.
+
+        Args:
+            url (str): The URL to fetch.
+            request (Request): Sends a GET request with extra headers and
+                returns status, response headers and body.
+
+        Returns:
+            Path: The file holding the response body.
+
+        Raises:
+            HTTPError: If the server answers with an error code.
+        """
+        body_path, meta_path = self._paths(url)
+        meta = self._load_meta(url)
+        headers = {}
+        if meta is not None:
+            if self.max_age is None or time.time() - meta["stored_at"] < self.max_age:
+                # mark the entry as recently used.
+                os.utime(body_path)
+                return body_path
+            if meta["etag"]:
+                headers["If-None-Match"] = meta["etag"]
+            if meta["last_modified"]:
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        status, response_headers, body = request(url, headers)
+        if status == 304 and meta is not None:
+            meta["stored_at"] = time.time()
+            _write_atomic(meta_path, json.dumps(meta).encode("utf-8"))
+            os.utime(body_path)
+            return body_path
+        if status >= 400:
+            raise urllib.error.HTTPError(
+                url,
+                status,
+                http.client.responses.get(status, ""),
+                response_headers,
+                None,
+            )
+        return self._store(url, body, response_headers)
+
+    def fetch(self, url: str, request: Request) -> bytes:
+        """Return the body for a URL, from disk if possible.
+
+        Args:
+            url (str): The URL to fetch.
+            request (Request): See `fetch_path`.
+
+        Returns:
+            bytes: The response body.
+        """
+        return self.fetch_path(url, request).read_bytes()
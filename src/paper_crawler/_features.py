@@ -0,0 +1,135 @@
+"""The software features we look for, and how their spellings are merged.
+
+`FEATURES` is the single source for both sides of the analysis.
+`process_pages` looks for every spelling on the repository pages,
+`plot_counters` adds the counts of all spellings up under the label.
+Tracking a new file is a one-line change to this table.
+"""
+
+from collections.abc import Hashable, Sequence
+
+import numpy as np
+
+# (kind, label used in the plots, spellings found on the repository page).
+# "nested" folders are not looked up directly, `process_pages` looks for
+# tests inside src or a folder named like the repository.
+FEATURES: list[tuple[str, str, tuple[str, ...]]] = [
+    ("files", "requirements.txt", ("requirements.txt",)),
+    ("files", "noxfile.py", ("noxfile.py",)),
+    (
+        "files",
+        "LICENSE",
+        (
+            "LICENSE.txt",
+            "license.txt",
+            "License.txt",
+            "LICENSE",
+            "License",
+            "license",
+            "LICENCE.txt",
+            "licence.txt",
+            "Licence.txt",
+            "LICENCE",
+            "Licence",
+            "licence",
+            "COPYING",
+            "copying",
+            "Copying",
+            "COPYING.txt",
+            "copying.txt",
+            "Copying.txt",
+        ),
+    ),
+    (
+        "files",
+        "README",
+        (
+            "README.md",
+            "readme.md",
+            "Readme.md",
+            "README.rst",
+            "readme.rst",
+            "Readme.rst",
+        ),
+    ),
+    ("files", "tox", ("tox.toml", "tox.ini")),
+    ("files", "setup.py", ("setup.py",)),
+    ("files", "setup.cfg", ("setup.cfg",)),
+    ("files", "pyproject.toml", ("pyproject.toml",)),
+    ("files", "environment", ("environment.yml", "environment.yaml")),
+    ("files", "uv.lock", ("uv.lock",)),
+    ("files", ".pre-commit-config.yml", (".pre-commit-config.yml",)),
+    ("files", ".pre-commit-config.yaml", (".pre-commit-config.yaml",)),
+    ("files", "poetry.lock", ("poetry.lock",)),
+    ("files", "poetry.toml", ("poetry.toml",)),
+    ("files", "hatch.toml", ("hatch.toml",)),
+    ("files", "pixi.lock", ("pixi.lock",)),
+    ("files", "pixi.toml", ("pixi.toml",)),
+    ("files", "Pipfile.lock", ("Pipfile.lock",)),
+    ("files", "pylock.toml", ("pylock.toml",)),
+    ("files", "Makefile", ("GNUmakefile", "makefile", "Makefile")),
+    ("files", ".flake8", (".flake8",)),
+    ("folders", "test-folder", ("test", "tests")),
+    ("folders", ".github/workflows", (".github/workflows",)),
+    ("folders", ".github", (".github",)),
+    ("folders", "docs", ("doc", "docs")),
+    ("folders", "src", ("src",)),
+    (
+        "nested",
+        "test-folder",
+        ("src/test", "src/tests", "package/test", "package/tests"),
+    ),
+]
+
+
+def spellings(kind: str) -> list[str]:
+    """List the names to look for.
+
+    Args:
+        kind (str): "files", "folders" or "nested".
+
+    Returns:
+        list[str]: All spellings of the features of this kind, in table order.
+    """
+    return [
+        spelling
+        for feature_kind, _, names in FEATURES
+        if feature_kind == kind
+        for spelling in names
+    ]
+
+
+# spelling -> label, and the merged keys of all features.
+_LABELS = {spelling: label for _, label, names in FEATURES for spelling in names}
+_LABEL_KEYS = list(dict.fromkeys((label, True) for _, label, _ in FEATURES))
+
+
+def merge_matrix(keys: Sequence[Hashable]) -> tuple[np.ndarray, list[Hashable]]:
+    """Build the matrix which adds the counts of all spellings up.
+
+    Keys like ("README.md", True) are mapped to ("README", True).
+    Keys which are not in `FEATURES`, e.g. "page_total", are kept.
+
+    Args:
+        keys (Sequence[Hashable]): The columns of a count table.
+
+    Returns:
+        tuple[np.ndarray, list[Hashable]]: A 0/1 matrix with one row per
+            key and one column per merged key, and the merged keys. The
+            labels of all features are always part of the merged keys.
+    """
+
+    def _merged(key: Hashable) -> Hashable:
+        if isinstance(key, tuple) and key[1] is True and key[0] in _LABELS:
+            return (_LABELS[key[0]], True)
+        return key
+
+    merged_keys: dict[Hashable, None] = dict.fromkeys(
+        key for key in map(_merged, keys) if key not in _LABEL_KEYS
+    )
+    merged_keys.update(dict.fromkeys(_LABEL_KEYS))
+    columns = {key: column for column, key in enumerate(merged_keys)}
+    matrix = np.zeros((len(keys), len(columns)), dtype=np.int64)
+    for row, key in enumerate(keys):
+        matrix[row, columns[_merged(key)]] = 1
+    return matrix, list(merged_keys)
@@ -0,0 +1,335 @@
+"""Pooled HTTP fetching shared by the crawlers.
+
+Connections are kept alive and reused per host. The asyncio driver
+`iter_fetch` keeps a bounded number of requests in flight and yields
+the results in input order. Once `configure_cache` was called,
+all downloads go through the on-disk HTTP cache. All pools share one
+per-host rate limiter and retry requests the server rejected with
+429 or 503, see `_rate_limit`.
+"""
+
+import asyncio
+import http.client
+import sys
+import threading
+import urllib.error
+import urllib.parse
+from collections import defaultdict, deque
+from collections.abc import AsyncGenerator, Generator, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Union
+
+from tqdm import tqdm
+
+from ._cache import HttpCache
+from ._rate_limit import RateLimiter, parse_retry_after
+
+# Use the urllib user agent, so servers deliver the same pages as to urlopen.
+USER_AGENT = "Python-urllib/%d.%d" % sys.version_info[:2]
+_REDIRECT_CODES = (301, 302, 303, 307, 308)
+_MAX_REDIRECTS = 10
+_RETRY_CODES = (429, 503)
+
+# shared by all connection pools of the process.
+rate_limiter = RateLimiter()
+
+FetchResult = Union[bytes, Exception]
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections grouped by host.
+
+    Each host gets at most `max_per_host` open connections, requests are
+    spaced by the per-host rates of the `limiter`. The pool is thread safe.
+    """
+
+    def __init__(
+        self,
+        max_per_host: int = 4,
+        timeout: float = 60.0,
+        limiter: Union[RateLimiter, None] = None,
+        max_retries: int = 5,
+    ) -> None:
+        """Create an empty pool.
+
+        Args:
+            max_per_host (int): Maximum number of parallel connections per host.
+            timeout (float): Socket timeout in seconds.
+            limiter (RateLimiter, optional): The per-host rates.
+                Defaults to the limiter shared by all pools.
+            max_retries (int): How often a request answered with
+                429 or 503 is repeated, after backing off.
+        """
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.limiter = rate_limiter if limiter is None else limiter
+        self.max_retries = max_retries
+        self._lock = threading.Lock()
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = (
+            defaultdict(list)
+        )
+        self._slots: dict[tuple[str, str], threading.BoundedSemaphore] = {}
+
+    def _slot(self, key: tuple[str, str]) -> threading.BoundedSemaphore:
+        with self._lock:
+            if key not in self._slots:
+                self._slots[key] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[key]
+
+    def _connect(self, key: tuple[str, str]) -> http.client.HTTPConnection:
+        with self._lock:
+            if self._idle[key]:
+                return self._idle[key].pop()
+        scheme, netloc = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _release(
+        self, key: tuple[str, str], connection: http.client.HTTPConnection
+    ) -> None:
+        with self._lock:
+            self._idle[key].append(connection)
+
+    def _request_once(
+        self, url: str, headers: dict[str, str]
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        parsed = urllib.parse.urlsplit(url)
+        key = (parsed.scheme, parsed.netloc)
+        path = urllib.parse.urlunsplit(("", "", parsed.path or "/", parsed.query, ""))
+        request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+        request_headers.update(headers)
+        self.limiter.acquire(parsed.netloc)
+        with self._slot(key):
+            connection = self._connect(key)
+            # a reused connection may have been closed by the server.
+            for attempt in range(2):
+                try:
+                    connection.request("GET", path, headers=request_headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                    break
+                except (http.client.HTTPException, ConnectionError):
+                    connection.close()
+                    if attempt:
+                        raise
+                    connection = self._connect(key)
+            if response.will_close:
+                connection.close()
+            else:
+                self._release(key, connection)
+        return response.status, response.headers, body
+
+    def _request_retrying(
+        self, url: str, headers: dict[str, str]
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        host = urllib.parse.urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            status, response_headers, body = self._request_once(url, headers)
+            if status not in _RETRY_CODES:
+                self.limiter.success(host)
+                break
+            if attempt < self.max_retries:
+                delay = self.limiter.backoff(
+                    host, parse_retry_after(response_headers.get("Retry-After"))
+                )
+                tqdm.write(f"{host} answered {status}, pausing for {delay:.0f}s.")
+        return status, response_headers, body
+
+    def request(
+        self, url: str, headers: Union[dict[str, str], None] = None
+    ) -> tuple[int, http.client.HTTPMessage, bytes]:
+        """Send a GET request and follow redirects.
+
+        Args:
+            url (str): The URL to fetch.
+            headers (dict, optional): Additional request headers.
+
+        Returns:
+            tuple: The status code, the response headers and the body.
+
+        Raises:
+            HTTPError: If the server redirects more than ten times.
+        """
+        for _ in range(_MAX_REDIRECTS):
+            status, response_headers, body = self._request_retrying(url, headers or {})
+            if status in _REDIRECT_CODES and "Location" in response_headers:
+                url = urllib.parse.urljoin(url, response_headers["Location"])
+                continue
+            return status, response_headers, body
+        raise urllib.error.HTTPError(
+            url, status, "Too many redirects.", response_headers, None
+        )
+
+    def fetch(self, url: str) -> bytes:
+        """Download a page.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            bytes: The response body.
+
+        Raises:
+            HTTPError: If the server answers with an error code,
+                just like `urllib.request.urlopen`.
+        """
+        status, headers, body = self.request(url)
+        if status >= 400:
+            raise urllib.error.HTTPError(
+                url, status, http.client.responses.get(status, ""), headers, None
+            )
+        return body
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            for connections in self._idle.values():
+                for connection in connections:
+                    connection.close()
+            self._idle.clear()
+
+
+_default_pool = ConnectionPool()
+_cache: Union[HttpCache, None] = None
+
+
+def configure_cache(
+    directory: Union[str, Path, None],
+    max_size_gb: float = 20.0,
+    max_age_days: Union[float, None] = None,
+) -> None:
+    """Route all downloads through an on-disk HTTP cache.
+
+    Args:
+        directory (Union[str, Path, None]): The cache directory.
+            An empty string or None disables the cache.
+        max_size_gb (float): Size limit for the cached bodies in GB.
+        max_age_days (float, optional): Revalidate entries older than this.
+            None means cached entries are used without asking the server.
+    """
+    global _cache
+    if not directory:
+        _cache = None
+        return
+    max_age = None if max_age_days is None else max_age_days * 24 * 3600
+    _cache = HttpCache(directory, int(max_size_gb * 1e9), max_age)
+
+
+def configure_rate_limits(rates: Union[list[str], None]) -> None:
+    """Override the request rates of the shared limiter.
+
+    Args:
+        rates (list[str], optional): Entries like "openreview.net=2.5",
+            in requests per second.
+
+    Raises:
+        ValueError: If an entry has no number after the equals sign.
+    """
+    for entry in rates or []:
+        domain, _, rate = entry.partition("=")
+        try:
+            rate_limiter.set_rate(domain.strip().lower(), float(rate))
+        except ValueError as e:
+            raise ValueError(f"Rate limit {entry} is not like host=rate.") from e
+
+
+def _get(pool: ConnectionPool, url: str) -> bytes:
+    if _cache is not None:
+        return _cache.fetch(url, pool.request)
+    return pool.fetch(url)
+
+
+def fetch(url: str) -> bytes:
+    """Download a page using the shared connection pool and the cache.
+
+    Args:
+        url (str): The URL to fetch.
+
+    Returns:
+        bytes: The response body.
+    """
+    return _get(_default_pool, url)
+
+
+def fetch_path(url: str) -> Union[Path, None]:
+    """Download a URL into the cache and return the cached file.
+
+    Args:
+        url (str): The URL to fetch.
+
+    Returns:
+        Union[Path, None]: The file holding the body,
+            or None if no cache is configured.
+    """
+    if _cache is None:
+        return None
+    return _cache.fetch_path(url, _default_pool.request)
+
+
+def _fetch_or_error(pool: ConnectionPool, url: str) -> FetchResult:
+    try:
+        return _get(pool, url)
+    except Exception as e:
+        return e
+
+
+async def _aiter_fetch(
+    urls: Iterable[str], pool: ConnectionPool, executor: ThreadPoolExecutor, window: int
+) -> AsyncGenerator[FetchResult, None]:
+    loop = asyncio.get_running_loop()
+    url_iter = iter(urls)
+    pending: deque[asyncio.Future[FetchResult]] = deque()
+
+    def _submit() -> None:
+        url = next(url_iter, None)
+        if url is not None:
+            pending.append(loop.run_in_executor(executor, _fetch_or_error, pool, url))
+
+    for _ in range(window):
+        _submit()
+    while pending:
+        result = await pending.popleft()
+        _submit()
+        yield result
+
+
+def iter_fetch(
+    urls: Iterable[str],
+    concurrency: int = 8,
+    pool: Union[ConnectionPool, None] = None,
+) -> Generator[FetchResult, None, None]:
+    """Fetch many URLs concurrently and yield the results in input order.
+
+    At most `concurrency` requests run at the same time. Failed
+    downloads yield the exception instead of the page.
+
+    Args:
+        urls (Iterable[str]): The URLs to download.
+        concurrency (int): Number of requests in flight.
+        pool (ConnectionPool, optional): The connection pool to use.
+            Defaults to a fresh pool with `concurrency` connections per host.
+
+    Yields:
+        Union[bytes, Exception]: The page content or the download error.
+    """
+    own_pool = pool is None
+    if pool is None:
+        pool = ConnectionPool(max_per_host=concurrency)
+    loop = asyncio.new_event_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    # keep a few extra requests queued, so a slow page does not drain the pipe.
+    results = _aiter_fetch(urls, pool, executor, 2 * concurrency)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(anext(results))
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(results.aclose())
+        loop.close()
+        executor.shutdown(cancel_futures=True)
+        if own_pool:
+            pool.close()
@@ -0,0 +1,106 @@
+"""Append-only journals for resumable crawl loops.
+
+Every PDF with a result is appended to a JSON lines file as
+`{"url": ..., "result": ...}`. A restarted crawl reads the journal,
+skips the URLs it already knows and only processes the rest.
+A None result is not journaled, because `crawl_links_soup.process_link`
+also returns None if the download failed. Those PDFs are processed
+again on resume, the HTTP cache keeps this cheap for PDFs without links.
+"""
+
+import json
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any, Union
+
+from tqdm import tqdm
+
+
+def load_journal(path: Union[str, Path]) -> dict[str, Any]:
+    """Read the results recorded so far.
+
+    A line cut short by a crash is ignored, as are None results
+    written by older versions.
+
+    Args:
+        path (Union[str, Path]): The journal file.
+
+    Returns:
+        dict[str, Any]: The results keyed by URL.
+    """
+    done: dict[str, Any] = {}
+    if not Path(path).exists():
+        return done
+    with open(path, "r") as f_read:
+        for line in f_read:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if entry["result"] is not None:
+                done[entry["url"]] = entry["result"]
+    return done
+
+
+def iter_journal(
+    links: Iterable[str],
+    journal_path: Union[str, Path],
+    process: Callable[[list[str]], Iterable[Any]],
+) -> Iterator[Any]:
+    """Process all links that are not in the journal yet, yield results as they come.
+
+    Args:
+        links (Iterable[str]): All links of the venue.
+        journal_path (Union[str, Path]): The journal file.
+        process (Callable): Turns a list of links into an iterable of
+            results in the same order, e.g. `crawl_links_soup.process_links`.
+
+    Yields:
+        Any: One result per link, in the order of `links`.
+    """
+    links = list(links)
+    done = load_journal(journal_path)
+    todo = list(dict.fromkeys(link for link in links if link not in done))
+    if done:
+        print(f"Resuming, {len(done)} links are done, {len(todo)} to go.")
+
+    with open(journal_path, "a") as f_journal:
+        # finish a line cut short by a crash, so new entries start on a new line.
+        if f_journal.tell() > 0:
+            with open(journal_path, "rb") as f_read:
+                f_read.seek(-1, 2)
+                if f_read.read(1) != b"\n":
+                    f_journal.write("\n")
+        results = iter(process(todo))
+        with tqdm(total=len(todo)) as bar:
+            for link in links:
+                if link not in done:
+                    bar.set_description(f" {link} ")
+                    result = next(results)
+                    if result is not None:
+                        f_journal.write(
+                            json.dumps({"url": link, "result": result}) + "\n"
+                        )
+                        f_journal.flush()
+                    done[link] = result
+                    bar.update()
+                yield done[link]
+
+
+def run_with_journal(
+    links: list[str],
+    journal_path: Union[str, Path],
+    process: Callable[[list[str]], Iterable[Any]],
+) -> list[Any]:
+    """Process all links that are not in the journal yet.
+
+    Args:
+        links (list[str]): All links of the venue.
+        journal_path (Union[str, Path]): The journal file.
+        process (Callable): Turns a list of links into an iterable of
+            results in the same order, e.g. `crawl_links_soup.process_links`.
+
+    Returns:
+        list[Any]: One result per link, in the order of `links`.
+    """
+    return list(iter_journal(links, journal_path, process))
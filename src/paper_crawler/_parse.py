@@ -0,0 +1,75 @@
+"""Central HTML parsing with a selectable BeautifulSoup backend.
+
+All crawlers parse through `make_soup`. The backend defaults to
+bs4's pure Python "html.parser", `configure_parser("lxml")` switches
+to the much faster lxml parser. Passing `only` builds just the
+subtrees we are going to query, e.g. the anchors of a listing page.
+"""
+
+from typing import Any, Union
+
+from bs4 import BeautifulSoup, FeatureNotFound
+from bs4.filter import SoupStrainer
+
+PARSER_BACKENDS = ["html.parser", "lxml"]
+
+_backend = "html.parser"
+
+Markup = Union[str, bytes]
+
+
+def configure_parser(backend: str) -> None:
+    """Select the parser backend for all crawlers.
+
+    Args:
+        backend (str): One of `PARSER_BACKENDS`.
+
+    Raises:
+        ValueError: If the backend is unknown or not installed.
+    """
+    global _backend
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend {backend}.")
+    try:
+        BeautifulSoup("", backend)
+    except FeatureNotFound as e:
+        raise ValueError(f"Parser backend {backend} is not installed.") from e
+    _backend = backend
+
+
+def make_soup(
+    markup: Markup,
+    only: Union[str, list[str], None] = None,
+    attrs: Union[dict[str, str], None] = None,
+    backend: Union[str, None] = None,
+) -> BeautifulSoup:
+    """Parse HTML with the configured backend.
+
+    Args:
+        markup (Markup): The HTML, as str or bytes.
+        only (Union[str, list[str], None]): Only keep these tags
+            and their children. Everything else is skipped while parsing.
+        attrs (dict[str, str], optional): Only keep `only` tags with
+            these attributes, e.g. {"class": "paper-list"}.
+        backend (str, optional): Overrides the configured backend.
+
+    Returns:
+        BeautifulSoup: The parsed document.
+    """
+    if only is None:
+        return BeautifulSoup(markup, backend or _backend)
+    strainer_attrs: dict[str, Any] = dict(attrs or {})
+    parse_only = SoupStrainer(only, strainer_attrs)
+    return BeautifulSoup(markup, backend or _backend, parse_only=parse_only)
+
+
+def available_backends() -> list[str]:
+    """Return the parser backends that are installed."""
+    backends = []
+    for backend in PARSER_BACKENDS:
+        try:
+            BeautifulSoup("", backend)
+            backends.append(backend)
+        except FeatureNotFound:
+            pass
+    return backends
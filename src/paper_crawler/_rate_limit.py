@@ -0,0 +1,180 @@
+"""Per-host request rates with adaptive backoff.
+
+Every known host has a token bucket: requests take a token, tokens
+come back at the host's rate and up to `burst` of them can be saved up.
+When a server answers 429 or 503, the host's rate is halved and all
+requests to it pause, for the Retry-After time if the server sent one.
+Successful requests slowly raise the rate back to the configured one.
+
+The limiter is shared by all threads of a process. Worker processes
+each have their own copy.
+"""
+
+import email.utils
+import threading
+import time
+from typing import Union
+
+# requests per second and burst size. Subdomains share their domain's bucket.
+DEFAULT_RATES: dict[str, tuple[float, int]] = {
+    "openreview.net": (2.0, 2),
+    "github.com": (4.0, 8),
+    "proceedings.mlr.press": (10.0, 10),
+    "papers.nips.cc": (5.0, 10),
+    "jmlr.org": (2.0, 4),
+}
+# how far the rate may drop below the configured rate.
+MIN_RATE_FACTOR = 1 / 16
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: int) -> None:
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.failures = 0
+
+    def refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+def parse_retry_after(value: Union[str, None]) -> Union[float, None]:
+    """Turn a Retry-After header into seconds.
+
+    Args:
+        value (str, optional): Delay seconds or an HTTP date.
+
+    Returns:
+        Union[float, None]: The seconds to wait, None if the header
+            is missing or broken.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class RateLimiter:
+    """Token buckets per host, slowing down when servers push back."""
+
+    def __init__(
+        self,
+        rates: Union[dict[str, tuple[float, int]], None] = None,
+        max_backoff: float = 120.0,
+    ) -> None:
+        """Create a limiter.
+
+        Args:
+            rates (dict, optional): Requests per second and burst size
+                per domain. Defaults to `DEFAULT_RATES`.
+                Hosts that are not listed are not limited.
+            max_backoff (float): Never pause a host longer than this many seconds.
+        """
+        self.rates = dict(DEFAULT_RATES if rates is None else rates)
+        self.max_backoff = max_backoff
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def set_rate(
+        self, domain: str, rate: float, burst: Union[int, None] = None
+    ) -> None:
+        """Change the rate of a domain.
+
+        Args:
+            domain (str): The domain, e.g. "openreview.net".
+            rate (float): Requests per second.
+            burst (int, optional): Requests that may be sent at once.
+                Defaults to the old burst size, or the rounded up rate.
+        """
+        with self._lock:
+            if burst is None:
+                burst = self.rates.get(domain, (rate, max(1, int(rate + 0.999))))[1]
+            self.rates[domain] = (rate, burst)
+            self._buckets.pop(domain, None)
+
+    def _bucket(self, host: str) -> Union[_Bucket, None]:
+        """Return the bucket of a host, must be called with the lock held."""
+        host = host.split(":")[0].lower()
+        for domain, (rate, burst) in self.rates.items():
+            if host == domain or host.endswith("." + domain):
+                if domain not in self._buckets:
+                    self._buckets[domain] = _Bucket(rate, burst)
+                return self._buckets[domain]
+        return None
+
+    def acquire(self, host: str) -> float:
+        """Wait until a request to the host may be sent.
+
+        Args:
+            host (str): The host, a port is ignored.
+
+        Returns:
+            float: The seconds we waited.
+        """
+        start = time.monotonic()
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                if bucket is None:
+                    return 0.0
+                now = time.monotonic()
+                bucket.refill(now)
+                if now >= bucket.paused_until and bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return now - start
+                delay = max(
+                    bucket.paused_until - now, (1 - bucket.tokens) / bucket.rate
+                )
+            time.sleep(delay)
+
+    def backoff(self, host: str, retry_after: Union[float, None] = None) -> float:
+        """Slow down after the host answered 429 or 503.
+
+        Args:
+            host (str): The host.
+            retry_after (float, optional): The delay the server asked for.
+                Without it, the pause doubles with every failure in a row.
+
+        Returns:
+            float: The seconds all requests to the host pause.
+        """
+        with self._lock:
+            bucket = self._bucket(host)
+            if bucket is None:
+                # unknown hosts are limited from now on.
+                self.rates[host.split(":")[0].lower()] = (1.0, 1)
+                bucket = self._bucket(host)
+                assert bucket is not None
+            bucket.failures += 1
+            bucket.rate = max(bucket.base_rate * MIN_RATE_FACTOR, bucket.rate / 2)
+            if retry_after is None:
+                retry_after = 2.0**bucket.failures
+            delay = min(self.max_backoff, retry_after)
+            bucket.paused_until = max(bucket.paused_until, time.monotonic() + delay)
+            bucket.tokens = 0.0
+        return delay
+
+    def success(self, host: str) -> None:
+        """Raise the rate of the host again after a successful request.
+
+        Args:
+            host (str): The host.
+        """
+        with self._lock:
+            bucket = self._bucket(host)
+            if bucket is not None:
+                bucket.failures = 0
+                bucket.rate = min(
+                    bucket.base_rate, bucket.rate + bucket.base_rate * 0.1
+                )
@@ -0,0 +1,211 @@
+"""A SQLite store of repository pages and statistics shared by all venues.
+
+Popular repositories are cited by many venues and years. The store keeps
+the page record and the `process_pages.extract_stats` result of every
+repository, keyed by its "owner/repo" id, see
+`filter_and_download_links.repo_key`, together with the time the page
+was fetched. Later runs reuse both until they are older than the
+freshness window. Storing a new page drops the statistics of the old one.
+Only usable pages and pages without a branch picker are stored, failed
+downloads are tried again by the next run.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Union
+
+from .repo_pages import RepoPage
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    repo_id TEXT PRIMARY KEY,
+    link TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    page TEXT,
+    stats TEXT
+)
+"""
+
+
+class RepoStore:
+    """Page records and statistics per repository."""
+
+    def __init__(
+        self, path: Union[str, Path], max_age: Union[float, None] = None
+    ) -> None:
+        """Open or create a store.
+
+        Args:
+            path (Union[str, Path]): The SQLite file.
+            max_age (float, optional): Seconds after which a repository
+                is fetched again. None means entries never go stale.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        # other processes may write at the same time, wait for their locks.
+        self._connection = sqlite3.connect(
+            self.path, timeout=60, check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.execute(_SCHEMA)
+
+    def _fresh_row(self, repo_id: str, column: str) -> Union[tuple[str, Any], None]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT link, fetched_at, {column} FROM repos WHERE repo_id = ?",
+                (repo_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        link, fetched_at, value = row
+        if self.max_age is not None and time.time() - fetched_at > self.max_age:
+            return None
+        return link, value
+
+    def page(self, repo_id: str) -> tuple[bool, RepoPage]:
+        """Look up the page of a repository.
+
+        Args:
+            repo_id (str): The "owner/repo" id.
+
+        Returns:
+            tuple[bool, RepoPage]: If a fresh entry exists, and the
+                (record, link) tuple, None for pages which could not be used.
+        """
+        row = self._fresh_row(repo_id, "page")
+        if row is None:
+            return False, None
+        link, page = row
+        if page is None:
+            return True, None
+        return True, (json.loads(page), link)
+
+    def store_page(self, repo_id: str, page: RepoPage, link: str) -> None:
+        """Store a freshly fetched page.
+
+        Args:
+            repo_id (str): The "owner/repo" id.
+            page (RepoPage): The page as a (record, link) tuple, or None.
+            link (str): The link the page was fetched from.
+
+        Raises:
+            ValueError: If the page holds a soup instead of a page record.
+        """
+        if page is not None and not isinstance(page[0], dict):
+            raise ValueError("Only page records can be stored.")
+        content = None if page is None else json.dumps(page[0])
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?, NULL)",
+                (repo_id, link, time.time(), content),
+            )
+
+    def stats(
+        self, repo_id: str, resolver: str = "http"
+    ) -> Union[dict[str, dict[str, bool]], None]:
+        """Look up the statistics of a repository.
+
+        Args:
+            repo_id (str): The "owner/repo" id.
+            resolver (str): The sub-folder resolver the statistics were
+                computed with, see `process_pages.extract_stats`.
+
+        Returns:
+            Union[dict, None]: The `extract_stats` result of the stored page,
+                None if there is none or the page is stale.
+        """
+        row = self._fresh_row(repo_id, "stats")
+        if row is None or row[1] is None:
+            return None
+        stats: Union[dict[str, dict[str, bool]], None] = json.loads(row[1]).get(
+            resolver
+        )
+        return stats
+
+    def store_stats(
+        self,
+        repo_id: str,
+        stats: dict[str, dict[str, bool]],
+        page: RepoPage = None,
+        resolver: str = "http",
+    ) -> None:
+        """Store the statistics of a repository's page.
+
+        Statistics are kept per resolver, as the resolvers can disagree
+        about nested test folders.
+
+        Args:
+            repo_id (str): The "owner/repo" id.
+            stats (dict): The `extract_stats` result.
+            page (RepoPage): The analysed page, stored along with the
+                statistics if the store does not know the repository yet,
+                e.g. for pages downloaded by older runs.
+            resolver (str): The sub-folder resolver used for `stats`.
+        """
+        # a single statement, so concurrent writers of other resolvers are kept.
+        path = '$."' + resolver + '"'
+        content = json.dumps(stats)
+        with self._lock, self._connection:
+            if page is not None and isinstance(page[0], dict):
+                self._connection.execute(
+                    "INSERT INTO repos VALUES (?, ?, ?, ?, json_set('{}', ?, json(?)))"
+                    " ON CONFLICT (repo_id) DO UPDATE SET stats ="
+                    " json_set(COALESCE(repos.stats, '{}'), ?, json(?))",
+                    (
+                        repo_id,
+                        page[1],
+                        time.time(),
+                        json.dumps(page[0]),
+                        path,
+                        content,
+                        path,
+                        content,
+                    ),
+                )
+            else:
+                self._connection.execute(
+                    "UPDATE repos SET stats = json_set(COALESCE(stats, '{}'), ?, json(?))"
+                    " WHERE repo_id = ?",
+                    (path, content, repo_id),
+                )
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+
+_store: Union[RepoStore, None] = None
+
+
+def configure_repo_store(
+    path: Union[str, Path, None], max_age_days: Union[float, None] = None
+) -> None:
+    """Share repository pages and statistics across venues and runs.
+
+    Args:
+        path (Union[str, Path, None]): The SQLite file.
+            An empty string or None disables the store.
+        max_age_days (float, optional): Fetch and analyse repositories
+            again after this many days. None means never.
+    """
+    global _store
+    if not path:
+        _store = None
+        return
+    max_age = None if max_age_days is None else max_age_days * 24 * 3600
+    _store = RepoStore(path, max_age)
+
+
+def get_repo_store() -> Union[RepoStore, None]:
+    """Return the configured store.
+
+    Returns:
+        Union[RepoStore, None]: The store, None if it is disabled.
+    """
+    return _store
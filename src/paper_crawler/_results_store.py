@@ -0,0 +1,258 @@
+"""A SQLite database with the results of all venues.
+
+Every venue gets one row per paper, one row per GitHub link found in a
+paper and one row per analysed repository. Every feature a repository
+has is one row of the features table, named like "files/README.md", see
+`process_pages.FEATURE_COLUMNS`. Feature names are case sensitive, which
+rules out one SQLite column per feature. Papers and repositories carry
+the series, e.g. "icml", and the year of their venue, so analyses across
+venues are a single query:
+
+    SELECT year, COUNT(*) FROM repos JOIN features USING (venue, repo)
+    WHERE series = 'icml' AND feature = 'files/LICENSE' GROUP BY year
+"""
+
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    venue TEXT NOT NULL,
+    series TEXT NOT NULL,
+    year INTEGER,
+    paper INTEGER NOT NULL,
+    links INTEGER NOT NULL,
+    PRIMARY KEY (venue, paper)
+);
+CREATE TABLE IF NOT EXISTS links (
+    venue TEXT NOT NULL,
+    paper INTEGER NOT NULL,
+    link TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS repos (
+    venue TEXT NOT NULL,
+    series TEXT NOT NULL,
+    year INTEGER,
+    repo INTEGER NOT NULL,
+    link TEXT NOT NULL,
+    PRIMARY KEY (venue, repo)
+);
+CREATE TABLE IF NOT EXISTS features (
+    venue TEXT NOT NULL,
+    repo INTEGER NOT NULL,
+    feature TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS papers_series ON papers (series, year);
+CREATE INDEX IF NOT EXISTS links_venue ON links (venue, paper);
+CREATE INDEX IF NOT EXISTS links_link ON links (link);
+CREATE INDEX IF NOT EXISTS repos_series ON repos (series, year);
+CREATE INDEX IF NOT EXISTS repos_link ON repos (link);
+CREATE INDEX IF NOT EXISTS features_venue ON features (venue, repo);
+CREATE INDEX IF NOT EXISTS features_feature ON features (feature, venue);
+"""
+
+_YEAR = re.compile(r"(?:19|20)\d\d")
+_SERIES = re.compile(r"[A-Za-z]+")
+
+
+def venue_series_and_year(venue: str) -> tuple[str, Union[int, None]]:
+    """Split a storage id into the name of the venue series and the year.
+
+    Args:
+        venue (str): The storage id, like "icml2024" or
+            "ICLR.cc_2025_Conference".
+
+    Returns:
+        tuple[str, Union[int, None]]: The lower case series, like "iclr",
+            and the year, None for journals like "tmlr".
+    """
+    year = _YEAR.search(venue)
+    series = _SERIES.match(venue)
+    return (
+        series[0].lower() if series else venue,
+        int(year[0]) if year else None,
+    )
+
+
+class ResultsStore:
+    """Papers, links and repository features of all venues."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Open or create a store.
+
+        Args:
+            path (Union[str, Path]): The SQLite file.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # other processes may write at the same time, wait for their locks.
+        self._connection = sqlite3.connect(
+            self.path, timeout=60, check_same_thread=False
+        )
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def store_venue(
+        self,
+        venue: str,
+        papers: Union[list[Union[list[str], None]], None],
+        links: list[str],
+        matrix: np.ndarray,
+        columns: list[str],
+    ) -> None:
+        """Replace the results of a venue.
+
+        Args:
+            venue (str): The storage id of the venue.
+            papers (list, optional): The GitHub links found in every paper,
+                None for papers which could not be read. None keeps the
+                stored papers.
+            links (list[str]): The link of every analysed repository.
+            matrix (np.ndarray): The stats matrix, one row per repository.
+            columns (list[str]): The name of every matrix column.
+        """
+        series, year = venue_series_and_year(venue)
+        with self._lock, self._connection:
+            if papers is not None:
+                self._connection.execute("DELETE FROM papers WHERE venue = ?", (venue,))
+                self._connection.execute("DELETE FROM links WHERE venue = ?", (venue,))
+                self._connection.executemany(
+                    "INSERT INTO papers VALUES (?, ?, ?, ?, ?)",
+                    (
+                        (venue, series, year, paper, len(paper_links or []))
+                        for paper, paper_links in enumerate(papers)
+                    ),
+                )
+                self._connection.executemany(
+                    "INSERT INTO links VALUES (?, ?, ?)",
+                    (
+                        (venue, paper, link)
+                        for paper, paper_links in enumerate(papers)
+                        for link in paper_links or []
+                    ),
+                )
+            self._connection.execute("DELETE FROM repos WHERE venue = ?", (venue,))
+            self._connection.execute("DELETE FROM features WHERE venue = ?", (venue,))
+            self._connection.executemany(
+                "INSERT INTO repos VALUES (?, ?, ?, ?, ?)",
+                ((venue, series, year, repo, link) for repo, link in enumerate(links)),
+            )
+            rows, cols = np.nonzero(matrix)
+            self._connection.executemany(
+                "INSERT INTO features VALUES (?, ?, ?)",
+                ((venue, int(repo), columns[col]) for repo, col in zip(rows, cols)),
+            )
+
+    def has_venue(self, venue: str) -> bool:
+        """Check if the results of a venue are stored.
+
+        Args:
+            venue (str): The storage id of the venue.
+
+        Returns:
+            bool: True if the venue has stored papers or repositories.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT EXISTS (SELECT 1 FROM repos WHERE venue = ?)"
+                " OR EXISTS (SELECT 1 FROM papers WHERE venue = ?)",
+                (venue, venue),
+            ).fetchone()
+        return bool(row[0])
+
+    def venues(
+        self, series: Union[str, None] = None
+    ) -> list[tuple[str, Union[int, None]]]:
+        """List the venues with analysed repositories.
+
+        Args:
+            series (str, optional): Only list venues of this series, e.g. "icml".
+
+        Returns:
+            list[tuple[str, Union[int, None]]]: The storage id and the year
+                of every venue, sorted by year and id.
+        """
+        query = "SELECT DISTINCT venue, year FROM repos"
+        parameters: tuple[str, ...] = ()
+        if series is not None:
+            query += " WHERE series = ?"
+            parameters = (series,)
+        with self._lock:
+            rows = self._connection.execute(query, parameters).fetchall()
+        return sorted(rows, key=lambda row: (row[1] or 0, row[0]))
+
+    def stats_matrix(
+        self, venue: str, columns: list[str]
+    ) -> tuple[np.ndarray, list[str]]:
+        """Load the stats matrix of a venue.
+
+        Args:
+            venue (str): The storage id of the venue.
+            columns (list[str]): The feature columns to load, in this order.
+                Features the store does not know are False, so matrices
+                stored before a feature was added still load.
+
+        Returns:
+            tuple[np.ndarray, list[str]]: The boolean matrix and the
+                repository link of every row.
+        """
+        with self._lock:
+            links = self._connection.execute(
+                "SELECT link FROM repos WHERE venue = ? ORDER BY repo", (venue,)
+            ).fetchall()
+            features = self._connection.execute(
+                "SELECT repo, feature FROM features WHERE venue = ?", (venue,)
+            ).fetchall()
+        index = {column: position for position, column in enumerate(columns)}
+        matrix = np.zeros((len(links), len(columns)), dtype=bool)
+        for repo, feature in features:
+            if feature in index:
+                matrix[repo, index[feature]] = True
+        return matrix, [row[0] for row in links]
+
+    def query(self, sql: str, parameters: tuple[Any, ...] = ()) -> list[Any]:
+        """Run a read-only query, e.g. for analyses across venues.
+
+        Args:
+            sql (str): The SELECT statement.
+            parameters (tuple): Values for the placeholders.
+
+        Returns:
+            list: The result rows.
+        """
+        with self._lock:
+            return self._connection.execute(sql, parameters).fetchall()
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._connection.close()
+
+
+_store: Union[ResultsStore, None] = None
+
+
+def configure_results_store(path: Union[str, Path, None]) -> None:
+    """Write the results of all venues into one database.
+
+    Args:
+        path (Union[str, Path, None]): The SQLite file.
+            An empty string or None disables the store.
+    """
+    global _store
+    _store = ResultsStore(path) if path else None
+
+
+def get_results_store() -> Union[ResultsStore, None]:
+    """Return the configured store.
+
+    Returns:
+        Union[ResultsStore, None]: The store, None if it is disabled.
+    """
+    return _store
@@ -0,0 +1,40 @@
+"""Ordered thread pools for streaming I/O bound work."""
+
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_thread_map(
+    function: Callable[[T], R], items: Iterable[T], workers: int
+) -> Iterator[tuple[T, R]]:
+    """Apply a function in a thread pool, yield (item, result) in input order.
+
+    Only a few items are in flight at a time, so the input can be streamed.
+    Closing the iterator early cancels the items that have not started.
+
+    Args:
+        function (Callable): Runs on every item.
+        items (Iterable): The inputs.
+        workers (int): Number of threads.
+
+    Yields:
+        tuple: Every item with its result.
+    """
+    executor = ThreadPoolExecutor(workers)
+    pending: deque[tuple[T, Future[R]]] = deque()
+    try:
+        for item in items:
+            pending.append((item, executor.submit(function, item)))
+            if len(pending) >= 2 * workers:
+                item, future = pending.popleft()
+                yield item, future.result()
+        while pending:
+            item, future = pending.popleft()
+            yield item, future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
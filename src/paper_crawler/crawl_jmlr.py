@@ -2,16 +2,18 @@
 
 import json
 import os
-import urllib.request
+import urllib.parse
 
-from bs4 import BeautifulSoup
+from ._argparse_code import _parse_args
+from ._fetch import configure_cache, configure_rate_limits, fetch
+from ._parse import configure_parser, make_soup
 
 tmlr_link = "https://jmlr.org/tmlr/papers/"
 mloss_link = "https://jmlr.org/mloss/"
 
 
 def _parse_links(url: str) -> list[list[urllib.parse.ParseResult]]:
-    tmlr_soup = BeautifulSoup(urllib.request.urlopen(url), "html.parser")
+    tmlr_soup = make_soup(fetch(url), only="a")
     github_links = list(
         filter(lambda link: "github" in str(link), tmlr_soup.find_all("a"))
     )
@@ -21,10 +23,8 @@ def _parse_links(url: str) -> list[list[urllib.parse.ParseResult]]:
     return github_links_parsed
 
 
-if __name__ == "__main__":
-    if not os.path.exists("./storage/"):
-        os.makedirs("./storage/")
-
+def crawl_jmlr() -> None:
+    """Store the repository links of TMLR and MLOSS in ./storage/."""
     tmlr_github_links_parsed = _parse_links(tmlr_link)
     with open("./storage/tmlr.json", "w") as file:
         file.write(json.dumps(tmlr_github_links_parsed))
@@ -32,3 +32,15 @@ if __name__ == "__main__":
     mloss_github_links_parsed = _parse_links(mloss_link)
     with open("./storage/mloss.json", "w") as file:
         file.write(json.dumps(mloss_github_links_parsed))
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    configure_cache(args.cache_dir, args.cache_size, args.cache_max_age)
+    configure_rate_limits(args.rate_limit)
+    configure_parser(args.parser)
+
+    if not os.path.exists("./storage/"):
+        os.makedirs("./storage/")
+
+    crawl_jmlr()
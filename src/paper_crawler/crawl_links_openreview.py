@@ -2,17 +2,41 @@
 
 import json
 import os
-import time
+from collections.abc import Iterable, Iterator
+from functools import cache, partial
 from pathlib import Path
+from typing import Any
 
 import openreview
 from dotenv import load_dotenv
-from tqdm import tqdm
 
 from ._argparse_code import _parse_args
-from .crawl_links_soup import process_link
+from ._fetch import configure_cache, configure_rate_limits
+from ._journal import run_with_journal
+from ._pdf_links import configure_pdf_extractor
+from ._threads import ordered_thread_map
+from .crawl_links_soup import PaperLinks, process_link
 
-# from multiprocessing import Pool
+
+@cache
+def _get_client(baseurl: str) -> Any:
+    """Log in once per API version, all callers share the client.
+
+    Args:
+        baseurl (str): "https://api2.openreview.net" for API v2,
+            "https://api.openreview.net" for v1.
+
+    Returns:
+        Any: The authenticated `openreview` client.
+    """
+    client_class = (
+        openreview.api.OpenReviewClient if "api2" in baseurl else openreview.Client
+    )
+    return client_class(
+        baseurl=baseurl,
+        username=os.environ["OPENREVIEW_USERNAME"],
+        password=os.environ["OPENREVIEW_PASSWORD"],
+    )
 
 
 def get_openreview_submissions(venueid: str) -> list[str]:
@@ -28,11 +52,7 @@ def get_openreview_submissions(venueid: str) -> list[str]:
         list[str]: A list of URLs pointing to the PDF files of the submissions.
     """
     # print("openreview user:", os.environ["OPENREVIEW_USERNAME"])
-    client = openreview.api.OpenReviewClient(
-        baseurl="https://api2.openreview.net",
-        username=os.environ["OPENREVIEW_USERNAME"],
-        password=os.environ["OPENREVIEW_PASSWORD"],
-    )
+    client = _get_client("https://api2.openreview.net")
 
     # check version.
     # https://docs.openreview.net/how-to-guides/data-retrieval-and-modification/how-to-check-the-api-version-of-a-venue
@@ -50,11 +70,7 @@ def get_openreview_submissions(venueid: str) -> list[str]:
         return links
     else:
         # v1 api.
-        client = openreview.Client(
-            baseurl="https://api.openreview.net",
-            username=os.environ["OPENREVIEW_USERNAME"],
-            password=os.environ["OPENREVIEW_PASSWORD"],
-        )
+        client = _get_client("https://api.openreview.net")
         submissions = client.get_all_notes(content={"venueid": venueid})
         print(f"{venueid} has : {len(submissions)} submissions.")
         # assemble links
@@ -67,9 +83,85 @@ def get_openreview_submissions(venueid: str) -> list[str]:
         return links
 
 
+def get_venue_links(venueid: str) -> list[str]:
+    """Get the PDF links of a venue without the known broken submissions.
+
+    Args:
+        venueid (str): The OpenReview venue ID.
+
+    Returns:
+        list[str]: The PDF links.
+    """
+    links = get_openreview_submissions(venueid)
+    if venueid == "ICLR.cc/2021/Conference":
+        print(f"pop: {venueid}")
+        links.pop(719)
+        links.pop(718)
+        links.pop(717)
+    return links
+
+
+def process_openreview_links(
+    links: Iterable[str], concurrency: int = 1
+) -> Iterator[PaperLinks]:
+    """Run `process_link` on every OpenReview PDF.
+
+    The threads share the connection pool and the openreview.net rate
+    limit of this process, see `--rate-limit`, so more threads only
+    help until that rate is reached.
+
+    Args:
+        links (Iterable[str]): The PDF links.
+        concurrency (int): Number of PDFs downloaded and parsed at once.
+
+    Yields:
+        Union[list, None]: The `process_link` result for every link,
+            in the order of `links`, as soon as it is done.
+    """
+    if concurrency <= 1:
+        yield from map(process_link, links)
+        return
+    for _, result in ordered_thread_map(process_link, links, concurrency):
+        yield result
+
+
+def crawl_venue(venueid: str, concurrency: int = 1) -> list[PaperLinks]:
+    """Find the GitHub links in all PDFs of a venue and store them.
+
+    The results are written to ./storage/{storage_id}.json, where the storage
+    id is the venue ID with underscores instead of slashes. Finished PDFs are
+    journaled so an interrupted crawl can resume.
+
+    Args:
+        venueid (str): The OpenReview venue ID.
+        concurrency (int): Number of PDFs processed at once.
+
+    Returns:
+        list: The `process_link` result of every PDF.
+    """
+    storage_id = "_".join(venueid.split("/"))
+    links = get_venue_links(venueid)
+
+    # finished pdfs go to the journal, a restart continues from there.
+    res = run_with_journal(
+        links,
+        f"./storage/{storage_id}.journal.jsonl",
+        partial(process_openreview_links, concurrency=concurrency),
+    )
+
+    # do not create a file is res is empty.
+    if res:
+        with open(f"./storage/{storage_id}.json", "w") as f:
+            f.write(json.dumps(res, indent=1))
+    return res
+
+
 if __name__ == "__main__":
     dotenv = load_dotenv()
     args = _parse_args()
+    configure_cache(args.cache_dir, args.cache_size, args.cache_max_age)
+    configure_rate_limits(args.rate_limit)
+    configure_pdf_extractor(args.pdf_extractor)
     print(f"dotenv loaded: {dotenv}.")
     storage_id = "_".join(args.id.split("/"))
     storage_file = f"./storage/{storage_id}.json"
@@ -83,33 +175,7 @@ if __name__ == "__main__":
     print(path, path.exists())
     if not path.exists():
         try:
-            links = get_openreview_submissions(venueid)
-
-            if args.id == "ICLR.cc/2021/Conference":
-                print(f"pop: {args.id}")
-                links.pop(719)
-                links.pop(718)
-                links.pop(717)
-
-            # loop through paper links find pdfs
-            # with Pool(2) as p:
-            #     res = list(tqdm(p.imap(process_link, links), total=len(links)))
-
-            res = []
-            for link in (bar := tqdm(links)):
-                res.append(process_link(link))
-                bar.set_description(f" {link} ")
-                # avoid ip-ban.
-                time.sleep(2)
-
-            # loop through paper links find pdfs
-            # with Pool(2) as p:
-            #    res = list(tqdm(p.imap(process_link, links), total=len(links)))
-
-            # do not create a file is res is empty.
-            if res:
-                with open(storage_file, "w") as f:
-                    f.write(json.dumps(res, indent=1))
+            crawl_venue(venueid, concurrency=args.concurrency)
         except Exception as e:
             print(f"An error occured, {e}.")
     else:
@@ -1,11 +1,14 @@
 """This module extracts PDF links for ICLR papers using Selenium and BeautifulSoup."""
 
-import time
+import urllib.parse
 
 import bs4
-from bs4 import BeautifulSoup
-from selenium.webdriver import Chrome
-from selenium.webdriver.chrome.options import Options
+
+from ._browser import get_browser_pool, wait_for
+from ._parse import make_soup
+
+# openreview renders its paper lists with javascript.
+PDF_LINK_TIMEOUT = 20
 
 
 def _get_links_selenium(fun_url: str) -> list[bs4.element.PageElement]:
@@ -13,25 +16,22 @@ def _get_links_selenium(fun_url: str) -> list[bs4.element.PageElement]:
 
     Args:
         fun_url (str): The URL of the iclr openreview page to crawl.
+            A #fragment selects the tab, we wait for its links.
 
     Returns:
         list[bs4.element.PageElement]: A list of BeautifulSoup elemets
             that contain pdf-links in their content.
 
     """
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Opens the browser up in background
-    # fix for ubuntu https://github.com/SeleniumHQ/selenium/issues/15327
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    # chrome_options.add_argument(f"--user-data-dir=./tmp_{time.time()}")
-
-    with Chrome(options=chrome_options) as browser:
+    tab = urllib.parse.urlsplit(fun_url).fragment
+    selector = f"#{tab} a.pdf-link" if tab else "a.pdf-link"
+    with get_browser_pool().borrow() as browser:
         browser.get(fun_url)
-        time.sleep(20)
+        waited = wait_for(browser, selector, PDF_LINK_TIMEOUT, settle=1.0)
+        print(f"{fun_url} rendered after {waited:.1f}s.")
         html = browser.page_source
 
-    page_soup = BeautifulSoup(html, "html.parser")
+    page_soup = make_soup(html, only="a")
     pdf_soup = list(
         filter(lambda line: "pdf-link" in str(line), page_soup.find_all("a"))
     )
@@ -65,18 +65,15 @@ def get_iclr_pdf_2018() -> list[str]:
     url_oral = (
         "https://openreview.net/group?id=ICLR.cc/2018/Conference#accepted-oral-papers"
     )
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Opens the browser up in background
-    # fix for ubuntu https://github.com/SeleniumHQ/selenium/issues/15327
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-
-    with Chrome(options=chrome_options) as browser:
+    with get_browser_pool().borrow() as browser:
         browser.get(url_oral)
-        time.sleep(20)
+        waited = wait_for(
+            browser, "#accepted-oral-papers a.pdf-link", PDF_LINK_TIMEOUT, settle=1.0
+        )
+        print(f"{url_oral} rendered after {waited:.1f}s.")
         html = browser.page_source
 
-    page_soup = BeautifulSoup(html, "html.parser")
+    page_soup = make_soup(html, only="div", attrs={"id": "accepted-oral-papers"})
     divs = page_soup.find("div", {"id": "accepted-oral-papers"})
     if divs:
         pdf_links_oral: list[str] = list(
@@ -88,15 +85,15 @@ def get_iclr_pdf_2018() -> list[str]:
     url_poster = (
         "https://openreview.net/group?id=ICLR.cc/2018/Conference#accepted-poster-papers"
     )
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Opens the browser up in background
-
-    with Chrome(options=chrome_options) as browser:
+    with get_browser_pool().borrow() as browser:
         browser.get(url_poster)
-        time.sleep(20)
+        waited = wait_for(
+            browser, "#accepted-poster-papers a.pdf-link", PDF_LINK_TIMEOUT, settle=1.0
+        )
+        print(f"{url_poster} rendered after {waited:.1f}s.")
         html = browser.page_source
 
-    page_soup = BeautifulSoup(html, "html.parser")
+    page_soup = make_soup(html, only="div", attrs={"id": "accepted-poster-papers"})
     divs = page_soup.find("div", {"id": "accepted-poster-papers"})
     if divs:
         pdf_links_poster: list[str] = list(
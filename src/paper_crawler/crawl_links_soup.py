@@ -5,19 +5,49 @@ It processes each PDF to extract GitHub links,
 and to stores the results in a JSON file.
 """
 
+import io
 import json
+import mmap
+import multiprocessing
+import multiprocessing.pool
 import os
-import urllib
+import re
+import signal
+import threading
+import urllib.parse
+from collections.abc import Iterable, Iterator
+from functools import partial
 from pathlib import Path
+from types import FrameType
 from typing import Union
 
 import pdfx
-from bs4 import BeautifulSoup
+import pdfx.backends
 from tqdm import tqdm
 
 from ._argparse_code import _parse_args
+from ._fetch import (
+    ConnectionPool,
+    configure_cache,
+    configure_rate_limits,
+    fetch,
+    fetch_path,
+    iter_fetch,
+)
+from ._journal import run_with_journal
+from ._parse import configure_parser, make_soup
+from ._threads import ordered_thread_map
+from ._pdf_links import (
+    PdfData,
+    configure_pdf_extractor,
+    fast_path_enabled,
+    find_github_urls,
+)
 from .crawl_links_selenium import get_iclr_pdf_2018, get_iclr_pdf_2019
 
+# the GitHub links of one PDF, None if there are none or it failed.
+PaperLinks = Union[list[urllib.parse.ParseResult], None]
+
 imcl_dict = {
     2024: 235,
     2023: 202,
@@ -95,7 +125,7 @@ def get_pmlr(url: str) -> list[str]:
     Returns:
         list: A list of links that contain "pdf" in their href attribute.
     """
-    soup = BeautifulSoup(urllib.request.urlopen(url), "html.parser")
+    soup = make_soup(fetch(url), only="a")
     pdf_soup = list(filter(lambda line: "pdf" in str(line), soup.find_all("a")))
     pdf_soup
     links = [
@@ -107,38 +137,88 @@ def get_pmlr(url: str) -> list[str]:
     return links
 
 
-def get_nips_pdf(year: int) -> list[str]:
+NIPS_URL = "https://papers.nips.cc"
+# politeness limit for the abstract pages, independent of --concurrency.
+NIPS_MAX_CONNECTIONS = 4
+# .../hash/<hash>-Abstract[-<track>].html links .../file/<hash>-Paper[-<track>].pdf
+_NIPS_ABSTRACT = re.compile(
+    r"^(/paper_files/paper/\d+)/hash/(\w+)-Abstract(-\w+)?\.html$"
+)
+
+
+def _derive_nips_pdf(paper_link: str) -> Union[str, None]:
+    """Derive the PDF link from an abstract page link, None if it has no known form."""
+    match = _NIPS_ABSTRACT.match(paper_link)
+    if match is None:
+        return None
+    folder, paper_hash, track = match.groups()
+    return f"{NIPS_URL}{folder}/file/{paper_hash}-Paper{track or ''}.pdf"
+
+
+def _nips_pdf_links(page: bytes) -> list[str]:
+    sub_soup = make_soup(page, only="a")
+    pdf_soup = list(filter(lambda line: "pdf" in str(line), sub_soup.find_all("a")))
+    return [NIPS_URL + str(link).split()[-1].split('"')[1] for link in pdf_soup]
+
+
+def get_nips_pdf(
+    year: int, concurrency: int = 1, derive_urls: bool = False
+) -> list[str]:
     """Return links to pdfs from the neurips proceedings page.
 
+    The abstract pages are downloaded concurrently, the links keep
+    the order of the paper list.
+
     Args:
         year (int): The conference year.
+        concurrency (int): Number of abstract pages loading at once.
+        derive_urls (bool): Build the paper PDF link from the abstract link
+            instead of loading the abstract page, where the link has the
+            usual form. Supplementary PDFs are not found this way.
 
     Returns:
         list[str]: A list with links.
     """
-    url_str = f"https://papers.nips.cc/paper_files/paper/{year}"
-    soup = BeautifulSoup(urllib.request.urlopen(url_str), "html.parser")
+    url_str = f"{NIPS_URL}/paper_files/paper/{year}"
+    soup = make_soup(fetch(url_str), only="ul", attrs={"class": "paper-list"})
     paper_list = soup.find_all("ul", {"class": "paper-list"})[0]
-    paper_links = paper_list.find_all("a")  # type: ignore
-    process_link = lambda link: str(link).split()[1][6:-1]  # noqa E731
-    paper_links = list(map(process_link, paper_links))
+    paper_links: list[str] = [
+        str(link).split()[1][6:-1] for link in paper_list.find_all("a")  # type: ignore
+    ]
+    derived = [
+        _derive_nips_pdf(paper_link) if derive_urls else None
+        for paper_link in paper_links
+    ]
+    pool = ConnectionPool(max_per_host=min(max(concurrency, 1), NIPS_MAX_CONNECTIONS))
+    pages = iter_fetch(
+        (
+            NIPS_URL + paper_link
+            for paper_link, pdf_link in zip(paper_links, derived)
+            if pdf_link is None
+        ),
+        max(concurrency, 1),
+        pool,
+    )
     pdf_links = []
     # get the pdf
-    for paper_link in tqdm(paper_links, total=len(paper_links), desc=url_str):
-        try:
-            full_url = "https://papers.nips.cc" + paper_link
-            sub_soup = BeautifulSoup(urllib.request.urlopen(full_url), "html.parser")
-            pdf_soup = list(
-                filter(lambda line: "pdf" in str(line), sub_soup.find_all("a"))
-            )
-            extract_link = (
-                lambda link: "https://papers.nips.cc"
-                + str(link).split()[-1].split('"')[1]
-            )
-            links = list(map(extract_link, pdf_soup))
-            pdf_links.extend(links)
-        except Exception as e:
-            tqdm.write(f"{paper_link}, throws {e}")
+    try:
+        for paper_link, pdf_link in tqdm(
+            zip(paper_links, derived), total=len(paper_links), desc=url_str
+        ):
+            if pdf_link is not None:
+                pdf_links.append(pdf_link)
+                continue
+            try:
+                page = next(pages)
+                if isinstance(page, Exception):
+                    tqdm.write(f"{paper_link}, throws {page}")
+                else:
+                    pdf_links.extend(_nips_pdf_links(page))
+            except Exception as e:
+                tqdm.write(f"{paper_link}, throws {e}")
+    finally:
+        pages.close()
+        pool.close()
     return pdf_links
 
 
@@ -150,7 +230,7 @@ def get_iclr_2016_pdf() -> list[str]:
             to a PDF of an accepted paper.
     """
     url = "https://www.iclr.cc/archive/www/doku.php%3Fid=iclr2016:accepted-main.html"
-    soup = BeautifulSoup(urllib.request.urlopen(url), "html.parser")
+    soup = make_soup(fetch(url), only="a")
     pdf_soup = list(filter(lambda line: "arxiv" in str(line), soup.find_all("a")))
     filter_soup = list(
         map(lambda ps: str(ps).split()[2].split('"')[1].replace("abs", "pdf"), pdf_soup)
@@ -158,14 +238,49 @@ def get_iclr_2016_pdf() -> list[str]:
     return filter_soup
 
 
-def process_link(url: str) -> Union[list[str], None]:
+# a downloaded PDF, or its file in the HTTP cache.
+Pdf = Union[bytes, Path]
+
+
+def download_pdf(url: str) -> Pdf:
+    """Download a PDF through the shared connection pool.
+
+    Args:
+        url (str): The URL of the PDF.
+
+    Returns:
+        Pdf: The cached file if there is a cache, the PDF bytes otherwise.
+    """
+    cached_path = fetch_path(url)
+    return cached_path if cached_path is not None else fetch(url)
+
+
+def _extract_urls(data: PdfData) -> list[str]:
+    """Find the URLs of a PDF, see `--pdf-extractor`."""
+    if fast_path_enabled():
+        urls = find_github_urls(data)
+        if urls:
+            return urls
+    # pdfminer reads the PDF through the stream, a BytesIO shares the buffer.
+    stream = data if isinstance(data, mmap.mmap) else io.BytesIO(data)
+    reader = pdfx.backends.PDFMinerBackend(stream)
+    return list(reader.get_references_as_dict().get("url", []))
+
+
+def process_link(url: str, pdf: Union[Pdf, None] = None) -> PaperLinks:
     """Process a given URL to extract and filter GitHub links from a PDF.
 
+    If the fast extractor was selected with `--pdf-extractor`, the PDF is
+    first scanned with `_pdf_links.find_github_urls`. pdfx only runs
+    if that finds nothing. Cached PDFs are memory-mapped, not read.
+
     Args:
         url (str): The URL of the PDF to be processed.
+        pdf (Union[bytes, Path], optional): The PDF from `download_pdf`.
+            Downloaded here if it is missing.
 
     Returns:
-        list: A list of GitHub links extracted from the PDF.
+        PaperLinks: A list of GitHub links extracted from the PDF.
           If an error occurs, returns None.
 
     Raises:
@@ -173,8 +288,16 @@ def process_link(url: str) -> Union[list[str], None]:
             Is immediately caught and logged on the console.
     """
     try:
-        reader = pdfx.PDFx(url)
-        urls = list(reader.get_references_as_dict()["url"])
+        if pdf is None:
+            pdf = download_pdf(url)
+        if isinstance(pdf, Path):
+            with (
+                open(pdf, "rb") as f_pdf,
+                mmap.mmap(f_pdf.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+            ):
+                urls = _extract_urls(mapped)
+        else:
+            urls = _extract_urls(pdf)
         urls_filter_broken = list(filter(lambda url: "http" in url, urls))
         urls_filter_github = list(
             filter(lambda url: "github" in url, urls_filter_broken)
@@ -190,8 +313,210 @@ def process_link(url: str) -> Union[list[str], None]:
         return None
 
 
+def _raise_timeout(signum: int, frame: Union[FrameType, None]) -> None:
+    raise TimeoutError("PDF processing timed out.")
+
+
+def _process_link_with_timeout(
+    downloaded: tuple[str, Union[Pdf, None]], timeout: int
+) -> PaperLinks:
+    """Run `process_link` on a downloaded PDF and give up after `timeout` seconds.
+
+    The timer keeps firing every second, in case a library swallows
+    the first TimeoutError. Without SIGALRM (Windows) or outside the
+    main thread, where signals can not be handled, there is no timeout.
+    """
+    url, pdf = downloaded
+    if pdf is None:
+        # the download failed and was reported.
+        return None
+    if (
+        not timeout
+        or not hasattr(signal, "SIGALRM")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        return process_link(url, pdf)
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout, 1.0)
+    try:
+        return process_link(url, pdf)
+    except TimeoutError:
+        # the alarm went off after process_link was done.
+        tqdm.write(f"{url}, throws timeout")
+        return None
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _download_or_none(url: str) -> Union[Pdf, None]:
+    try:
+        return download_pdf(url)
+    except Exception as e:
+        tqdm.write(f"{url}, throws {e}")
+        return None
+
+
+def download_pdfs(
+    links: Iterable[str], concurrency: int = 1
+) -> Iterator[tuple[str, Union[Pdf, None]]]:
+    """Download PDFs ahead of the parser, in link order.
+
+    Args:
+        links (Iterable[str]): The PDF links.
+        concurrency (int): Number of downloads at once.
+
+    Yields:
+        tuple: Every link with its `download_pdf` result,
+            None if the download failed.
+    """
+    if concurrency <= 1:
+        for url in links:
+            yield url, _download_or_none(url)
+        return
+    yield from ordered_thread_map(_download_or_none, links, concurrency)
+
+
+def create_pool(workers: int) -> multiprocessing.pool.Pool:
+    """Start worker processes for `process_links`.
+
+    Workers are forked where possible. Forked workers share the parent's
+    hash seed, which keeps the order of the urls pdfx returns identical
+    to a sequential run. Create the pool before starting any threads.
+
+    Args:
+        workers (int): Number of worker processes.
+
+    Returns:
+        multiprocessing.pool.Pool: The pool, close it when done.
+    """
+    context: multiprocessing.context.BaseContext = multiprocessing.get_context()
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+    return context.Pool(workers)
+
+
+def process_links(
+    links: Iterable[str],
+    workers: int = 1,
+    timeout: int = 0,
+    pool: Union[multiprocessing.pool.Pool, None] = None,
+    concurrency: int = 1,
+) -> Iterator[PaperLinks]:
+    """Run `process_link` on every link, optionally in a process pool.
+
+    PDFs are downloaded in this process, while earlier PDFs are parsed.
+    Workers get the path of a cached PDF, or the PDF itself without a cache.
+    Results are yielded in link order, so the stored JSON is the same
+    as for the sequential loop.
+
+    Args:
+        links (Iterable[str]): The PDF links to process.
+        workers (int): Number of worker processes, one means sequential.
+        timeout (int): Seconds after which a single PDF is skipped,
+            zero means no limit.
+        pool (multiprocessing.pool.Pool, optional): A running pool from
+            `create_pool` to use instead of `workers` new processes.
+        concurrency (int): Number of PDFs downloading at once.
+
+    Yields:
+        Union[list, None]: The `process_link` result for every link.
+    """
+    process = partial(_process_link_with_timeout, timeout=timeout)
+    downloads = download_pdfs(links, concurrency)
+    if pool is not None:
+        yield from pool.imap(process, downloads)
+        return
+    if workers <= 1:
+        yield from map(process, downloads)
+        return
+
+    with create_pool(workers) as own_pool:
+        yield from own_pool.imap(process, downloads)
+
+
+def get_pdf_links(
+    venue_id: str, concurrency: int = 1, derive_urls: bool = False
+) -> list[str]:
+    """Get the PDF links of a venue from its proceedings page.
+
+    Args:
+        venue_id (str): The venue, e.g. icml2024 or nips2023.
+        concurrency (int): Number of pages loading at once, see `get_nips_pdf`.
+        derive_urls (bool): See `get_nips_pdf`.
+
+    Returns:
+        list[str]: The PDF links.
+
+    Raises:
+        ValueError: If the venue is not supported.
+    """
+    if venue_id == "icml2024":
+        return get_icml_2024_pdf()
+    elif venue_id == "icml2023":
+        return get_icml_2023_pdf()
+    elif venue_id == "icml2022":
+        return get_icml_pdf(2022)
+    elif "icml" in venue_id:
+        return get_icml_pdf(int(venue_id[4:]))
+    elif "nips" in venue_id:
+        return get_nips_pdf(int(venue_id[4:]), concurrency, derive_urls)
+    elif "aistats" in venue_id:
+        return get_aistats_pdf(int(venue_id[7:]))
+    elif "iclr2018" in venue_id:
+        return get_iclr_pdf_2018()
+    elif "iclr2019" in venue_id:
+        return get_iclr_pdf_2019()
+    elif "iclr2016" in venue_id:
+        return get_iclr_2016_pdf()
+    else:
+        raise ValueError("Unkown conference.")
+
+
+def crawl_venue(
+    venue_id: str,
+    workers: int = 1,
+    timeout: int = 0,
+    concurrency: int = 1,
+    derive_urls: bool = False,
+    pool: Union[multiprocessing.pool.Pool, None] = None,
+) -> list[PaperLinks]:
+    """Find the GitHub links in all PDFs of a venue and store them.
+
+    The results are written to ./storage/{venue_id}.json,
+    finished PDFs are journaled so an interrupted crawl can resume.
+
+    Args:
+        venue_id (str): The venue, see `get_pdf_links`.
+        workers (int): Number of processes parsing PDFs.
+        timeout (int): Seconds after which a single PDF is skipped.
+        concurrency (int): Number of pages and PDFs downloading at once,
+            see `get_pdf_links` and `process_links`.
+        derive_urls (bool): See `get_pdf_links`.
+        pool (multiprocessing.pool.Pool, optional): See `process_links`.
+
+    Returns:
+        list: The `process_link` result of every PDF.
+    """
+    pdf_soup = get_pdf_links(venue_id, concurrency, derive_urls)
+
+    # loop through paper links find pdfs, finished pdfs go to the journal.
+    res = run_with_journal(
+        pdf_soup,
+        f"./storage/{venue_id}.journal.jsonl",
+        lambda links: process_links(links, workers, timeout, pool, concurrency),
+    )
+    with open(f"./storage/{venue_id}.json", "w") as f:
+        f.write(json.dumps(res))
+    return res
+
+
 if __name__ == "__main__":
     args = _parse_args()
+    configure_cache(args.cache_dir, args.cache_size, args.cache_max_age)
+    configure_rate_limits(args.rate_limit)
+    configure_parser(args.parser)
+    configure_pdf_extractor(args.pdf_extractor)
 
     if not os.path.exists("./storage/"):
         os.makedirs("./storage/")
@@ -201,36 +526,12 @@ if __name__ == "__main__":
 
     if not save_path.exists():
         print(f"save_path {save_path} does not exist.")
-        if args.id == "icml2024":
-            pdf_soup = get_icml_2024_pdf()
-        elif args.id == "icml2023":
-            pdf_soup = get_icml_2023_pdf()
-        elif args.id == "icml2022":
-            pdf_soup = get_icml_pdf(2022)
-        elif "icml" in args.id:
-            pdf_soup = get_icml_pdf(int(args.id[4:]))
-        elif "nips" in args.id:
-            pdf_soup = get_nips_pdf(int(args.id[4:]))
-        elif "aistats" in args.id:
-            pdf_soup = get_aistats_pdf(int(args.id[7:]))
-        elif "iclr2018" in args.id:
-            pdf_soup = get_iclr_pdf_2018()
-        elif "iclr2019" in args.id:
-            pdf_soup = get_iclr_pdf_2019()
-        elif "iclr2016" in args.id:
-            pdf_soup = get_iclr_2016_pdf()
-        else:
-            raise ValueError("Unkown conference.")
-
-        # loop through paper links find pdfs
-        res = []
-        for steps, current_link in enumerate((bar := tqdm(pdf_soup))):
-            bar.set_description(f" {current_link} ")
-            res.append(process_link(current_link))
-            if steps % 100 == 0:
-                with open(f"./storage/{args.id}.json", "w") as f:
-                    f.write(json.dumps(res))
-        with open(save_path, "w") as f:
-            f.write(json.dumps(res))
+        crawl_venue(
+            args.id,
+            args.workers,
+            args.timeout,
+            args.concurrency,
+            args.derive_pdf_urls,
+        )
     else:
         print(f"save_path {save_path} exists, exiting.")
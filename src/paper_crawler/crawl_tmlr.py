@@ -1,14 +1,15 @@
 """Get TMLR code repo-links."""
 
 import json
-import urllib.request
+import urllib.parse
 
-from bs4 import BeautifulSoup
+from ._fetch import fetch
+from ._parse import make_soup
 
 tmlr_link = "https://jmlr.org/tmlr/papers/"
 
 if __name__ == "__main__":
-    tmlr_soup = BeautifulSoup(urllib.request.urlopen(tmlr_link), "html.parser")
+    tmlr_soup = make_soup(fetch(tmlr_link), only="a")
     github_links = list(
         filter(lambda link: "github" in str(link), tmlr_soup.find_all("a"))
     )
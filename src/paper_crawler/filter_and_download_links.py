@@ -1,22 +1,62 @@
 """Filter the GitHub links and download the front page for each link."""
 
+import itertools
 import json
-import pickle
+import re
 import urllib
 import urllib.parse
-import urllib.request
+from collections.abc import Iterable, Iterator
 
 # from multiprocessing import Pool
 from pathlib import Path
-from typing import Union
+from typing import Any, Union
 
 from bs4 import BeautifulSoup
 from tqdm import tqdm
 
 from ._argparse_code import _parse_args
+from ._fetch import (
+    FetchResult,
+    configure_cache,
+    configure_rate_limits,
+    fetch,
+    iter_fetch,
+)
+from ._parse import configure_parser, make_soup
+from ._repo_store import configure_repo_store, get_repo_store
+from .repo_pages import RepoPage, as_record, write_repo_pages
 
+# everything the branch picker check and `extract_page_record` look at.
+REPO_PAGE_TAGS = ["button", "span", "table"]
+# first path parts of github.com pages that do not belong to a user.
+GITHUB_RESERVED = {
+    "about",
+    "apps",
+    "collections",
+    "enterprise",
+    "explore",
+    "features",
+    "login",
+    "marketplace",
+    "orgs",
+    "pricing",
+    "search",
+    "settings",
+    "sponsors",
+    "topics",
+    "users",
+}
+_OWNER = re.compile(r"[A-Za-z0-9-]+")
+_REPO = re.compile(r"[A-Za-z0-9_.-]+")
 
-def process_repo_link(repo_link: str) -> Union[tuple[BeautifulSoup, str], None]:
+
+def _is_model_file(repo_link: str) -> bool:
+    return repo_link.split(".")[-1] in ["pth", "pkl"]
+
+
+def process_repo_link(
+    repo_link: str, page: Union[FetchResult, None] = None, raise_errors: bool = False
+) -> Union[tuple[BeautifulSoup, str], None]:
     """
     Process a link to a GitHub repo.
 
@@ -24,20 +64,31 @@ def process_repo_link(repo_link: str) -> Union[tuple[BeautifulSoup, str], None]:
 
     Args:
         repo_link (str): A list of URLs to process.
+        page (Union[bytes, Exception, None]): The already downloaded page
+            or the error raised while downloading it.
+            If None, the page is downloaded here.
+        raise_errors (bool): Raise download and parsing errors instead of
+            returning None, to tell them apart from pages without a
+            branch picker.
 
     Returns:
         list: A list of url and soups with a branch picker.
 
-    Raises: # noqa: DAR402, DAR401
-        Exception: If an error occurs while processing a link,
-            it will be caught and printed.
+    Raises:
+        ValueError: If the link points to a pickled or model file.
+        page: The download error passed in as `page`.
+            Errors are only raised with `raise_errors`,
+            otherwise they are caught and printed.
     """
     # print(repo_link)
     try:
-        if repo_link.split(".")[-1] in ["pth", "pkl"]:
+        if _is_model_file(repo_link):
             raise ValueError("Pickled or model file found.")
-        page = urllib.request.urlopen(repo_link)
-        soup = BeautifulSoup(page, "html.parser")
+        if isinstance(page, Exception):
+            raise page
+        if page is None:
+            page = fetch(repo_link)
+        soup = make_soup(page, only=REPO_PAGE_TAGS)
         # look for the branch picker.
         buttons = soup.find_all("button")
         has_branch_picker = any(
@@ -48,56 +99,208 @@ def process_repo_link(repo_link: str) -> Union[tuple[BeautifulSoup, str], None]:
         else:
             return None
     except Exception as e:
+        if raise_errors:
+            raise
         tqdm.write(f"Page {repo_link} produced an error {e}.")
         return None
 
 
-if __name__ == "__main__":
-    args = _parse_args()
-    id = "_".join(args.id.split("/"))
-    print(f"Loading from: ./storage/{id}.json")
+# papers whose stored results are broken, by position.
+BROKEN_PAPERS = {"ICLR.cc_2024_Conference": [1809]}
+# links to zipped and other undesirable files.
+IGNORE_LIST = ["tar.gz", ".bin", ".zip", ".pt", ".gif", ".jpeg", ".mp4"]
 
-    save_path = Path(f"./storage/{id}_filtered.pkl")
 
-    if not save_path.exists():
+def get_repo_links(
+    paper_results: Iterable[Union[list[Any], None]], storage_id: str = ""
+) -> Iterator[str]:
+    """Turn the GitHub links found in the papers into a flat stream of URLs.
 
-        with open(f"./storage/{id}.json", "r") as f_read:
-            links = json.load(f_read)
+    Args:
+        paper_results (Iterable): The `process_link` result of every paper,
+            parsed URLs or their JSON lists.
+        storage_id (str): The venue, used to skip known broken papers.
 
-        if id == "ICLR.cc_2024_Conference":
-            # this one is broken.
-            links.pop(1809)
+    Yields:
+        str: The repository links, without links to archives and media files.
+    """
+    broken = BROKEN_PAPERS.get(storage_id, [])
+    for position, page_links in enumerate(paper_results):
+        if position in broken or not page_links:
+            continue
+        for link in page_links:
+            str_link = str(urllib.parse.urlunparse(link))
+            if not any(ignore in str_link for ignore in IGNORE_LIST):
+                yield str_link
+
+
+def _repo_parts(repo_link: str) -> Union[tuple[str, str], None]:
+    """Find owner and repository name in a link, None if it has none."""
+    parsed = urllib.parse.urlparse(repo_link)
+    if parsed.netloc.lower() not in ["github.com", "www.github.com"]:
+        return None
+    parts = parsed.path.split("/")[1:3]
+    if len(parts) < 2:
+        return None
+    owner = _OWNER.match(parts[0])
+    repo = _REPO.match(parts[1])
+    if owner is None or repo is None or owner[0].lower() in GITHUB_RESERVED:
+        return None
+    name = repo[0].removesuffix(".git").rstrip(".")
+    if not name:
+        return None
+    return owner[0], name
+
+
+def repo_key(repo_link: str) -> Union[str, None]:
+    """Map a link into a GitHub repository to the repository.
+
+    Args:
+        repo_link (str): Any link, e.g. http://www.github.com/Owner/Repo.git
+            or https://github.com/owner/repo/tree/main#readme.
+
+    Returns:
+        Union[str, None]: "owner/repo" in lower case, GitHub ignores the case.
+            None if the link does not point into a repository.
+    """
+    parts = _repo_parts(repo_link)
+    return None if parts is None else "/".join(parts).lower()
+
+
+def canonical_repo_link(repo_link: str) -> str:
+    """Link to the front page of the repository a link points into.
+
+    Args:
+        repo_link (str): Any link.
+
+    Returns:
+        str: https://github.com/owner/repo, in the case of the link.
+            Links which do not point into a repository are returned unchanged.
+    """
+    parts = _repo_parts(repo_link)
+    return repo_link if parts is None else "https://github.com/" + "/".join(parts)
 
-        flat_links = []
-        for page_links in links:
-            if page_links:
-                for link in page_links:
-                    flat_links.append(link)
 
-        str_links_map = list(
-            map(lambda link: str(urllib.parse.urlunparse(link)), flat_links)
+def download_repo_pages(
+    links: Iterable[str], concurrency: int = 1, desc: str = "downloading"
+) -> Iterator[RepoPage]:
+    """Run `process_repo_link` on the repository of every link.
+
+    Links are mapped to the front page of their repository, see
+    `canonical_repo_link`. Every repository is downloaded once, links to a
+    repository that was seen before get the same result, so repositories
+    keep their weight. Fresh pages in the repository store, see
+    `_repo_store`, are not downloaded again and new pages are added to
+    it, unless their download failed. With a concurrency above one, the pages are
+    downloaded by the pooled asyncio fetch engine. The result order
+    matches the link order either way.
+
+    Args:
+        links (Iterable[str]): The repository links, can be a stream.
+        concurrency (int): Number of parallel downloads.
+        desc (str): Progress bar description.
+
+    Yields:
+        RepoPage: The result for every link, page records instead of soups.
+    """
+    store = get_repo_store()
+    links, plan_links = itertools.tee(links)
+
+    def _plan() -> Iterator[tuple[str, str, bool, RepoPage]]:
+        # the first link to every repository, with the page from the store.
+        seen = set()
+        for link in plan_links:
+            key = repo_key(link) or link
+            if not _is_model_file(link) and key not in seen:
+                seen.add(key)
+                found, page = (False, None)
+                if store is not None and repo_key(link) is not None:
+                    found, page = store.page(key)
+                yield key, canonical_repo_link(link), found, page
+
+    plan, fetch_plan = itertools.tee(_plan())
+    pages: Iterator[Union[FetchResult, None]] = itertools.repeat(None)
+    if concurrency > 1:
+        pages = iter_fetch(
+            (repo_link for _, repo_link, found, _ in fetch_plan if not found),
+            concurrency=concurrency,
         )
-        # remove links to zipped and other undesirable files.
-        ignore_list = ["tar.gz", ".bin", ".zip", ".pt", ".gif", ".jpeg", ".mp4"]
-        str_links = []
-        for link in str_links_map:
-            append = True
-            for ignore in ignore_list:
-                if ignore in link:
-                    append = False
-            if append:
-                str_links.append(link)
-
-        # remove duplicates, not doing it means frequently used repos have more weight.
-        # str_links = list(set(str_links))
-
-        # clean the data.
-        filtered_pages = []
-        for link in (bar := tqdm(str_links, desc=f"downloading {id}.")):
-            bar.set_description(link)
-            filtered_pages.append(process_repo_link(link))
-
-        with open(save_path, "wb") as f_write:
-            pickle.dump(filtered_pages, f_write)
+    results: dict[str, RepoPage] = {}
+    stored = 0
+    for link in (bar := tqdm(links, desc=desc)):
+        bar.set_description(link)
+        if _is_model_file(link):
+            yield process_repo_link(link)
+            continue
+        key = repo_key(link) or link
+        if key not in results:
+            _, repo_link, found, page = next(plan)
+            if found:
+                stored += 1
+            else:
+                downloaded = next(pages)
+                try:
+                    page = as_record(
+                        process_repo_link(repo_link, downloaded, raise_errors=True)
+                    )
+                except Exception as e:
+                    # failed downloads are not stored, later runs try again.
+                    tqdm.write(f"Page {repo_link} produced an error {e}.")
+                    page = None
+                else:
+                    if store is not None and repo_key(link) is not None:
+                        store.store_page(key, page, repo_link)
+            results[key] = page
+        yield results[key]
+    if results:
+        tqdm.write(
+            f"{len(results) - stored} repositories downloaded, {stored} from the"
+            f" repository store, for {bar.n} links."
+        )
+
+
+def download_venue(storage_id: str, concurrency: int = 1) -> int:
+    """Download the repository pages of a venue and store them.
+
+    Reads ./storage/{storage_id}.json and writes
+    ./storage/{storage_id}_filtered.jsonl.gz.
+
+    Args:
+        storage_id (str): The venue, with underscores instead of slashes.
+        concurrency (int): Number of parallel downloads.
+
+    Returns:
+        int: The number of stored pages.
+    """
+    with open(f"./storage/{storage_id}.json", "r") as f_read:
+        links = json.load(f_read)
+
+    str_links = list(get_repo_links(links, storage_id))
+
+    # remove duplicates, not doing it means frequently used repos have more weight.
+    # str_links = list(set(str_links))
+
+    # clean the data.
+    filtered_pages = download_repo_pages(
+        str_links, concurrency, desc=f"downloading {storage_id}."
+    )
+    return write_repo_pages(f"./storage/{storage_id}_filtered.jsonl.gz", filtered_pages)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    configure_cache(args.cache_dir, args.cache_size, args.cache_max_age)
+    configure_rate_limits(args.rate_limit)
+    configure_parser(args.parser)
+    configure_repo_store(args.repo_store, args.repo_max_age)
+    id = "_".join(args.id.split("/"))
+    print(f"Loading from: ./storage/{id}.json")
+
+    save_path = Path(f"./storage/{id}_filtered.jsonl.gz")
+    legacy_path = Path(f"./storage/{id}_filtered.pkl")
+
+    if not save_path.exists() and not legacy_path.exists():
+
+        download_venue(id, args.concurrency)
     else:
         print(f"{save_path} exists, exiting.")
@@ -0,0 +1,296 @@
+"""Stream a venue from its PDF links to repository statistics in one process.
+
+Instead of running `crawl_links_soup`, `filter_and_download_links` and
+`process_pages` one after the other, every stage runs in its own thread
+and hands its results to the next stage through a bounded queue.
+PDFs are still parsed while the first repository pages download and
+the first statistics are computed. The usual storage files and the
+results store are written along the way, so `plot_counters` and the
+single-stage scripts keep working.
+Stages whose storage file already exists are read from disk instead:
+
+    python -m src.paper_crawler.pipeline --id icml2024 --workers 4 --concurrency 8
+"""
+
+import json
+import multiprocessing.pool
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from functools import partial
+from pathlib import Path
+from typing import Any, TypeVar, Union
+
+from dotenv import load_dotenv
+from tqdm import tqdm
+
+from ._argparse_code import _parse_args
+from ._browser import configure_browser_pool
+from ._fetch import configure_cache, configure_rate_limits
+from ._journal import iter_journal
+from ._parse import configure_parser
+from ._threads import ordered_thread_map
+from ._pdf_links import configure_pdf_extractor
+from ._repo_store import configure_repo_store
+from ._results_store import configure_results_store
+from .crawl_links_soup import create_pool, get_pdf_links, process_links
+from .filter_and_download_links import download_repo_pages, get_repo_links
+from .process_pages import _stats_or_error, store_results, sub_page_waits
+from .repo_pages import RepoPage, as_record, load_repo_pages, write_repo_pages
+
+# items waiting between two stages.
+QUEUE_SIZE = 64
+
+T = TypeVar("T")
+
+
+class _ConsumerGone(Exception):
+    """Raised in a stage when nobody reads its results anymore."""
+
+
+def _run_stage(
+    produce: Callable[[Callable[[T], None]], None], maxsize: int = QUEUE_SIZE
+) -> Iterator[T]:
+    """Run a stage in a thread and iterate over what it emits.
+
+    Args:
+        produce (Callable): The stage, it calls its argument for every item.
+        maxsize (int): The stage blocks while this many items are waiting.
+
+    Yields:
+        T: The emitted items, in the order they were emitted.
+
+    Raises:
+        error: The exception the stage raised, in the consuming thread.
+            A stage stopped by e.g. SystemExit raises a RuntimeError here.
+    """
+    items: queue.Queue[tuple[bool, Any]] = queue.Queue(maxsize)
+    stopped = threading.Event()
+
+    def _emit(item: T) -> None:
+        while not stopped.is_set():
+            try:
+                items.put((False, item), timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise _ConsumerGone()
+
+    def _finish(error: Union[Exception, None]) -> None:
+        # the end marker must not be dropped, it is the only one.
+        while not stopped.is_set():
+            try:
+                items.put((True, error), timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def _run() -> None:
+        # kept if KeyboardInterrupt or SystemExit end the thread.
+        error: Union[Exception, None] = RuntimeError("The stage was interrupted.")
+        try:
+            produce(_emit)
+            error = None
+        except _ConsumerGone:
+            error = None
+        except Exception as e:
+            error = e
+        finally:
+            _finish(error)
+
+    thread = threading.Thread(target=_run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            done, item = items.get()
+            if done:
+                error = item
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def _passing(items: Iterable[T], emit: Callable[[T], None]) -> Iterator[T]:
+    """Emit every item on its way to a consumer in the same thread.
+
+    Args:
+        items (Iterable[T]): The items.
+        emit (Callable[[T], None]): Hands an item to the next stage.
+
+    Yields:
+        T: Every item, after it was emitted.
+    """
+    for item in items:
+        emit(item)
+        yield item
+
+
+def _paper_stage(
+    venue_id: str,
+    paper_path: Path,
+    timeout: int,
+    concurrency: int = 1,
+    derive_urls: bool = False,
+    pool: Union[multiprocessing.pool.Pool, None] = None,
+) -> Callable[[Callable[[Any], None]], None]:
+    """Find the GitHub links in every PDF, then store them in the venue JSON.
+
+    The stage runs in a thread, so PDF workers have to come from a `pool`
+    created before, forking them here would copy the other threads' locks.
+    """
+
+    def _produce(emit: Callable[[Any], None]) -> None:
+        storage_id = "_".join(venue_id.split("/"))
+        if "/" in venue_id:
+            # only the OpenReview crawler needs credentials.
+            from .crawl_links_openreview import (
+                get_venue_links,
+                process_openreview_links,
+            )
+
+            links = get_venue_links(venue_id)
+            process: Callable[[list[str]], Iterable[Any]] = partial(
+                process_openreview_links, concurrency=concurrency
+            )
+        else:
+            links = get_pdf_links(venue_id, concurrency, derive_urls)
+            process = partial(
+                process_links,
+                timeout=timeout,
+                pool=pool,
+                concurrency=concurrency,
+            )
+        results = list(
+            _passing(
+                iter_journal(links, f"./storage/{storage_id}.journal.jsonl", process),
+                emit,
+            )
+        )
+        # the OpenReview crawler does not create empty files.
+        if results or "/" not in venue_id:
+            with open(paper_path, "w") as f:
+                f.write(json.dumps(results))
+
+    return _produce
+
+
+def run_pipeline(
+    venue_id: str,
+    workers: int = 1,
+    concurrency: int = 1,
+    threads: int = 1,
+    timeout: int = 0,
+    resolver: str = "http",
+    derive_urls: bool = False,
+) -> Union[dict[str, Any], None]:
+    """Run all stages for a venue at once and store their results.
+
+    Args:
+        venue_id (str): A venue of `crawl_links_soup` or an OpenReview venue ID.
+        workers (int): Number of processes parsing PDFs.
+        concurrency (int): Number of parallel PDF and repository page downloads.
+        threads (int): Number of threads computing the statistics.
+        timeout (int): Seconds after which a single PDF is skipped.
+        resolver (str): How `process_pages.extract_stats` looks into sub-folders.
+        derive_urls (bool): See `crawl_links_soup.get_nips_pdf`.
+
+    Returns:
+        Union[dict[str, Any], None]: The counters, as stored by `process_pages`,
+            None if they were stored before.
+    """
+    storage_id = "_".join(venue_id.split("/"))
+    paper_path = Path(f"./storage/{storage_id}.json")
+    pages_path = Path(f"./storage/{storage_id}_filtered.jsonl.gz")
+    counter_path = Path(f"./storage/{storage_id}_stored_counters.pkl")
+    if counter_path.exists():
+        print(f"{counter_path} exists, skipping {venue_id}.")
+        return None
+    os.makedirs("./storage/", exist_ok=True)
+
+    start = time.monotonic()
+    pdf_pool = None
+    pages: Iterable[RepoPage]
+    if pages_path.exists():
+        pages = load_repo_pages(pages_path)
+    else:
+        papers: Iterable[Any]
+        if paper_path.exists():
+            with open(paper_path, "r") as f_read:
+                papers = json.load(f_read)
+        else:
+            if workers > 1 and "/" not in venue_id:
+                # fork the PDF workers before any stage thread is started.
+                pdf_pool = create_pool(workers)
+            papers = _run_stage(
+                _paper_stage(
+                    venue_id, paper_path, timeout, concurrency, derive_urls, pdf_pool
+                )
+            )
+        repo_links = get_repo_links(papers, storage_id)
+        downloads = map(
+            as_record,
+            download_repo_pages(
+                repo_links, concurrency, desc=f"downloading {venue_id}."
+            ),
+        )
+
+        def _store_pages(emit: Callable[[RepoPage], None]) -> None:
+            write_repo_pages(pages_path, _passing(downloads, emit))
+
+        pages = _run_stage(_store_pages)
+
+    results: list[dict[str, dict[str, bool]]] = []
+    links: list[str] = []
+    error_counter = 0
+    try:
+        for page, stats in ordered_thread_map(
+            partial(_stats_or_error, resolver=resolver), pages, threads
+        ):
+            if isinstance(stats, Exception) or page is None:
+                error_counter += 1
+                continue
+            if not results:
+                tqdm.write(f"First stats after {time.monotonic() - start:.1f}s.")
+            results.append(stats)
+            links.append(page[1])
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.close()
+            pdf_pool.join()
+
+    print(f"Problems {error_counter}.")
+    if sub_page_waits:
+        print(
+            f"Waited {sum(sub_page_waits):.1f}s for {len(sub_page_waits)} "
+            f"sub-folder pages, at most {max(sub_page_waits):.1f}s."
+        )
+    counters = store_results(storage_id, results, links)
+    print(f"{venue_id} took {time.monotonic() - start:.1f}s.")
+    return counters
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    args = _parse_args()
+    configure_cache(args.cache_dir, args.cache_size, args.cache_max_age)
+    configure_rate_limits(args.rate_limit)
+    configure_browser_pool(args.browsers)
+    configure_parser(args.parser)
+    configure_repo_store(args.repo_store, args.repo_max_age)
+    configure_results_store(args.results_store)
+    configure_pdf_extractor(args.pdf_extractor)
+    run_pipeline(
+        args.id,
+        workers=args.workers,
+        concurrency=args.concurrency,
+        threads=max(args.browsers, args.concurrency),
+        timeout=args.timeout,
+        resolver=args.subfolders,
+        derive_urls=args.derive_pdf_urls,
+    )
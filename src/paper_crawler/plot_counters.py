@@ -1,13 +1,24 @@
 """Plot the numbers computed by the other scripts."""
 
+import hashlib
+import json
+import multiprocessing
+import multiprocessing.pool
 import pickle
 from collections import Counter
+from collections.abc import Sequence
+from pathlib import Path
 from typing import Any, Union
 
 import matplotlib.pyplot as plt
 import numpy as np
 import tikzplotlib as tikz
 
+from ._argparse_code import _parse_plot_args
+from ._features import merge_matrix
+from ._results_store import ResultsStore, venue_series_and_year
+from .process_pages import FEATURE_COLUMNS, backfill_results_store, count_stats
+
 # tikzplotlib backwards compatability
 # we need to load an old version of matplotlib.
 # https://github.com/nschloe/tikzplotlib/issues/605
@@ -15,6 +26,22 @@ np.Inf = np.inf  # type: ignore
 np.float_ = np.float64  # type: ignore
 
 
+def _merge_spellings(
+    keys: list[Any], table: np.ndarray
+) -> tuple[list[Any], np.ndarray]:
+    """Add the counts of all spellings of a feature up, see `_features.FEATURES`.
+
+    Args:
+        keys (list): The feature of every column.
+        table (np.ndarray): The counts, one row per venue-year.
+
+    Returns:
+        tuple[list, np.ndarray]: The merged features and their counts.
+    """
+    matrix, merged_keys = merge_matrix(keys)
+    return merged_keys, table @ matrix
+
+
 def _post_process_dict(
     val_dict: dict[tuple[str, bool], int],
 ) -> dict[tuple[str, bool], int]:
@@ -26,73 +53,30 @@ def _post_process_dict(
     Returns:
         dict: Updated dictionary.
     """
-    # merge tox
-    tox_val = val_dict.pop(("tox.toml", True), 0) + val_dict.pop(("tox.ini", True), 0)
-    val_dict[("tox", True)] = tox_val
-
-    # merge readme
-    rmd_val = (
-        val_dict.pop(("README.md", True), 0)
-        + val_dict.pop(("README.rst", True), 0)
-        + val_dict.pop(("readme.md", True), 0)
-        + val_dict.pop(("readme.rst", True), 0)
-        + val_dict.pop(("Readme.md", True), 0)
-        + val_dict.pop(("Readme.rst", True), 0)
+    merged_keys, merged = _merge_spellings(
+        list(val_dict.keys()), np.array([list(val_dict.values())], dtype=np.int64)
     )
-    val_dict[("README", True)] = rmd_val
+    val_dict.clear()
+    val_dict.update(dict(zip(merged_keys, merged[0].tolist())))
+    return val_dict
 
-    # merge environment
-    env_val = val_dict.pop(("environment.yml", True), 0) + val_dict.pop(
-        ("environment.yaml", True), 0
-    )
-    val_dict[("environment", True)] = env_val
 
-    # merge make
-    make_val = (
-        val_dict.pop(("makefile", True), 0)
-        + val_dict.pop(("Makefile", True), 0)
-        + val_dict.pop(("GNUmakefile", True), 0)
-    )
-    val_dict[("Makefile", True)] = make_val
-
-    # merge docs
-    doc_val = val_dict.pop(("doc", True), 0) + val_dict.pop(("docs", True), 0)
-    val_dict[("docs", True)] = doc_val
-
-    # merge tests and test folder
-    testfolder_val = (
-        val_dict.pop(("test", True), 0)
-        + val_dict.pop(("tests", True), 0)
-        + val_dict.pop(("src/test", True), 0)
-        + val_dict.pop(("src/tests", True), 0)
-        + val_dict.pop(("package/test", True), 0)
-        + val_dict.pop(("package/tests", True), 0)
-    )
-    val_dict[("test-folder", True)] = testfolder_val
-
-    # merge licenses
-    license_val = (
-        val_dict.pop(("LICENSE.txt", True), 0)
-        + val_dict.pop(("license.txt", True), 0)
-        + val_dict.pop(("License.txt", True), 0)
-        + val_dict.pop(("LICENSE", True), 0)
-        + val_dict.pop(("License", True), 0)
-        + val_dict.pop(("license", True), 0)
-        + val_dict.pop(("LICENCE.txt", True), 0)
-        + val_dict.pop(("licence.txt", True), 0)
-        + val_dict.pop(("Licence.txt", True), 0)
-        + val_dict.pop(("LICENCE", True), 0)
-        + val_dict.pop(("Licence", True), 0)
-        + val_dict.pop(("licence", True), 0)
-        + val_dict.pop(("COPYING", True), 0)
-        + val_dict.pop(("copying", True), 0)
-        + val_dict.pop(("Copying", True), 0)
-        + val_dict.pop(("COPYING.txt", True), 0)
-        + val_dict.pop(("copying.txt", True), 0)
-        + val_dict.pop(("Copying.txt", True), 0)
-    )
-    val_dict[("LICENSE", True)] = license_val
-    return val_dict
+def _feature_index(counters: dict[str, Any]) -> dict[tuple[str, bool], int]:
+    """Merge the counters of one conference into a single lookup table.
+
+    Args:
+        counters (dict): The stored counters of a conference.
+
+    Returns:
+        dict: The count of every feature. If a feature appears in
+            several counters, the first one wins.
+    """
+    index: dict[tuple[str, bool], int] = {}
+    for counter in counters.values():
+        if type(counter) is Counter:
+            for data_key, count in counter.items():
+                index.setdefault(data_key, count)
+    return index
 
 
 def re_structure(
@@ -111,48 +95,21 @@ def re_structure(
     software_keys.extend(counter_dict[pids[-1]]["files"].keys())
     software_keys.extend(counter_dict[pids[-1]]["folders"].keys())
     software_keys.extend(counter_dict[pids[-1]]["language"].keys())
+    software_keys = list(dict.fromkeys(software_keys))
 
-    def find_key(counters: dict[str, Any], data_key: tuple[str, bool]) -> Any:
-        for counter in counters.values():
-            if type(counter) is Counter:
-                test = list(
-                    filter(lambda ftuple: data_key == ftuple[0], counter.items())
-                )
-                if test:
-                    return test[0][1]
-        raise KeyError(f"{data_key} not found.")
-
-    data_dict_by_feature: dict[tuple[str, bool], dict[str, int]] = {}
-    for conf_key in pids:
-        for data_key in software_keys:
-            if data_key in data_dict_by_feature.keys():
-                try:
-                    data_dict_by_feature[data_key][conf_key] = find_key(
-                        counter_dict[conf_key], data_key
-                    )
-                except KeyError as e:
-                    print(f"Key {data_key} not found for {conf_key}: {e}")
-                    data_dict_by_feature[data_key][conf_key] = 0
-            else:
-                try:
-                    data_dict_by_feature[data_key] = {}
-                    key_val = find_key(counter_dict[conf_key], data_key)
-                    data_dict_by_feature[data_key][conf_key] = key_val
-                except KeyError as e:
-                    print(f"Key {data_key} not found for {conf_key}: {e}.")
-                    data_dict_by_feature[data_key][conf_key] = 0
-
-    data_dict_by_conf: dict[str, dict[tuple[str, bool], int]] = {}
-    for pid in pids:
-        data_dict_by_conf[pid] = {}
-
-    for software_feature_key, conf_dict in data_dict_by_feature.items():
-        for pid in pids:
-            data_dict_by_conf[pid][software_feature_key] = conf_dict[pid]
+    table = np.zeros((len(pids), len(software_keys)), dtype=np.int64)
+    for row, conf_key in enumerate(pids):
+        index = _feature_index(counter_dict[conf_key])
+        missing = [data_key for data_key in software_keys if data_key not in index]
+        for data_key in missing:
+            print(f"Key {data_key} not found for {conf_key}.")
+        table[row] = [index.get(data_key, 0) for data_key in software_keys]
 
     # post-processing
-    for conf_key in data_dict_by_conf.keys():
-        data_dict_by_conf[conf_key] = _post_process_dict(data_dict_by_conf[conf_key])
+    merged_keys, merged = _merge_spellings(software_keys, table)
+    data_dict_by_conf: dict[str, dict[tuple[str, bool], int]] = {}
+    for conf_key, row in zip(pids, merged.tolist()):
+        data_dict_by_conf[conf_key] = dict(zip(merged_keys, row))
         data_dict_by_conf[conf_key]["page_total"] = counter_dict[conf_key]["page_total"]  # type: ignore
 
     if python_only:
@@ -161,245 +118,451 @@ def re_structure(
     return data_dict_by_conf
 
 
-def plot_data(data_dict_by_conf: dict[str, Any], plot_prefix: str) -> None:
-    """Generate and display multiple plots showing adoption rates.
+# one figure per feature, (file name suffix, features).
+LINE_PLOTS: list[tuple[str, list[tuple[str, bool]]]] = [
+    ("", [("LICENSE", True)]),
+    ("", [("README", True)]),
+    ("", [("uses_python", True)]),
+    (
+        "_requirements",
+        [
+            ("requirements.txt", True),
+            ("environment", True),
+            ("uv.lock", True),
+            ("Pipfile.lock", True),
+            ("poetry.lock", True),
+            ("pixi.lock", True),
+            ("pylock.toml", True),
+        ],
+    ),
+    (
+        "_packaging",
+        [
+            ("src", True),
+            ("setup.py", True),
+            ("setup.cfg", True),
+            ("pyproject.toml", True),
+            ("hatch.toml", True),
+            ("pixi.toml", True),
+        ],
+    ),
+    (
+        "_tests",
+        [
+            ("test-folder", True),
+            ("tox", True),
+            ("noxfile.py", True),
+            (".pre-commit-config.yaml", True),
+            (".github/workflows", True),
+            ("docs", True),
+            ("Makefile", True),
+        ],
+    ),
+    ("", [(".flake8", True)]),
+]
+# fingerprints of the rendered figures, stored next to them.
+PLOT_MANIFEST = "plots_manifest.json"
+BAR_PLOT_TICKS = [
+    "README",
+    "LICENSE",
+    "python",
+    "dependencies",
+    "packaged",
+    "tests",
+    "docs",
+]
+
+
+def _pickled_counters(venue: str) -> Union[dict[str, Any], None]:
+    """Load the counters of a venue from runs before the results store."""
+    path = Path(f"./storage/{venue}_stored_counters.pkl")
+    if not path.exists():
+        return None
+    with open(path, "rb") as f_read:
+        counters: dict[str, Any] = pickle.load(f_read)
+    return counters
+
+
+def store_counters(store: ResultsStore, venue: str) -> Union[dict[str, Any], None]:
+    """Count the features of a venue in the results store.
+
+    Venues of runs before the results store and the stats matrix only
+    have ./storage/{venue}_stored_counters.pkl, which is used instead.
 
-    data_dict_by_conf (dict):
-        As generated by the re_structure function.
-    plot_prefix (str):
-        Prefix used for naming the output plot files.
+    Args:
+        store (ResultsStore): The results of all venues.
+        venue (str): The storage id of the venue.
 
-    Side Effects:
-        - Displays plots using matplotlib.
-        - Saves plots as TikZ/LaTeX files in the './plots/' directory
-          if a filename is provided.
-        - Prints warnings if expected keys are missing in the data.
+    Returns:
+        Union[dict[str, Any], None]: The counters, see
+            `process_pages.count_stats`, None if the venue is not stored.
     """
+    if not store.has_venue(venue):
+        return _pickled_counters(venue)
+    columns = ["/".join(column) for column in FEATURE_COLUMNS]
+    matrix, _ = store.stats_matrix(venue, columns)
+    return count_stats(matrix, verbose=False)
 
-    def _set_up_plot(
-        keys: list[tuple[str, bool]], filename: Union[str, None] = None
-    ) -> None:
 
-        for key in keys:
-            for conf in data_dict_by_conf.keys():
-                data_dict = data_dict_by_conf[conf]
-                labels = sorted(list(data_dict.keys()))
-                data = []
-                for label in labels:
-                    try:
-                        dat = data_dict[label][key]
-                    except KeyError as e:
-                        print(f"Key {label} not found, {e}.")
-                        dat = 0
-                    data.append((dat / data_dict[label]["page_total"]) * 100)
-                plt.plot(labels, data, ".-", label=conf)
-            plt.title(key[0])
-            plt.legend()
-            # plt.ylim(0, 105)
-            plt.grid()
-            plt.ylabel("adoption [\%]")  # noqa: W605
-            plt.xlabel("conference year")
-
-            if filename:
-                save_key = key[0].replace(".", "_").replace("/", "_")
-                tikz.save(f"./plots/{filename}_{save_key}.tex", standalone=True)
-            plt.show()
-            plt.clf()
-
-    # License
-    keys = [("LICENSE", True)]
-    _set_up_plot(keys, f"{plot_prefix}")
-
-    # Readme
-    keys = [("README", True)]
-    _set_up_plot(keys, f"{plot_prefix}")
-
-    # Python
-    keys = [("uses_python", True)]
-    _set_up_plot(keys, f"{plot_prefix}")
-
-    # Requirements
-    keys = [
-        ("requirements.txt", True),
-        ("environment", True),
-        ("uv.lock", True),
-        ("Pipfile.lock", True),
-        ("poetry.lock", True),
-        ("pixi.lock", True),
-        ("pylock.toml", True),
-    ]
-    _set_up_plot(keys, f"{plot_prefix}_requirements")
-
-    # packaging
-    keys = [
-        ("src", True),
-        ("setup.py", True),
-        ("setup.cfg", True),
-        ("pyproject.toml", True),
-        ("hatch.toml", True),
-        ("pixi.toml", True),
-    ]
-    _set_up_plot(keys, f"{plot_prefix}_packaging")
-
-    # Tests and container
-    keys = [
-        ("test-folder", True),
-        ("tox", True),
-        ("noxfile.py", True),
-        (".pre-commit-config.yaml", True),
-        (".github/workflows", True),
-        ("docs", True),
-        ("Makefile", True),
-    ]
-    _set_up_plot(keys, f"{plot_prefix}_tests")
+def series_counters(
+    store: ResultsStore, series: str, years: Sequence[int]
+) -> dict[str, dict[str, Any]]:
+    """Count the features of every year of a venue series.
 
-    # lint
-    keys = [(".flake8", True)]
-    _set_up_plot(keys, f"{plot_prefix}")
+    Args:
+        store (ResultsStore): The results of all venues.
+        series (str): The series, like "icml", see
+            `_results_store.venue_series_and_year`.
+        years (Sequence[int]): The years to load.
 
+    Returns:
+        dict[str, dict[str, Any]]: The counters of every year, keyed by
+            plot-conference ids like "24", in chronological order. If a
+            year has several venues, the last one in name order wins.
+            Venues without Python repositories are left out, venues
+            with only pickled counters are included, see `store_counters`.
+    """
+    venues = dict(store.venues(series))
+    for path in Path("./storage").glob("*_stored_counters.pkl"):
+        venue = path.name[: -len("_stored_counters.pkl")]
+        venue_series, year = venue_series_and_year(venue)
+        if venue_series == series and venue not in venues:
+            venues[venue] = year
+    counters = {}
+    for venue, year in sorted(venues.items(), key=lambda item: (item[1] or 0, item[0])):
+        if year is None or year not in years:
+            continue
+        venue_counters = store_counters(store, venue)
+        if venue_counters is None or not venue_counters["page_total"]:
+            print(f"No python repositories in {venue}, skipping.")
+            continue
+        counters[f"{year % 100}"] = venue_counters
+    return counters
+
+
+def load_plot_manifest(out_dir: Union[str, Path]) -> dict[str, str]:
+    """Read the fingerprints of the figures rendered so far.
 
-if __name__ == "__main__":
-    # PLOT ICML stats.
-    file_ids = [f"icml20{year}" for year in range(17, 25)] + ["ICML.cc_2025_Conference"]
-    pids = [f"{year}" for year in range(17, 26)]
-    icml_counter_dict = {}
-
-    for fid, pid in zip(file_ids, pids):
-        with open(f"./storage/{fid}_stored_counters.pkl", "rb") as f:
-            id_counters = pickle.load(f)
-            icml_counter_dict[pid] = id_counters
-
-    structured_icml_dict = re_structure(pids, icml_counter_dict, python_only=True)
-
-    # PLOT aistats stats.
-    file_ids = [f"aistats20{year}" for year in range(17, 26)]
-    pids = [f"{year}" for year in range(17, 26)]
-    aistats_counter_dict = {}
-
-    for fid, pid in zip(file_ids, pids):
-        with open(f"./storage/{fid}_stored_counters.pkl", "rb") as f:
-            id_counters = pickle.load(f)
-            aistats_counter_dict[pid] = id_counters
-
-    structured_aistats_dict = re_structure(pids, aistats_counter_dict, python_only=True)
-
-    # PLOT Neurips stats
-    file_ids = [f"nips20{year}" for year in range(17, 25)]
-    pids = [f"{year}" for year in range(17, 25)]
-    neurips_counter_dict = {}
-
-    for fid, pid in zip(file_ids, pids):
-        with open(f"./storage/{fid}_stored_counters.pkl", "rb") as f:
-            id_counters = pickle.load(f)
-            neurips_counter_dict[pid] = id_counters
-
-    structured_neurips_dict = re_structure(pids, neurips_counter_dict, python_only=True)
-
-    # PLOT ICLR
-    file_ids = (
-        ["iclr2016"]
-        + ["ICLR.cc_2017_conference"]
-        + ["iclr2018"]
-        + ["iclr2019"]
-        + [f"ICLR.cc_20{year}_Conference" for year in range(20, 26)]
-    )
-    pids = [f"{year}" for year in range(17, 26)] + ["25"]
-    iclr_counter_dict = {}
+    Args:
+        out_dir (Union[str, Path]): The folder with the figures.
 
-    for fid, pid in zip(file_ids, pids):
-        with open(f"./storage/{fid}_stored_counters.pkl", "rb") as f:
-            id_counters = pickle.load(f)
-            iclr_counter_dict[pid] = id_counters
+    Returns:
+        dict[str, str]: The fingerprint of the data behind every
+            figure, keyed by file name without suffix.
+    """
+    path = Path(out_dir) / PLOT_MANIFEST
+    if not path.exists():
+        return {}
+    with open(path, "r") as f_read:
+        manifest: dict[str, str] = json.load(f_read)
+    return manifest
 
-    structured_iclr_dict = re_structure(pids, iclr_counter_dict, python_only=True)
 
-    # PLOT TMLR
-    def _bar_plots(conf: str) -> dict[str, float]:
+def save_plot_manifest(out_dir: Union[str, Path], manifest: dict[str, str]) -> None:
+    """Store the fingerprints of the rendered figures.
 
-        with open(f"./storage/{conf}_stored_counters.pkl", "rb") as f:
-            nested_dict = pickle.load(f)
+    Args:
+        out_dir (Union[str, Path]): The folder with the figures.
+        manifest (dict[str, str]): See `load_plot_manifest`.
+    """
+    with open(Path(out_dir) / PLOT_MANIFEST, "w") as f_write:
+        json.dump(manifest, f_write, indent=1, sort_keys=True)
 
-        counter_dict = (
-            nested_dict["files"] + nested_dict["folders"] + nested_dict["language"]
-        )
-        counter_dict["page_total"] = nested_dict["page_total"]
 
-        counter_dict = _post_process_dict(counter_dict)
+def _fingerprint(data: Any) -> str:
+    # the plotted data only holds strings, numbers and tuples, their repr is stable.
+    return hashlib.sha256(repr(data).encode("utf-8")).hexdigest()
 
-        readmecount = counter_dict[("README", True)]
-        file_total = float(counter_dict["page_total"])  # type: ignore
 
-        dependencies_counter = sum(
-            [
-                counter_dict[(deb, True)]
-                for deb in [
-                    "requirements.txt",
-                    "environment",
-                    "uv.lock",
-                ]
-            ]
-        )
-        packaged_counter = sum(
+def _up_to_date(
+    manifest: Union[dict[str, str], None],
+    stem: str,
+    fingerprint: str,
+    out_dir: Union[str, Path],
+    formats: Sequence[str],
+) -> bool:
+    if manifest is None or manifest.get(stem) != fingerprint:
+        return False
+    return all((Path(out_dir) / f"{stem}.{fmt}").exists() for fmt in formats)
+
+
+def _line_plot_stem(filename: str, key: tuple[str, bool]) -> str:
+    save_key = key[0].replace(".", "_").replace("/", "_")
+    return f"{filename}_{save_key}"
+
+
+def _line_plot_data(
+    data_dict_by_conf: dict[str, Any], key: tuple[str, bool]
+) -> list[tuple[str, list[tuple[str, int, int]]]]:
+    """Pick the numbers a line plot of one feature shows."""
+    return [
+        (
+            conf,
             [
-                counter_dict[(deb, True)]
-                for deb in ["setup.py", "pyproject.toml", "hatch.toml"]
-            ]
+                (label, data_dict[label].get(key, 0), data_dict[label]["page_total"])
+                for label in sorted(data_dict.keys())
+            ],
         )
-        return {
-            "README": readmecount / file_total,
-            "file_total": file_total,
-            "dependencies": dependencies_counter / file_total,
-            "packaged": packaged_counter / file_total,
-            "tests": counter_dict[("test-folder", True)] / file_total,
-            "docs": counter_dict[("docs", True)] / file_total,
-            "python": counter_dict["uses_python", True] / file_total,
-            "LICENSE": counter_dict["LICENSE", True] / file_total,
-        }
-
-    tmlr_data = _bar_plots("tmlr")
-
-    # plot jmlr-mloss
-    mloss_data = _bar_plots("mloss")
-
-    tmlr_and_mloss = {"tmlr": tmlr_data, "mloss": mloss_data}
-
-    xticks = [
-        "README",
-        "LICENSE",
-        "python",
-        "dependencies",
-        "packaged",
-        "tests",
-        "docs",
+        for conf, data_dict in data_dict_by_conf.items()
     ]
-    x = np.arange(len(xticks))
+
+
+def _save_figure(stem: Path, formats: Sequence[str], standalone: bool = True) -> None:
+    for fmt in formats:
+        if fmt == "tex":
+            tikz.save(f"{stem}.tex", standalone=standalone)
+        else:
+            plt.savefig(f"{stem}.{fmt}")
+
+
+def _line_plot(
+    data_dict_by_conf: dict[str, Any],
+    key: tuple[str, bool],
+    filename: str,
+    out_dir: Union[str, Path] = "./plots",
+    formats: Sequence[str] = ("tex",),
+    show: bool = True,
+) -> None:
+    plt.figure()
+    for conf in data_dict_by_conf.keys():
+        data_dict = data_dict_by_conf[conf]
+        labels = sorted(list(data_dict.keys()))
+        data = []
+        for label in labels:
+            try:
+                dat = data_dict[label][key]
+            except KeyError as e:
+                print(f"Key {label} not found, {e}.")
+                dat = 0
+            data.append((dat / data_dict[label]["page_total"]) * 100)
+        plt.plot(labels, data, ".-", label=conf)
+    plt.title(key[0])
+    plt.legend()
+    # plt.ylim(0, 105)
+    plt.grid()
+    plt.ylabel("adoption [\%]")  # noqa: W605
+    plt.xlabel("conference year")
+
+    _save_figure(Path(out_dir) / _line_plot_stem(filename, key), formats)
+    if show:
+        plt.show()
+    plt.close()
+
+
+def plot_data(
+    data_dict_by_conf: dict[str, Any],
+    plot_prefix: str,
+    out_dir: Union[str, Path] = "./plots",
+    formats: Sequence[str] = ("tex",),
+    show: bool = True,
+    pool: Union[multiprocessing.pool.Pool, None] = None,
+    manifest: Union[dict[str, str], None] = None,
+) -> int:
+    """Generate and display multiple plots showing adoption rates.
+
+    Args:
+        data_dict_by_conf (dict): As generated by the re_structure function.
+        plot_prefix (str): Prefix used for naming the output plot files.
+        out_dir (Union[str, Path]): Where the figures are stored.
+        formats (Sequence[str]): The file types to write, "tex" for TikZ,
+            or any format matplotlib can save, like "png" or "pdf".
+        show (bool): Display every figure and wait until it is closed.
+        pool (multiprocessing.pool.Pool, optional): Render the figures in
+            these worker processes, see `_start_renderers`. Figures are
+            never shown then.
+        manifest (dict[str, str], optional): Fingerprints of the figures
+            rendered before, see `load_plot_manifest`. Figures whose data
+            did not change are skipped, the others are updated.
+
+    Returns:
+        int: The number of figures rendered.
+
+    Side Effects:
+        - Displays plots using matplotlib.
+        - Saves plots to `out_dir`.
+        - Prints warnings if expected keys are missing in the data.
+    """
+    tasks = []
+    fingerprints = {}
+    for suffix, keys in LINE_PLOTS:
+        for key in keys:
+            filename = f"{plot_prefix}{suffix}"
+            stem = _line_plot_stem(filename, key)
+            fingerprint = _fingerprint(_line_plot_data(data_dict_by_conf, key))
+            if _up_to_date(manifest, stem, fingerprint, out_dir, formats):
+                continue
+            fingerprints[stem] = fingerprint
+            tasks.append((data_dict_by_conf, key, filename, out_dir, formats, show))
+    if pool is None:
+        for task in tasks:
+            _line_plot(*task)
+    else:
+        pool.starmap(_line_plot, [task[:-1] + (False,) for task in tasks])
+    if manifest is not None:
+        manifest.update(fingerprints)
+    return len(tasks)
+
+
+def adoption_rates(nested_dict: dict[str, Any]) -> dict[str, float]:
+    """Compute the adoption rates of a single venue, for the bar plot.
+
+    Args:
+        nested_dict (dict): The stored counters of the venue.
+
+    Returns:
+        dict[str, float]: The share of repositories with every
+            `BAR_PLOT_TICKS` feature and the total number of pages.
+    """
+    counter_dict = (
+        nested_dict["files"] + nested_dict["folders"] + nested_dict["language"]
+    )
+    counter_dict["page_total"] = nested_dict["page_total"]
+
+    counter_dict = _post_process_dict(counter_dict)
+
+    readmecount = counter_dict[("README", True)]
+    file_total = float(counter_dict["page_total"])  # type: ignore
+
+    dependencies_counter = sum(
+        [
+            counter_dict[(deb, True)]
+            for deb in [
+                "requirements.txt",
+                "environment",
+                "uv.lock",
+            ]
+        ]
+    )
+    packaged_counter = sum(
+        [
+            counter_dict[(deb, True)]
+            for deb in ["setup.py", "pyproject.toml", "hatch.toml"]
+        ]
+    )
+    return {
+        "README": readmecount / file_total,
+        "file_total": file_total,
+        "dependencies": dependencies_counter / file_total,
+        "packaged": packaged_counter / file_total,
+        "tests": counter_dict[("test-folder", True)] / file_total,
+        "docs": counter_dict[("docs", True)] / file_total,
+        "python": counter_dict["uses_python", True] / file_total,
+        "LICENSE": counter_dict["LICENSE", True] / file_total,
+    }
+
+
+def plot_bars(
+    venue_rates: dict[str, dict[str, float]],
+    out_dir: Union[str, Path] = "./plots",
+    formats: Sequence[str] = ("tex",),
+    show: bool = True,
+) -> None:
+    """Compare the adoption rates of a few venues in a bar plot.
+
+    Args:
+        venue_rates (dict): The `adoption_rates` of every venue.
+        out_dir (Union[str, Path]): Where the figure is stored.
+        formats (Sequence[str]): The file types to write, see `plot_data`.
+        show (bool): Display the figure and wait until it is closed.
+    """
+    x = np.arange(len(BAR_PLOT_TICKS))
     width = 0.25  # the width of the bars
     multiplier = 0
 
     fig, ax = plt.subplots(layout="constrained")
-    for venue, adoption_rates in tmlr_and_mloss.items():
+    for venue, rates in venue_rates.items():
         offset = width * multiplier
         plt.bar(
             x + offset,
-            [adoption_rates[tick] * 100.0 for tick in xticks],
+            [rates[tick] * 100.0 for tick in BAR_PLOT_TICKS],
             width=width,
             label=venue,
         )
         multiplier += 1
-    ax.set_xticks(x + width, xticks)
+    ax.set_xticks(x + width, BAR_PLOT_TICKS)
     ax.set_ylim(0, 100)
     ax.set_ylabel("Adoption [\%]")  # noqa: W605
     ax.set_title("Estimated adoption")
     ax.grid()
     ax.legend(loc="upper right", ncol=2)
-    tikz.save("./plots/bar_plot.tex")
-    plt.show()
-
-    confs = {
-        "icml": structured_icml_dict,
-        "aistats": structured_aistats_dict,
-        "iclr": structured_iclr_dict,
-        "neurips": structured_neurips_dict,
-    }
+    _save_figure(Path(out_dir) / "bar_plot", formats, standalone=False)
+    if show:
+        plt.show()
+    plt.close(fig)
+
 
-    plot_data(confs, "line_plots")
+def _start_renderers(jobs: Union[int, None]) -> multiprocessing.pool.Pool:
+    """Start worker processes which draw on the non-interactive Agg backend."""
+    return multiprocessing.Pool(jobs, initializer=plt.switch_backend, initargs=("Agg",))
+
+
+if __name__ == "__main__":
+    args = _parse_plot_args()
+    if args.batch:
+        plt.switch_backend("Agg")
+    Path(args.out_dir).mkdir(parents=True, exist_ok=True)
+
+    store = ResultsStore(args.results_store)
+    for venue in backfill_results_store(store):
+        print(f"Imported ./storage/{venue}_stats.npz into {args.results_store}.")
+    # venue series with a line per year, by their name in the plots.
+    line_series = {
+        "icml": ("icml", range(2017, 2026)),
+        "aistats": ("aistats", range(2017, 2026)),
+        "iclr": ("iclr", range(2016, 2026)),
+        "neurips": ("nips", range(2017, 2026)),
+    }
+    bar_venues = ["tmlr", "mloss"]
+
+    confs = {}
+    for name, (series, years) in line_series.items():
+        venue_counters = series_counters(store, series, years)
+        if not venue_counters:
+            print(f"No {series} venues in {args.results_store}, skipping.")
+            continue
+        pids = list(venue_counters.keys())
+        confs[name] = re_structure(pids, venue_counters, python_only=True)
+    bar_rates = {}
+    for venue in bar_venues:
+        counters = store_counters(store, venue)
+        if counters is None:
+            print(f"{venue} is neither in {args.results_store} nor pickled, skipping.")
+        elif not counters["page_total"]:
+            print(f"No python repositories in {venue}, skipping.")
+        else:
+            bar_rates[venue] = adoption_rates(counters)
+    store.close()
+
+    manifest = {} if args.force else load_plot_manifest(args.out_dir)
+    bar_fingerprint = _fingerprint(sorted(bar_rates.items()))
+    bar_todo = not _up_to_date(
+        manifest, "bar_plot", bar_fingerprint, args.out_dir, args.formats
+    )
+    if args.batch:
+        with _start_renderers(args.jobs) as pool:
+            if bar_todo:
+                bars = pool.apply_async(
+                    plot_bars, (bar_rates, args.out_dir, args.formats, False)
+                )
+            rendered = plot_data(
+                confs,
+                "line_plots",
+                args.out_dir,
+                args.formats,
+                pool=pool,
+                manifest=manifest,
+            )
+            if bar_todo:
+                bars.get()
+    else:
+        if bar_todo:
+            plot_bars(bar_rates, args.out_dir, args.formats)
+        rendered = plot_data(
+            confs, "line_plots", args.out_dir, args.formats, manifest=manifest
+        )
+    manifest["bar_plot"] = bar_fingerprint
+    save_plot_manifest(args.out_dir, manifest)
+    total = sum(len(keys) for _, keys in LINE_PLOTS) + 1
+    print(
+        f"Rendered {rendered + bar_todo} of {total} figures, the others were up to date."
+    )
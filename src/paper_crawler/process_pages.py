@@ -1,50 +1,85 @@
 """This module allows parsing the github pages. It extracts file and folder names."""
 
+import json
 import pickle
-import time
+import urllib.parse
 from collections import Counter
+from functools import partial
 from pathlib import Path
-from typing import Any
+from typing import Any, Union
 
 import bs4
-from selenium.webdriver import Chrome
-from selenium.webdriver.chrome.options import Options
+import numpy as np
 from tqdm import tqdm
 
 from ._argparse_code import _parse_args
+from ._browser import configure_browser_pool, get_browser_pool, wait_for
+from ._features import spellings
+from ._fetch import configure_cache, configure_rate_limits, fetch
+from ._parse import configure_parser, make_soup
+from ._repo_store import configure_repo_store, get_repo_store
+from ._results_store import ResultsStore, configure_results_store, get_results_store
+from ._threads import ordered_thread_map
+from .filter_and_download_links import repo_key
+from .repo_pages import (
+    RepoPage,
+    _get_files_and_folders,
+    extract_page_record,
+    get_folder_names,
+    load_repo_pages,
+)
+
+FOLDER_TABLE_SELECTOR = 'table[aria-labelledby*="folders-and-files"]'
+FOLDER_TABLE_TIMEOUT = 4
+# seconds spent waiting for sub-folder pages to render.
+sub_page_waits: list[float] = []
+
+
+INTERESTING_FILES = spellings("files")
+INTERESTING_FOLDERS = spellings("folders")
+# tests nested in src or in a folder named like the repository.
+NESTED_FOLDERS = spellings("nested")
+# one column per feature of the stats matrix, see `stats_matrix`.
+FEATURE_COLUMNS = (
+    [("files", name) for name in INTERESTING_FILES]
+    + [("folders", name) for name in INTERESTING_FOLDERS + NESTED_FOLDERS]
+    + [("python", "uses_python")]
+)
+COLUMN_INDEX = {column: index for index, column in enumerate(FEATURE_COLUMNS)}
+PYTHON_COLUMN = COLUMN_INDEX[("python", "uses_python")]
+
+
+def _get_sub_folders_browser(folder_link: str) -> list[str]:
+    with get_browser_pool().borrow() as browser:
+        browser.get(folder_link)
+        sub_page_waits.append(
+            wait_for(browser, FOLDER_TABLE_SELECTOR, FOLDER_TABLE_TIMEOUT)
+        )
+        html = browser.page_source
 
+    folder_soup = make_soup(html, only="table")
+    folders, _, _ = _get_files_and_folders(folder_soup)
+    return folders
 
-def _get_files_and_folders(
-    soup: bs4.BeautifulSoup,
-) -> tuple[list[str], list[str], list[bs4.element.Tag]]:
-    # filter language, find spans first
-    folders_and_files = list(
-        filter(lambda table: "folders-and-files" in str(table), soup.find_all("table"))
-    )[0]
-    cells: list[bs4.element.Tag] = list(
-        filter(
-            lambda td: "row-name-cell" in str(td),  # type: ignore
-            folders_and_files.find_all("td"),  # type: ignore
-        )
-    )
-    folders = []
-    files = []
-    for cell in cells:
-        if "icon-directory" in str(cell):
-            folders.append(cell.text)
-        else:
-            files.append(cell.text)
-    return folders, files, cells
+
+def _get_sub_folders_http(folder_link: str) -> list[str]:
+    folder_soup = make_soup(fetch(folder_link), only=["table", "script"])
+    return get_folder_names(folder_soup)
 
 
 def extract_stats(
-    paper_soup_and_link: tuple[bs4.BeautifulSoup, str],
+    paper_soup_and_link: tuple[Union[bs4.BeautifulSoup, dict[str, Any]], str],
+    resolver: str = "http",
 ) -> dict[str, dict[str, bool]]:
     """Extract statistics from a BeautifulSoup object representing a paper's webpage.
 
     Args:
-        paper_soup_and_link (tuple): A tuple containing a BeautifulSoup object of
+        paper_soup_and_link (tuple): A tuple containing a BeautifulSoup object
+            or a stored page record (see `repo_pages.extract_page_record`) of
             the paper's webpage and the page link where we got the soup from.
+        resolver (str): How to look into sub-folders for nested tests.
+            "http" reads the static page and falls back to the browser,
+            "http-only" never starts a browser and "browser" always does.
 
     Returns:
         dict[str, bool]: A dictionary containing the presence of specific files,
@@ -57,125 +92,38 @@ def extract_stats(
                 and a boolean value indicating if Python is mentioned on the page.
     """
     # Second position is the page link, use for debugging.
-    soup, link = paper_soup_and_link
+    page, link = paper_soup_and_link
+    if isinstance(page, bs4.BeautifulSoup):
+        page = extract_page_record(page)
 
-    python_span = list(
-        filter(
-            lambda span: "Python" in str(span),
-            soup.find_all("span"),
-        )
-    )
-
-    folders, files, cells = _get_files_and_folders(soup)
-
-    interesting_files = [
-        "requirements.txt",
-        "noxfile.py",
-        "LICENSE.txt",
-        "license.txt",
-        "License.txt",
-        "LICENSE",
-        "License",
-        "license",
-        "LICENCE.txt",
-        "licence.txt",
-        "Licence.txt",
-        "LICENCE",
-        "Licence",
-        "licence",
-        "COPYING",
-        "copying",
-        "Copying",
-        "COPYING.txt",
-        "copying.txt",
-        "Copying.txt",
-        "README.md",
-        "readme.md",
-        "Readme.md",
-        "README.rst",
-        "readme.rst",
-        "Readme.rst",
-        "tox.toml",
-        "tox.ini",
-        "setup.py",
-        "setup.cfg",
-        "pyproject.toml",
-        "environment.yml",
-        "environment.yaml",
-        "uv.lock",
-        ".pre-commit-config.yml",
-        ".pre-commit-config.yaml",
-        "poetry.lock",
-        "poetry.toml",
-        "hatch.toml",
-        "pixi.lock",
-        "pixi.toml",
-        "Pipfile.lock",
-        "pylock.toml",
-        "GNUmakefile",
-        "makefile",
-        "Makefile",
-        ".flake8",
-    ]
-    interesting_folders = [
-        "test",
-        "tests",
-        ".github/workflows",
-        ".github",
-        "doc",
-        "docs",
-        "src",
-    ]
+    folders, files = page["folders"], page["files"]
 
     result_dict: dict[str, Any] = {}
     result_dict["files"] = {}
     result_dict["folders"] = {}
     result_dict["python"] = {}
-    for interesting_file in interesting_files:
+    for interesting_file in INTERESTING_FILES:
         result_dict["files"][interesting_file] = interesting_file in files
 
-    for interesting_folder in interesting_folders:
+    for interesting_folder in INTERESTING_FOLDERS:
         result_dict["folders"][interesting_folder] = interesting_folder in folders
-    if python_span:
+    if page["python"]:
         result_dict["python"]["uses_python"] = True
 
-    def _get_sub_soup(folder: str) -> bs4.BeautifulSoup:
-        cell_tuples = [(cell, cell) for cell in cells]
-        labels_and_cells = [
-            (
-                list(filter(lambda str_el: "label" in str_el, str(tcell[0]).split()))[
-                    0
-                ],
-                tcell[1],
-            )
-            for tcell in cell_tuples
+    def _get_sub_folders(folder: str) -> list[str]:
+        # prefer the exact name, fall back to the first cell containing it.
+        cell_links = page["cell_links"]
+        matches = [href for name, href in cell_links if name == folder] or [
+            href for name, href in cell_links if folder in name
         ]
-        pass
-        folder_link = (
-            str(
-                list(filter(lambda lc: folder in str(lc[0]), labels_and_cells))[0][
-                    1
-                ].find_all("a")[0]
-            )
-            .split("href")[1]
-            .split()[0]
-            .split('"')[1]
-        )
-        folder_link = "https://github.com" + folder_link
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Opens the browser up in background
-        # fix for ubuntu https://github.com/SeleniumHQ/selenium/issues/15327
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        # chrome_options.add_argument(f"--user-data-dir=./tmp_{time.time()}")
-
-        with Chrome(options=chrome_options) as browser:
-            browser.get(folder_link)
-            time.sleep(4)
-            html = browser.page_source
-
-        folder_soup = bs4.BeautifulSoup(html, "html.parser")
-        return folder_soup
+        folder_link = "https://github.com" + matches[0]
+        if resolver != "browser":
+            try:
+                return _get_sub_folders_http(folder_link)
+            except Exception:
+                if resolver == "http-only":
+                    raise
+        return _get_sub_folders_browser(folder_link)
 
     # see if we found tests, if not look for nested tests.
     tests_found = result_dict["folders"]["tests"] or result_dict["folders"]["test"]
@@ -183,8 +131,7 @@ def extract_stats(
         if result_dict["folders"]["src"]:
             # beautiful soup into src and looks for test or tests.
             try:
-                src_soup = _get_sub_soup("src")
-                src_folders, _, _ = _get_files_and_folders(src_soup)
+                src_folders = _get_sub_folders("src")
                 if "test" in src_folders:
                     result_dict["folders"]["src/test"] = True
                 if "tests" in src_folders:
@@ -195,8 +142,7 @@ def extract_stats(
         else:
             try:
                 packet_name = link.split("/")[-1]
-                src_soup = _get_sub_soup(packet_name)
-                src_folders, _, _ = _get_files_and_folders(src_soup)
+                src_folders = _get_sub_folders(packet_name)
                 if "test" in src_folders:
                     result_dict["folders"]["package/test"] = True
                 if "tests" in src_folders:
@@ -223,90 +169,319 @@ def python_filter(
     )
 
 
-if __name__ == "__main__":
-    args = _parse_args()
-    id = "_".join(args.id.split("/"))
-    load_path = f"./storage/{id}_filtered.pkl"
-    save_path = Path(f"./storage/{id}_stored_counters.pkl")
+def _stats_or_error(
+    paper_soup_and_link: RepoPage, resolver: str = "http"
+) -> Union[dict[str, dict[str, bool]], Exception]:
+    try:
+        if paper_soup_and_link is None:
+            raise ValueError("No usable repository page.")
+        store = get_repo_store()
+        key = repo_key(paper_soup_and_link[1])
+        if store is None or key is None:
+            return extract_stats(paper_soup_and_link, resolver)
+        # repositories cited by other venues were analysed before.
+        stats = store.stats(key, resolver)
+        if stats is None:
+            stats = extract_stats(paper_soup_and_link, resolver)
+            store.store_stats(key, stats, paper_soup_and_link, resolver)
+        return stats
+    except Exception as e:
+        return e
+
+
+def stats_matrix(results: list[dict[str, dict[str, bool]]]) -> np.ndarray:
+    """Turn the stats of many repositories into a boolean feature matrix.
 
-    if not save_path.exists():
-        with open(load_path, "rb") as f_read:
-            paper_pages = pickle.load(f_read)
+    Args:
+        results (list[dict[str, dict[str, bool]]]): `extract_stats` of every page.
 
-        results = []
+    Returns:
+        np.ndarray: One row per repository and one column per
+            `FEATURE_COLUMNS` entry, True where the repository has the feature.
+    """
+    matrix = np.zeros((len(results), len(FEATURE_COLUMNS)), dtype=bool)
+    for row, stats in enumerate(results):
+        for kind, features in stats.items():
+            for name, present in features.items():
+                column = COLUMN_INDEX.get((kind, name))
+                if column is not None and present:
+                    matrix[row, column] = True
+    return matrix
 
-        error_counter = 0
-        problems = []
-        for paper_soup_and_link in (bar := tqdm(paper_pages)):
-            # folders and files exists once per page.
-            try:
-                bar.set_description(f" {paper_soup_and_link[1]} ")
-                results.append(extract_stats(paper_soup_and_link))
-            except Exception as e:
-                #     # print(f"Error: {e}")
-                problems.append(e)
-                error_counter += 1
-
-        # remove repos that do not use Python.
-        results = python_filter(results)
-
-        # print(f"Problems: {problems}")
-        print(f"Problems {error_counter}.")
-        files: list[tuple[str, bool]] = []
-        for res in results:
-            files.extend(
-                list(filter(lambda res: res[1] is True, list(res["files"].items())))
-            )
 
-        python_use: list[tuple[str, bool]] = []
-        for res in results:
-            python_use.extend(
-                list(filter(lambda res: res[1] is True, list(res["python"].items())))
-            )
-        python_counter = Counter(python_use)
-
-        try:
-            python_total = list(python_counter.items())[0][1]
-        except IndexError as e:
-            print(f"No python code found, {e}")
-            python_total = 0
-
-        file_counter = Counter(files)
-        page_total = len(results)
-
-        print(f"Python total: {python_total}.")
-        print(f"Python share: {python_total / float(page_total)}.")
-
-        print("Files:")
-        print(f"total: {file_counter.items()} of {page_total}")
-        ratios = [(mc[0], mc[1] / float(page_total)) for mc in file_counter.items()]
-        print(f"ratios: {ratios}")
-        ratios = [(mc[0], mc[1] / float(python_total)) for mc in file_counter.items()]
-        print(f"python-ratios: {ratios}")
-
-        folders = []
-        for res in results:
-            folders.extend(
-                list(filter(lambda res: res[1] is True, list(res["folders"].items())))
-            )
+def save_stats_matrix(
+    path: Union[str, Path], matrix: np.ndarray, links: list[str]
+) -> None:
+    """Store a stats matrix, e.g. to compute new aggregates later on.
+
+    Args:
+        path (Union[str, Path]): The .npz file.
+        matrix (np.ndarray): The `stats_matrix`.
+        links (list[str]): The repository link of every row.
+    """
+    np.savez_compressed(
+        path,
+        matrix=matrix,
+        columns=np.array(["/".join(column) for column in FEATURE_COLUMNS]),
+        links=np.array(links, dtype=str),
+    )
+
+
+def load_stats_matrix(path: Union[str, Path]) -> tuple[np.ndarray, list[str]]:
+    """Load a stored stats matrix.
+
+    Columns are matched by name, so matrices stored before features
+    were added still load. Missing features are False.
+
+    Args:
+        path (Union[str, Path]): The .npz file.
+
+    Returns:
+        tuple[np.ndarray, list[str]]: The matrix in `FEATURE_COLUMNS`
+            order and the repository link of every row.
+    """
+    with np.load(path) as stored:
+        names = [str(name) for name in stored["columns"]]
+        matrix = np.zeros((len(stored["matrix"]), len(FEATURE_COLUMNS)), dtype=bool)
+        for stored_column, name in enumerate(names):
+            kind, feature = name.split("/", 1)
+            column = COLUMN_INDEX.get((kind, feature))
+            if column is not None:
+                matrix[:, column] = stored["matrix"][:, stored_column]
+        return matrix, [str(link) for link in stored["links"]]
+
+
+def _counter(matrix: np.ndarray, kind: str) -> Counter[tuple[str, bool]]:
+    """Count the features of one kind, in the order they first appear."""
+    if not len(matrix):
+        # venues without Python repositories.
+        return Counter()
+    columns = np.array(
+        [index for index, column in enumerate(FEATURE_COLUMNS) if column[0] == kind]
+    )
+    counts = matrix[:, columns].sum(axis=0)
+    first_rows = matrix[:, columns].argmax(axis=0)
+    present = np.flatnonzero(counts)
+    order = present[np.lexsort((present, first_rows[present]))]
+    return Counter(
+        {(FEATURE_COLUMNS[columns[i]][1], True): int(counts[i]) for i in order}
+    )
+
+
+def count_stats(
+    results: Union[list[dict[str, dict[str, bool]]], np.ndarray],
+    verbose: bool = True,
+) -> dict[str, Any]:
+    """Count how many Python repositories have each feature.
 
-        folders_counter = Counter(folders)
-        print("Folders")
-        print(f"total: {folders_counter.items()} of {page_total}")
-        print(
-            f"ratios: {[(mc[0], mc[1] / float(page_total))
-                       for mc in folders_counter.items()]}"
+    Args:
+        results (Union[list[dict[str, dict[str, bool]]], np.ndarray]):
+            `extract_stats` of every page, or their `stats_matrix`.
+        verbose (bool): Print totals and ratios.
+
+    Returns:
+        dict[str, Any]: The "files", "folders" and "language" counters
+            and the "page_total", as stored by this module.
+    """
+    matrix = results if isinstance(results, np.ndarray) else stats_matrix(results)
+    # remove repos that do not use Python.
+    matrix = matrix[matrix[:, PYTHON_COLUMN]]
+
+    python_counter = _counter(matrix, "python")
+    python_total = int(matrix[:, PYTHON_COLUMN].sum())
+    file_counter = _counter(matrix, "files")
+    folders_counter = _counter(matrix, "folders")
+    page_total = len(matrix)
+    counters = {
+        "files": file_counter,
+        "folders": folders_counter,
+        "language": python_counter,
+        "page_total": page_total,
+    }
+    if not verbose:
+        return counters
+    if not python_total:
+        print("No python code found.")
+        return counters
+
+    print(f"Python total: {python_total}.")
+    print(f"Python share: {python_total / float(page_total)}.")
+
+    print("Files:")
+    print(f"total: {file_counter.items()} of {page_total}")
+    ratios = [(mc[0], mc[1] / float(page_total)) for mc in file_counter.items()]
+    print(f"ratios: {ratios}")
+    ratios = [(mc[0], mc[1] / float(python_total)) for mc in file_counter.items()]
+    print(f"python-ratios: {ratios}")
+
+    print("Folders")
+    print(f"total: {folders_counter.items()} of {page_total}")
+    print(
+        f"ratios: {[(mc[0], mc[1] / float(page_total))
+                   for mc in folders_counter.items()]}"
+    )
+    return counters
+
+
+def _load_papers(storage_id: str) -> Union[list[Union[list[str], None]], None]:
+    """Read the GitHub links of every paper, None if the venue was not crawled here."""
+    paper_path = Path(f"./storage/{storage_id}.json")
+    if not paper_path.exists():
+        return None
+    with open(paper_path, "r") as f_read:
+        papers = json.load(f_read)
+    return [
+        (
+            [str(urllib.parse.urlunparse(link)) for link in page_links]
+            if page_links
+            else None
+        )
+        for page_links in papers
+    ]
+
+
+def store_results(
+    storage_id: str, results: list[dict[str, dict[str, bool]]], links: list[str]
+) -> dict[str, Any]:
+    """Store the statistics of a venue in all formats.
+
+    Writes the stats matrix ./storage/{storage_id}_stats.npz, the counters
+    ./storage/{storage_id}_stored_counters.pkl and, if configured, the
+    papers, links and repositories of the venue into the results store,
+    see `_results_store`.
+
+    Args:
+        storage_id (str): The venue, with underscores instead of slashes.
+        results (list[dict[str, dict[str, bool]]]): `extract_stats` of every page.
+        links (list[str]): The link of every page.
+
+    Returns:
+        dict[str, Any]: The counters, see `count_stats`.
+    """
+    matrix = stats_matrix(results)
+    save_stats_matrix(f"./storage/{storage_id}_stats.npz", matrix, links)
+    store = get_results_store()
+    if store is not None:
+        store.store_venue(
+            storage_id,
+            _load_papers(storage_id),
+            links,
+            matrix,
+            ["/".join(column) for column in FEATURE_COLUMNS],
         )
+    counters = count_stats(matrix)
+    with open(f"./storage/{storage_id}_stored_counters.pkl", "wb") as f_write:
+        pickle.dump(counters, f_write)
+    return counters
+
+
+def backfill_results_store(store: ResultsStore) -> list[str]:
+    """Import the stats matrices of venues which are not in the store yet.
 
-        with open(save_path, "wb") as f_write:
-            pickle.dump(
-                {
-                    "files": file_counter,
-                    "folders": folders_counter,
-                    "language": python_counter,
-                    "page_total": page_total,
-                },
-                f_write,
+    Reads every ./storage/*_stats.npz. Venues of runs older than the stats
+    matrix only have their counters, which lack the repositories, so
+    their stats stage has to run again, see `process_venue`. Until then,
+    `plot_counters` plots their pickled counters.
+
+    Args:
+        store (ResultsStore): The results of all venues.
+
+    Returns:
+        list[str]: The storage ids of the imported venues.
+    """
+    imported = []
+    for path in sorted(Path("./storage").glob("*_stats.npz")):
+        storage_id = path.name[: -len("_stats.npz")]
+        if store.has_venue(storage_id):
+            continue
+        matrix, links = load_stats_matrix(path)
+        store.store_venue(
+            storage_id,
+            _load_papers(storage_id),
+            links,
+            matrix,
+            ["/".join(column) for column in FEATURE_COLUMNS],
+        )
+        imported.append(storage_id)
+    return imported
+
+
+def process_venue(
+    storage_id: str,
+    threads: int = 1,
+    resolver: str = "http",
+    load_path: Union[str, Path, None] = None,
+) -> dict[str, Any]:
+    """Compute the statistics of a venue and store the counters.
+
+    Reads ./storage/{storage_id}_filtered.jsonl.gz, or the pickled soups
+    of older runs, and stores the results, see `store_results`.
+
+    Args:
+        storage_id (str): The venue, with underscores instead of slashes.
+        threads (int): Number of pages processed in parallel.
+        resolver (str): See `extract_stats`.
+        load_path (Union[str, Path], optional): Read the pages from here instead.
+
+    Returns:
+        dict[str, Any]: The counters, see `count_stats`.
+    """
+    if load_path is None:
+        load_path = Path(f"./storage/{storage_id}_filtered.jsonl.gz")
+        if not load_path.exists():
+            # fall back to the pickled soups of older runs.
+            load_path = Path(f"./storage/{storage_id}_filtered.pkl")
+    # pages are streamed, only a few pages are in memory at a time.
+    paper_pages = load_repo_pages(load_path)
+
+    results = []
+    links = []
+
+    error_counter = 0
+    problems = []
+    for paper_soup_and_link, stats in (
+        bar := tqdm(
+            ordered_thread_map(
+                partial(_stats_or_error, resolver=resolver),
+                paper_pages,
+                threads,
+            )
+        )
+    ):
+        # folders and files exists once per page.
+        if isinstance(stats, Exception) or paper_soup_and_link is None:
+            #     # print(f"Error: {stats}")
+            problems.append(stats)
+            error_counter += 1
+        else:
+            bar.set_description(f" {paper_soup_and_link[1]} ")
+            results.append(stats)
+            links.append(paper_soup_and_link[1])
+
+    # print(f"Problems: {problems}")
+    print(f"Problems {error_counter}.")
+    return store_results(storage_id, results, links)
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    configure_cache(args.cache_dir, args.cache_size, args.cache_max_age)
+    configure_rate_limits(args.rate_limit)
+    configure_browser_pool(args.browsers)
+    configure_parser(args.parser)
+    configure_repo_store(args.repo_store, args.repo_max_age)
+    configure_results_store(args.results_store)
+    # sub-folder pages are probed concurrently.
+    threads = max(args.browsers, args.concurrency)
+    id = "_".join(args.id.split("/"))
+    save_path = Path(f"./storage/{id}_stored_counters.pkl")
+
+    if not save_path.exists():
+        process_venue(id, threads, args.subfolders)
+        if sub_page_waits:
+            print(
+                f"Waited {sum(sub_page_waits):.1f}s for {len(sub_page_waits)} "
+                f"sub-folder pages, at most {max(sub_page_waits):.1f}s."
             )
     else:
         print(f"{save_path} exists, exiting.")
@@ -0,0 +1,261 @@
+"""Compact storage for downloaded GitHub repository front pages.
+
+Instead of pickling complete BeautifulSoup trees, we only keep what
+`process_pages` needs: the folders-and-files table, the links of its
+cells and whether the page mentions Python. The records are stored as
+gzip-compressed JSON lines and can be read back one page at a time.
+"""
+
+import gzip
+import json
+import os
+import pickle
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import Any, Union
+
+import bs4
+
+RepoPage = Union[tuple[Union[bs4.BeautifulSoup, dict[str, Any]], str], None]
+
+
+def _attrs_contain(tag: bs4.element.Tag, needle: str) -> bool:
+    for key, value in tag.attrs.items():
+        if needle in key or needle in (
+            value if isinstance(value, str) else " ".join(value)
+        ):
+            return True
+    return False
+
+
+def _mentions(element: bs4.element.PageElement, needle: str) -> bool:
+    """Check the name and attributes of a tag, or the text of a string."""
+    if isinstance(element, bs4.element.Tag):
+        return needle in element.name or _attrs_contain(element, needle)
+    return isinstance(element, bs4.element.NavigableString) and needle in element
+
+
+def _contains(tag: bs4.element.Tag, needle: str) -> bool:
+    """Check `needle in str(tag)` without serializing the subtree."""
+    return _mentions(tag, needle) or any(
+        _mentions(element, needle) for element in tag.descendants
+    )
+
+
+def _in_tag(element: bs4.element.PageElement, name: str) -> bool:
+    if isinstance(element, bs4.element.Tag) and element.name == name:
+        return True
+    return element.find_parent(name) is not None
+
+
+def _scan_page(
+    soup: bs4.BeautifulSoup,
+) -> tuple[Union[bs4.element.Tag, None], bool]:
+    """Find the folders-and-files table and Python spans in one pass.
+
+    Returns:
+        tuple: The folders-and-files table or None and
+            True if a span mentions Python.
+    """
+    table: Union[bs4.element.Tag, None] = None
+    python = False
+    for element in soup.descendants:
+        if not python and _mentions(element, "Python"):
+            python = _in_tag(element, "span")
+        if table is None and _mentions(element, "folders-and-files"):
+            if isinstance(element, bs4.element.Tag) and element.name == "table":
+                table = element
+            else:
+                table = element.find_parent("table")
+        if python and table is not None:
+            break
+    return table, python
+
+
+def _scan_table(
+    table: bs4.element.Tag,
+) -> tuple[list[str], list[str], list[bs4.element.Tag]]:
+    cells = [td for td in table.find_all("td") if _contains(td, "row-name-cell")]
+    folders = []
+    files = []
+    for cell in cells:
+        if _contains(cell, "icon-directory"):
+            folders.append(cell.text)
+        else:
+            files.append(cell.text)
+    return folders, files, cells
+
+
+def _get_files_and_folders(
+    soup: bs4.BeautifulSoup,
+) -> tuple[list[str], list[str], list[bs4.element.Tag]]:
+    table, _ = _scan_page(soup)
+    if table is None:
+        raise IndexError("No folders-and-files table found.")
+    return _scan_table(table)
+
+
+def _find_tree_items(data: Any) -> Union[list[dict[str, Any]], None]:
+    """Find the listing of the current folder in GitHub's embedded JSON."""
+    if isinstance(data, dict):
+        tree = data.get("tree")
+        if isinstance(tree, dict) and isinstance(tree.get("items"), list):
+            return tree["items"]
+        children: Iterable[Any] = data.values()
+    elif isinstance(data, list):
+        children = data
+    else:
+        return None
+    for child in children:
+        items = _find_tree_items(child)
+        if items is not None:
+            return items
+    return None
+
+
+def get_folder_names(soup: bs4.BeautifulSoup) -> list[str]:
+    """Get the folder names from a statically downloaded folder page.
+
+    The folders-and-files table is used if the page contains it,
+    otherwise the JSON payload GitHub embeds for its react app.
+
+    Args:
+        soup (bs4.BeautifulSoup): The parsed folder page.
+
+    Returns:
+        list[str]: The names of the folders.
+
+    Raises:
+        ValueError: If the page contains neither.
+    """
+    try:
+        return _get_files_and_folders(soup)[0]
+    except IndexError:
+        pass
+    for script in soup.find_all("script", {"type": "application/json"}):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        items = _find_tree_items(data)
+        if items is not None:
+            return [
+                item["name"] for item in items if item.get("contentType") == "directory"
+            ]
+    raise ValueError("No folder listing found.")
+
+
+def extract_page_record(soup: bs4.BeautifulSoup) -> dict[str, Any]:
+    """Extract everything `process_pages` needs from a repository page.
+
+    The document is walked once to find the table and the language spans,
+    instead of serializing every table and span to search its HTML.
+
+    Args:
+        soup (bs4.BeautifulSoup): The parsed repository front page.
+
+    Returns:
+        dict[str, Any]: A dictionary with the keys
+            - "folders": The folder names in the folders-and-files table.
+            - "files": The file names in the folders-and-files table.
+            - "cell_links": [name, href] pairs for every table cell.
+            - "python": True if a span on the page mentions Python.
+
+    Raises:
+        IndexError: If the page has no folders-and-files table.
+    """
+    table, python = _scan_page(soup)
+    if table is None:
+        raise IndexError("No folders-and-files table found.")
+    folders, files, cells = _scan_table(table)
+    cell_links = []
+    for cell in cells:
+        anchor = cell.find("a")
+        href = anchor.get("href") if isinstance(anchor, bs4.element.Tag) else None
+        cell_links.append([cell.text, href])
+    return {
+        "folders": folders,
+        "files": files,
+        "cell_links": cell_links,
+        "python": python,
+    }
+
+
+def as_record(page: RepoPage) -> RepoPage:
+    """Replace the soup of a page with its page record.
+
+    Args:
+        page (RepoPage): A `process_repo_link` result.
+
+    Returns:
+        RepoPage: The (record, link) tuple, None for pages
+            without a file table, which can not be processed later on.
+    """
+    if page is None or isinstance(page[0], dict):
+        return page
+    try:
+        return (extract_page_record(page[0]), page[1])
+    except IndexError:
+        return None
+
+
+def _to_record(page: RepoPage) -> Union[dict[str, Any], None]:
+    if page is None:
+        return None
+    content, link = page
+    if isinstance(content, bs4.BeautifulSoup):
+        try:
+            content = extract_page_record(content)
+        except IndexError:
+            # pages without a file table can not be processed later on.
+            return None
+    return {"link": link, "page": content}
+
+
+def write_repo_pages(path: Union[str, Path], pages: Iterable[RepoPage]) -> int:
+    """Stream repository pages into a compressed JSON lines file.
+
+    Every page is stored as soon as it arrives, soups are converted
+    into page records first. The file only appears once all pages are written.
+
+    Args:
+        path (Union[str, Path]): Where to store the pages.
+        pages (Iterable): `process_repo_link` results, None entries are kept.
+
+    Returns:
+        int: The number of stored entries.
+    """
+    tmp_path = f"{path}.part"
+    count = 0
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f_write:
+        for page in pages:
+            f_write.write(json.dumps(_to_record(page)) + "\n")
+            count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def load_repo_pages(path: Union[str, Path]) -> Iterator[RepoPage]:
+    """Load stored repository pages one at a time.
+
+    Legacy `_filtered.pkl` files with complete soups are supported as well,
+    but have to be unpickled at once.
+
+    Args:
+        path (Union[str, Path]): A `_filtered.jsonl.gz` or `_filtered.pkl` file.
+
+    Yields:
+        RepoPage: A (record, link) tuple or None, in the stored order.
+    """
+    if str(path).endswith(".pkl"):
+        with open(path, "rb") as f_read:
+            yield from pickle.load(f_read)
+        return
+
+    with gzip.open(path, "rt", encoding="utf-8") as f_read:
+        for line in f_read:
+            entry = json.loads(line)
+            if entry is None:
+                yield None
+            else:
+                yield (entry["page"], entry["link"])
@@ -0,0 +1,347 @@
+"""Run all stages of many venues in one process.
+
+Every venue has three stages, which depend on each other:
+"papers" stores the GitHub links of all PDFs, "pages" downloads the
+repository pages and "stats" counts their features. Stages of different
+venues run in parallel. They share one pool of PDF worker processes and
+budgets for parallel downloads and browsers. A stage is skipped if its
+outputs are newer than its inputs:
+
+    python -m src.paper_crawler.run_all icml2024 nips2023 --cpus 16
+"""
+
+import multiprocessing.pool
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import Any, NamedTuple, Union
+
+from dotenv import load_dotenv
+
+from ._argparse_code import _parse_run_all_args
+from ._browser import configure_browser_pool
+from ._fetch import configure_cache, configure_rate_limits
+from ._parse import configure_parser
+from ._pdf_links import configure_pdf_extractor
+from ._repo_store import configure_repo_store
+from ._results_store import configure_results_store, get_results_store
+from .crawl_jmlr import crawl_jmlr
+from .crawl_links_soup import create_pool
+from .crawl_links_soup import crawl_venue as crawl_soup_venue
+from .filter_and_download_links import download_venue
+from .process_pages import backfill_results_store, process_venue
+
+OPENREVIEW_VENUES = [
+    "ICLR.cc/2025/Conference",
+    "ICLR.cc/2024/Conference",
+    "ICLR.cc/2023/Conference",
+    "ICLR.cc/2022/Conference",
+    "ICLR.cc/2021/Conference",
+    "ICLR.cc/2020/Conference",
+    "ICLR.cc/2017/conference",
+    "ICML.cc/2025/Conference",
+]
+JMLR_VENUES = ["tmlr", "mloss"]
+# iclrs where openreview did not work.
+SELENIUM_VENUES = ["iclr2019", "iclr2018"]
+VENUES = (
+    JMLR_VENUES
+    + OPENREVIEW_VENUES
+    + SELENIUM_VENUES
+    + ["iclr2016"]
+    + [f"icml{year}" for year in range(2024, 2013, -1)]
+    + [f"aistats{year}" for year in range(2025, 2016, -1)]
+    + [f"nips{year}" for year in range(2024, 2013, -1)]
+)
+
+
+class Task(NamedTuple):
+    """One stage of one venue."""
+
+    name: str
+    run: Callable[[], Any]
+    inputs: list[Path]
+    outputs: list[Path]
+    deps: list[str]
+    needs: dict[str, int]
+    # outputs which are not files, e.g. rows of the results store.
+    stored: Union[Callable[[], bool], None] = None
+
+
+class Budget:
+    """Resources shared by all running tasks, e.g. parallel downloads.
+
+    A task reserves everything it needs at once, so two waiting tasks
+    can never block each other.
+    """
+
+    def __init__(self, limits: dict[str, int]) -> None:
+        """Create a budget.
+
+        Args:
+            limits (dict[str, int]): The available amount of every resource.
+        """
+        self.limits = limits
+        self._free = dict(limits)
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def reserve(self, needs: dict[str, int]) -> Iterator[None]:
+        """Wait until the resources are free and hold them.
+
+        Args:
+            needs (dict[str, int]): The amount of every resource.
+                More than the limit is capped to the limit.
+
+        Yields:
+            None: While the resources are held.
+        """
+        needs = {key: min(amount, self.limits[key]) for key, amount in needs.items()}
+        with self._condition:
+            self._condition.wait_for(
+                lambda: all(self._free[key] >= amount for key, amount in needs.items())
+            )
+            for key, amount in needs.items():
+                self._free[key] -= amount
+        try:
+            yield
+        finally:
+            with self._condition:
+                for key, amount in needs.items():
+                    self._free[key] += amount
+                self._condition.notify_all()
+
+
+def _up_to_date(task: Task) -> bool:
+    """Check if all outputs exist and are newer than the inputs."""
+    if not task.outputs or not all(output.exists() for output in task.outputs):
+        return False
+    if task.stored is not None and not task.stored():
+        return False
+    inputs = [path.stat().st_mtime for path in task.inputs if path.exists()]
+    outputs = [path.stat().st_mtime for path in task.outputs]
+    return not inputs or min(outputs) >= max(inputs)
+
+
+def _run_task(task: Task, budget: Budget, dry_run: bool) -> str:
+    if _up_to_date(task):
+        return "up to date"
+    if dry_run:
+        return "would run"
+    with budget.reserve(task.needs):
+        print(f"{task.name} started.")
+        start = time.monotonic()
+        task.run()
+    print(f"{task.name} finished after {time.monotonic() - start:.0f}s.")
+    return "done"
+
+
+def run_tasks(
+    tasks: list[Task], budget: Budget, jobs: int = 8, dry_run: bool = False
+) -> dict[str, str]:
+    """Run tasks as soon as their dependencies are done.
+
+    Args:
+        tasks (list[Task]): The tasks, dependencies refer to their names.
+        budget (Budget): The resources the tasks share.
+        jobs (int): Maximum number of tasks running at once.
+        dry_run (bool): Only check which tasks are up to date.
+
+    Returns:
+        dict[str, str]: The outcome of every task: "done", "up to date",
+            "failed", "blocked" if a dependency failed or "would run".
+    """
+    status: dict[str, str] = {}
+    waiting = list(tasks)
+    known = {task.name for task in tasks}
+    with ThreadPoolExecutor(jobs) as executor:
+        running: dict[Future[str], str] = {}
+        while waiting or running:
+            ready = [
+                task
+                for task in waiting
+                if all(dep in status for dep in task.deps if dep in known)
+            ]
+            if not ready and not running:
+                # dependency cycle, nothing can start anymore.
+                for task in waiting:
+                    status[task.name] = "blocked"
+                break
+            for task in ready:
+                deps = [status.get(dep) for dep in task.deps if dep in known]
+                waiting.remove(task)
+                if "failed" in deps or "blocked" in deps:
+                    print(f"{task.name} is blocked by a failed dependency.")
+                    status[task.name] = "blocked"
+                elif "would run" in deps:
+                    status[task.name] = "would run"
+                else:
+                    future = executor.submit(_run_task, task, budget, dry_run)
+                    running[future] = task.name
+            if not running:
+                continue
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    status[name] = future.result()
+                except Exception as e:
+                    print(f"{name} failed, {e}.")
+                    status[name] = "failed"
+    return status
+
+
+def build_tasks(
+    venues: list[str],
+    concurrency: int = 1,
+    threads: int = 1,
+    timeout: int = 0,
+    resolver: str = "http",
+    derive_urls: bool = False,
+    pdf_pool: Union[multiprocessing.pool.Pool, None] = None,
+) -> list[Task]:
+    """Create the stages of all venues.
+
+    Args:
+        venues (list[str]): The venueids.
+        concurrency (int): Parallel downloads of one stage.
+        threads (int): Pages processed in parallel by one stats stage.
+        timeout (int): Seconds after which a single PDF is skipped.
+        resolver (str): How the stats stage looks into sub-folders.
+        derive_urls (bool): See `crawl_links_soup.get_nips_pdf`.
+        pdf_pool (multiprocessing.pool.Pool, optional): Worker processes
+            shared by all venues, see `crawl_links_soup.create_pool`.
+
+    Returns:
+        list[Task]: The tasks, every dependency is listed before its dependents.
+            If the results store is configured, a stats stage also runs
+            when its venue is missing from the store.
+    """
+    storage = Path("./storage")
+    results_store = get_results_store()
+    tasks: dict[str, Task] = {}
+    for venue in venues:
+        storage_id = "_".join(venue.split("/"))
+        papers = storage / f"{storage_id}.json"
+        pages = storage / f"{storage_id}_filtered.jsonl.gz"
+        if not pages.exists() and (storage / f"{storage_id}_filtered.pkl").exists():
+            # the pickled soups of older runs.
+            pages = storage / f"{storage_id}_filtered.pkl"
+
+        papers_task = f"{storage_id}:papers"
+        if venue in JMLR_VENUES:
+            papers_task = "jmlr:papers"
+            tasks[papers_task] = Task(
+                papers_task,
+                crawl_jmlr,
+                [],
+                [storage / f"{jmlr_venue}.json" for jmlr_venue in JMLR_VENUES],
+                [],
+                {"network": 1},
+            )
+        elif "/" in venue:
+            # only the OpenReview crawler needs credentials.
+            from .crawl_links_openreview import crawl_venue as crawl_openreview_venue
+
+            tasks[papers_task] = Task(
+                papers_task,
+                partial(crawl_openreview_venue, venue, concurrency=concurrency),
+                [],
+                [papers],
+                [],
+                {"network": concurrency},
+            )
+        else:
+            tasks[papers_task] = Task(
+                papers_task,
+                partial(
+                    crawl_soup_venue,
+                    venue,
+                    timeout=timeout,
+                    concurrency=concurrency,
+                    derive_urls=derive_urls,
+                    pool=pdf_pool,
+                ),
+                [],
+                [papers],
+                [],
+                {"network": concurrency, "browser": int(venue in SELENIUM_VENUES)},
+            )
+        tasks[f"{storage_id}:pages"] = Task(
+            f"{storage_id}:pages",
+            partial(download_venue, storage_id, concurrency),
+            [papers],
+            [pages],
+            [papers_task],
+            {"network": concurrency},
+        )
+        tasks[f"{storage_id}:stats"] = Task(
+            f"{storage_id}:stats",
+            partial(process_venue, storage_id, threads, resolver),
+            [pages],
+            [storage / f"{storage_id}_stored_counters.pkl"],
+            [f"{storage_id}:pages"],
+            # sub-folders may be probed with a browser, unless http-only.
+            {"network": threads, "browser": 0 if resolver == "http-only" else threads},
+            partial(results_store.has_venue, storage_id) if results_store else None,
+        )
+    return list(tasks.values())
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    args = _parse_run_all_args()
+    configure_cache(args.cache_dir, args.cache_size, args.cache_max_age)
+    configure_rate_limits(args.rate_limit)
+    configure_parser(args.parser)
+    configure_pdf_extractor(args.pdf_extractor)
+    os.makedirs("./storage/", exist_ok=True)
+    venues = args.venues or VENUES
+    # only crawling PDFs needs the workers, e.g. not a dry run.
+    pdf_pool = None
+    if not args.dry_run and not all(
+        Path(f"./storage/{venue}.json").exists()
+        for venue in venues
+        if "/" not in venue and venue not in JMLR_VENUES
+    ):
+        # fork the PDF workers before any thread is started.
+        pdf_pool = create_pool(args.cpus or os.cpu_count() or 1)
+    # the workers do not need the database connection.
+    configure_repo_store(args.repo_store, args.repo_max_age)
+    configure_results_store(args.results_store)
+    results_store = get_results_store()
+    if results_store is not None:
+        for venue in backfill_results_store(results_store):
+            print(f"Imported ./storage/{venue}_stats.npz into {args.results_store}.")
+    configure_browser_pool(args.browsers)
+    try:
+        status = run_tasks(
+            build_tasks(
+                venues,
+                concurrency=args.concurrency,
+                threads=max(args.browsers, args.concurrency),
+                timeout=args.timeout,
+                resolver=args.subfolders,
+                derive_urls=args.derive_pdf_urls,
+                pdf_pool=pdf_pool,
+            ),
+            Budget({"network": args.connections, "browser": args.browsers}),
+            args.jobs,
+            args.dry_run,
+        )
+    finally:
+        if pdf_pool is not None:
+            pdf_pool.close()
+            pdf_pool.join()
+
+    for outcome in ["done", "up to date", "would run", "failed", "blocked"]:
+        names = [name for name, task_status in status.items() if task_status == outcome]
+        if names:
+            print(f"{outcome}: {len(names)}")
+            if outcome in ["failed", "blocked", "would run"]:
+                print("  " + " ".join(names))
@@ -1,8 +1,16 @@
 """Test the download code frome the 'filter_and_download_links' module."""
 
 import urllib
+from typing import Any
 
-from paper_crawler.filter_and_download_links import process_repo_link
+import pytest
+
+from paper_crawler import filter_and_download_links
+from paper_crawler.filter_and_download_links import (
+    canonical_repo_link,
+    process_repo_link,
+    repo_key,
+)
 
 
 def test_download() -> None:
@@ -36,3 +44,60 @@ def test_pth() -> None:
     )
     res = process_repo_link(links)
     assert res is None
+
+
+def test_repo_key() -> None:
+    """Links into the same repository share a key."""
+    links = [
+        "https://github.com/Owner/Repo",
+        "http://github.com/owner/repo/",
+        "https://www.github.com/owner/repo.git",
+        "https://github.com/owner/repo/tree/main/src",
+        "https://github.com/owner/repo#readme",
+        "https://github.com/owner/repo).",
+    ]
+    assert {repo_key(link) for link in links} == {"owner/repo"}
+    assert canonical_repo_link(links[3]) == "https://github.com/owner/repo"
+    assert canonical_repo_link(links[0]) == "https://github.com/Owner/Repo"
+    for link in [
+        "https://github.com/huggingface/",
+        "https://github.com/orgs/owner",
+        "https://owner.github.io/repo",
+    ]:
+        assert repo_key(link) is None
+        assert canonical_repo_link(link) == link
+
+
+def test_download_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Every repository is downloaded once, but returned for every link."""
+    downloaded = []
+
+    def _fake_process_repo_link(
+        repo_link: str, page: object = None, raise_errors: bool = False
+    ) -> tuple[dict[str, Any], str]:
+        downloaded.append(repo_link)
+        return ({"folders": [], "files": []}, repo_link)
+
+    monkeypatch.setattr(
+        filter_and_download_links, "process_repo_link", _fake_process_repo_link
+    )
+    links = [
+        "https://github.com/owner/repo",
+        "https://github.com/other/repo",
+        "https://github.com/owner/repo/tree/main",
+        "https://github.com/owner/repo/blob/main/model.pth",
+        "http://github.com/Owner/Repo.git",
+    ]
+    res = list(filter_and_download_links.download_repo_pages(links))
+    assert downloaded == [
+        "https://github.com/owner/repo",
+        "https://github.com/other/repo",
+        "https://github.com/owner/repo/blob/main/model.pth",
+    ]
+    assert [page[1] if page else None for page in res] == [
+        "https://github.com/owner/repo",
+        "https://github.com/other/repo",
+        "https://github.com/owner/repo",
+        "https://github.com/owner/repo/blob/main/model.pth",
+        "https://github.com/owner/repo",
+    ]
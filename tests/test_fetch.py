@@ -0,0 +1,154 @@
+"""Test the pooled fetch engine against a local web server."""
+
+import threading
+import time
+import urllib.error
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from paper_crawler._cache import HttpCache
+from paper_crawler._fetch import ConnectionPool, iter_fetch
+from paper_crawler._rate_limit import RateLimiter, parse_retry_after
+
+requests_seen: list[str] = []
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        requests_seen.append(self.path)
+        if self.path.startswith("/etag"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", '"v1"')
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"etag")
+            return
+        if self.path.startswith("/redirect"):
+            self.send_response(301)
+            self.send_header("Location", "/page/redirected")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/busy") and requests_seen.count(self.path) < 3:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/missing"):
+            self.send_error(404)
+            return
+        body = self.path.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture()
+def server_url() -> Iterator[str]:
+    """Start a local web server.
+
+    Yields:
+        str: The URL of the server.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pool_fetch(server_url: str) -> None:
+    """Check redirects, errors and connection reuse."""
+    pool = ConnectionPool(max_per_host=1)
+    assert pool.fetch(server_url + "/page/1") == b"/page/1"
+    assert pool.fetch(server_url + "/redirect") == b"/page/redirected"
+    with pytest.raises(urllib.error.HTTPError):
+        pool.fetch(server_url + "/missing")
+    assert pool.fetch(server_url + "/page/2") == b"/page/2"
+    pool.close()
+
+
+def test_iter_fetch_order(server_url: str) -> None:
+    """Make sure concurrent results come back in input order."""
+    urls = [f"{server_url}/page/{number}" for number in range(50)]
+    urls.insert(10, server_url + "/missing")
+    results = list(iter_fetch(urls, concurrency=8))
+    assert len(results) == len(urls)
+    assert isinstance(results[10], urllib.error.HTTPError)
+    pages = results[:10] + results[11:]
+    assert pages == [f"/page/{number}".encode() for number in range(50)]
+
+
+def test_cache(server_url: str, tmp_path: Path) -> None:
+    """Check cache hits, conditional revalidation and eviction."""
+    pool = ConnectionPool()
+    requests_seen.clear()
+    cache = HttpCache(tmp_path, max_bytes=1000)
+    assert cache.fetch(server_url + "/page/1", pool.request) == b"/page/1"
+    assert cache.fetch(server_url + "/page/1", pool.request) == b"/page/1"
+    assert requests_seen == ["/page/1"]
+
+    # with a max_age of zero every hit is revalidated.
+    cache = HttpCache(tmp_path, max_bytes=1000, max_age=0)
+    assert cache.fetch(server_url + "/etag", pool.request) == b"etag"
+    assert cache.fetch(server_url + "/etag", pool.request) == b"etag"
+    assert requests_seen == ["/page/1", "/etag", "/etag"]
+
+    with pytest.raises(urllib.error.HTTPError):
+        cache.fetch(server_url + "/missing", pool.request)
+
+    # only keep roughly 30 bytes, the oldest pages have to go.
+    cache = HttpCache(tmp_path, max_bytes=30)
+    for number in range(10, 20):
+        cache.fetch(f"{server_url}/page/{number}", pool.request)
+    bodies = sorted(path.read_bytes() for path in tmp_path.glob("*/*.body"))
+    assert bodies[-1] == b"/page/19"
+    assert len(bodies) <= 3
+    pool.close()
+
+
+def test_rate_limit(server_url: str) -> None:
+    """Check the pacing per host and the retries after a 429."""
+    limiter = RateLimiter({"127.0.0.1": (20.0, 1)})
+    pool = ConnectionPool(limiter=limiter)
+    start = time.monotonic()
+    for number in range(5):
+        pool.fetch(f"{server_url}/page/{number}")
+    # the first request is free, four more take 1/20 s each.
+    assert time.monotonic() - start >= 0.19
+
+    requests_seen.clear()
+    assert pool.fetch(server_url + "/busy") == b"/busy"
+    assert requests_seen == ["/busy"] * 3
+    # the rate was halved twice and recovers with every success.
+    assert limiter._buckets["127.0.0.1"].rate < 20.0
+
+    retrying = ConnectionPool(limiter=limiter, max_retries=1)
+    with pytest.raises(urllib.error.HTTPError):
+        retrying.fetch(server_url + "/busy/again")
+    pool.close()
+    retrying.close()
+
+
+def test_parse_retry_after() -> None:
+    """Retry-After can hold seconds or a date."""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
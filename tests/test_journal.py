@@ -0,0 +1,44 @@
+"""Test the resumable crawl journal."""
+
+from pathlib import Path
+from typing import Union
+
+from paper_crawler._journal import load_journal, run_with_journal
+
+
+def test_resume(tmp_path: Path) -> None:
+    """Make sure a restart only processes the missing links."""
+    journal_path = tmp_path / "venue.journal.jsonl"
+    links = ["a", "b", "c", "b"]
+    processed: list[str] = []
+    attempts: list[str] = []
+
+    def _process(todo: list[str]) -> list[Union[list[str], None]]:
+        processed.extend(todo)
+        attempts.extend(todo)
+        # "c" fails the first time, e.g. with a timeout.
+        return [
+            None if link == "c" and attempts.count(link) == 1 else [link]
+            for link in todo
+        ]
+
+    # simulate a crash after two links, with a half written line.
+    # None results of older journals are processed again.
+    with open(journal_path, "w") as f:
+        f.write('{"url": "a", "result": ["a"]}\n{"url": "b", "result": null}\n{"url')
+
+    res = run_with_journal(links, journal_path, _process)
+    assert processed == ["b", "c"]
+    assert res == [["a"], ["b"], None, ["b"]]
+    assert "c" not in load_journal(journal_path)
+
+    # the failed link is tried again.
+    processed.clear()
+    res = run_with_journal(links, journal_path, _process)
+    assert processed == ["c"]
+    assert res == [["a"], ["b"], ["c"], ["b"]]
+
+    # everything is done now.
+    processed.clear()
+    assert run_with_journal(links, journal_path, _process) == res
+    assert processed == []
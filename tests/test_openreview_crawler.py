@@ -1,8 +1,11 @@
 """See if the openreview crawler works as we would expect."""
 
+import time
+
 import pytest
 from dotenv import load_dotenv
 
+from paper_crawler import crawl_links_openreview
 from paper_crawler.crawl_links_openreview import get_openreview_submissions
 
 
@@ -22,3 +25,16 @@ def test_iclr23() -> None:
     venueid = "ICLR.cc/2023/Conference"
     links = get_openreview_submissions(venueid)
     assert len(links) == 3793
+
+
+def test_concurrent_order(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Concurrent processing must keep the order of the links."""
+    links = [f"https://openreview.net/pdf?id={number}" for number in range(20)]
+
+    def _fake_process_link(url: str) -> list[str]:
+        time.sleep(0.01 * (int(url.split("=")[1]) % 3))
+        return [url]
+
+    monkeypatch.setattr(crawl_links_openreview, "process_link", _fake_process_link)
+    results = list(crawl_links_openreview.process_openreview_links(links, 4))
+    assert results == [[link] for link in links]
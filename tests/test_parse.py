@@ -0,0 +1,69 @@
+"""Test that the parser backends and strainers agree."""
+
+from collections.abc import Callable
+from typing import Any, Union
+
+from bs4 import BeautifulSoup
+
+from paper_crawler._parse import available_backends, make_soup
+from paper_crawler.filter_and_download_links import REPO_PAGE_TAGS
+from paper_crawler.repo_pages import extract_page_record
+
+REPO_HTML = """
+<html><head><title>owner/repo</title></head><body>
+<button id="branch-picker-repos-header-ref-selector">main</button>
+<span class="color-fg-default text-bold mr-1">Python</span>
+<table aria-labelledby="folders-and-files">
+<tr><td class="react-directory-row-name-cell-large-screen"><svg class="icon-directory">\
+</svg><a aria-label="tests, (Directory)" href="/owner/repo/tree/main/tests">tests</a></td></tr>
+<tr><td class="react-directory-row-name-cell-large-screen"><svg class="icon-file"></svg>\
+<a aria-label="setup.py, (File)" href="/owner/repo/blob/main/setup.py">setup.py</a></td></tr>
+</table>
+<p>Unclosed paragraph <a href="https://github.com/owner/other">other</a>
+</body></html>
+"""
+
+LISTING_HTML = """
+<html><body><div class="paper">
+<a href="/paper/1.pdf">pdf</a> <a href="/paper/1.html">abs</a>
+<ul class="paper-list"><li><a href="/paper/2-Abstract.html" title="two">Two</a></li>
+<li><a href="/paper/3-Abstract.html">Three</a></ul>
+</div></body></html>
+"""
+
+
+def _pdf_links(soup: BeautifulSoup) -> list[str]:
+    return [str(a) for a in soup.find_all("a") if "pdf" in str(a)]
+
+
+def _compare_backends(
+    markup: str,
+    extract: Callable[[BeautifulSoup], Any],
+    only: Union[str, None] = None,
+) -> dict[str, Any]:
+    """Run the same extraction on the markup parsed by every installed backend."""
+    return {
+        backend: extract(make_soup(markup, only, backend=backend))
+        for backend in available_backends()
+    }
+
+
+def test_backends_agree() -> None:
+    """Every installed backend has to extract the same records and links."""
+    assert "html.parser" in available_backends()
+    records = _compare_backends(REPO_HTML, extract_page_record)
+    assert all(record == records["html.parser"] for record in records.values())
+    links = _compare_backends(LISTING_HTML, _pdf_links, only="a")
+    assert all(link == links["html.parser"] for link in links.values())
+
+
+def test_strainer_keeps_results() -> None:
+    """Parsing only the queried tags must not change what we extract."""
+    full = make_soup(REPO_HTML)
+    strained = make_soup(REPO_HTML, only=REPO_PAGE_TAGS)
+    assert extract_page_record(strained) == extract_page_record(full)
+    assert _pdf_links(make_soup(LISTING_HTML, only="a")) == _pdf_links(
+        make_soup(LISTING_HTML)
+    )
+    paper_list = make_soup(LISTING_HTML, only="ul", attrs={"class": "paper-list"})
+    assert len(paper_list.find_all("ul", {"class": "paper-list"})[0].find_all("a")) == 2
@@ -0,0 +1,61 @@
+"""Test the GitHub URL scan of raw PDFs."""
+
+import zlib
+
+import pytest
+
+from paper_crawler._pdf_links import configure_pdf_extractor, find_github_urls
+
+
+def _pdf(*objects: bytes) -> bytes:
+    """Assemble a PDF body, a real reader would need an xref table as well."""
+    body = b"%PDF-1.5\n"
+    for number, content in enumerate(objects, start=1):
+        body += b"%d 0 obj\n" % number + content + b"\nendobj\n"
+    return body + b"%%EOF\n"
+
+
+def _stream(content: bytes, extra: bytes = b"") -> bytes:
+    data = zlib.compress(content)
+    return (
+        b"<< /Length %d /Filter /FlateDecode%s >>\nstream\n" % (len(data), extra)
+        + data
+        + b"\nendstream"
+    )
+
+
+def test_annotations_and_text() -> None:
+    """Links hide in annotations, compressed objects and the text itself."""
+    pdf = _pdf(
+        b"<< /Type /Annot /A << /S /URI /URI (https://github.com/plain/annot) >> >>",
+        _stream(b"<< /A << /URI (https://github.com/packed/annot\\)) >> >>"),
+        _stream(
+            b"BT /F1 10 Tf 72 720 Td [(Code: https://git)-27(hub.com/text/)"
+            b"-10(repo.)-333(More)] TJ 0 -12 Td (https://github.com/next\\137line)"
+            b" Tj ET"
+        ),
+        _stream(b"(https://github.com/image/bytes)", b" /Subtype /Image"),
+        # the length is an indirect object, the stream ends at endstream.
+        b"<< /Length 6 0 R /Filter /FlateDecode >>\nstream\n"
+        + zlib.compress(b"BT (https://github.com/indirect/length) Tj ET")
+        + b"\nendstream",
+        b"1234",
+    )
+    assert find_github_urls(pdf) == [
+        "https://github.com/plain/annot",
+        "https://github.com/packed/annot",
+        "https://github.com/text/repo",
+        "https://github.com/next_line",
+        "https://github.com/indirect/length",
+    ]
+
+
+def test_nothing_found() -> None:
+    """Broken streams and PDFs without links give an empty list."""
+    pdf = _pdf(
+        b"<< /Filter /FlateDecode >>\nstream\nnot zlib\nendstream",
+        _stream(b"BT (https://gitlab.com/elsewhere) Tj ET"),
+    )
+    assert find_github_urls(pdf) == []
+    with pytest.raises(ValueError):
+        configure_pdf_extractor("pymupdf")
@@ -0,0 +1,119 @@
+"""Test the streaming pipeline."""
+
+import json
+import multiprocessing.pool
+import pickle
+import urllib.parse
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Union
+
+import pytest
+from bs4 import BeautifulSoup
+
+import paper_crawler.pipeline
+from paper_crawler.pipeline import _run_stage, run_pipeline
+from paper_crawler.repo_pages import load_repo_pages
+
+REPO_HTML = """
+<html><body>
+<span class="color-fg-default text-bold mr-1">Python</span>
+<table aria-labelledby="folders-and-files">
+<tr><td class="react-directory-row-name-cell-large-screen"><svg class="icon-directory">\
+</svg><a aria-label="tests, (Directory)" href="/owner/repo/tree/main/tests">tests</a></td></tr>
+<tr><td class="react-directory-row-name-cell-large-screen"><svg class="icon-file"></svg>\
+<a aria-label="setup.py, (File)" href="/owner/repo/blob/main/setup.py">setup.py</a></td></tr>
+</table>
+</body></html>
+"""
+
+
+# SystemExit propagates in the stage thread, see below.
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_run_stage() -> None:
+    """Check items arrive in order and errors reach the consumer."""
+
+    def _count(emit: Callable[[int], None]) -> None:
+        for number in range(100):
+            emit(number)
+
+    assert list(_run_stage(_count, maxsize=4)) == list(range(100))
+
+    def _fail(emit: Callable[[int], None]) -> None:
+        emit(1)
+        raise RuntimeError("stage failed")
+
+    with pytest.raises(RuntimeError):
+        list(_run_stage(_fail))
+
+    def _exit(emit: Callable[[int], None]) -> None:
+        raise SystemExit()
+
+    # SystemExit stays in the stage thread, the consumer does not hang.
+    with pytest.raises(RuntimeError, match="interrupted"):
+        list(_run_stage(_exit))
+
+    # a consumer that stops early must not leave the stage hanging.
+    stage = _run_stage(_count, maxsize=1)
+    assert next(stage) == 0
+    stage.close()
+
+
+def _fake_process_links(
+    links: Iterable[str],
+    workers: int = 1,
+    timeout: int = 0,
+    pool: Union[multiprocessing.pool.Pool, None] = None,
+    concurrency: int = 1,
+) -> Iterator[Union[list[urllib.parse.ParseResult], None]]:
+    # the pool must exist before the stage thread starts.
+    assert pool is not None and workers == 1
+    for link in links:
+        yield [urllib.parse.urlparse(f"https://github.com/owner/{link}")]
+
+
+def _fake_download(
+    links: Iterable[str], concurrency: int = 1, desc: str = ""
+) -> Iterator[Union[tuple[BeautifulSoup, str], None]]:
+    for link in links:
+        if link.endswith("broken"):
+            yield None
+        else:
+            yield (BeautifulSoup(REPO_HTML, "html.parser"), link)
+
+
+def test_run_pipeline(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run a venue through all stages and check the storage files."""
+    monkeypatch.chdir(tmp_path)
+    crawled = []
+
+    def _fake_get_pdf_links(
+        venue: str, concurrency: int = 1, derive_urls: bool = False
+    ) -> list[str]:
+        crawled.append((venue, concurrency, derive_urls))
+        return ["a", "broken", "b"]
+
+    monkeypatch.setattr(paper_crawler.pipeline, "get_pdf_links", _fake_get_pdf_links)
+    monkeypatch.setattr(paper_crawler.pipeline, "process_links", _fake_process_links)
+    monkeypatch.setattr(paper_crawler.pipeline, "download_repo_pages", _fake_download)
+
+    counters = run_pipeline(
+        "test2024", workers=2, concurrency=3, threads=2, derive_urls=True
+    )
+    assert crawled == [("test2024", 3, True)]
+    assert counters is not None
+    assert counters["page_total"] == 2
+    assert counters["folders"][("tests", True)] == 2
+
+    with open(tmp_path / "storage" / "test2024.json") as f:
+        assert len(json.load(f)) == 3
+    pages = list(load_repo_pages(tmp_path / "storage" / "test2024_filtered.jsonl.gz"))
+    assert [page[1] if page else None for page in pages] == [
+        "https://github.com/owner/a",
+        None,
+        "https://github.com/owner/b",
+    ]
+    with open(tmp_path / "storage" / "test2024_stored_counters.pkl", "rb") as fb:
+        assert pickle.load(fb) == counters
+    # everything is stored, a second run does nothing.
+    assert run_pipeline("test2024") is None
@@ -0,0 +1,148 @@
+"""Test the restructuring code of the plot_counters module."""
+
+import pickle
+from collections import Counter
+from functools import partial
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from paper_crawler._results_store import ResultsStore
+from paper_crawler.plot_counters import (
+    LINE_PLOTS,
+    _post_process_dict,
+    _start_renderers,
+    load_plot_manifest,
+    plot_data,
+    re_structure,
+    series_counters,
+    store_counters,
+)
+from paper_crawler.process_pages import FEATURE_COLUMNS, count_stats
+
+
+def _counter_dict() -> dict[str, dict[str, Any]]:
+    return {
+        "24": {
+            "files": Counter({("README.md", True): 3, ("tox.ini", True): 1}),
+            "folders": Counter({("tests", True): 2, ("docs", True): 1}),
+            "language": Counter({("uses_python", True): 4}),
+            "page_total": 5,
+        },
+        "25": {
+            "files": Counter({("README.md", True): 4, ("readme.rst", True): 1}),
+            "folders": Counter({("tests", True): 1, ("src/tests", True): 2}),
+            "language": Counter({("uses_python", True): 6}),
+            "page_total": 7,
+        },
+    }
+
+
+def test_re_structure() -> None:
+    """Counters per venue-year become flat, merged feature counts."""
+    res = re_structure(["24", "25"], _counter_dict())
+    assert res["24"][("README", True)] == 3
+    assert res["25"][("README", True)] == 5
+    assert res["24"][("test-folder", True)] == 2
+    assert res["25"][("test-folder", True)] == 3
+    assert res["24"][("tox", True)] == 0
+    assert res["24"][("uses_python", True)] == 4
+    assert res["25"]["page_total"] == 7
+
+
+def test_post_process_dict() -> None:
+    """All spellings of a feature are added up under its label."""
+    counts: Counter[Any] = Counter(
+        {
+            ("LICENSE", True): 2,
+            ("COPYING", True): 1,
+            ("docs", True): 1,
+            ("doc", True): 2,
+            ("src/tests", True): 1,
+            ("uses_python", True): 5,
+            ("tests", False): 3,
+        }
+    )
+    counts["page_total"] = 9
+    merged = _post_process_dict(counts)
+    assert merged[("LICENSE", True)] == 3
+    assert merged[("docs", True)] == 3
+    assert merged[("test-folder", True)] == 1
+    assert merged[("tox", True)] == 0
+    assert merged[("uses_python", True)] == 5
+    assert merged[("tests", False)] == 3
+    assert merged["page_total"] == 9
+    assert ("COPYING", True) not in merged
+
+
+def test_plot_batch(tmp_path: Path) -> None:
+    """Render all line plots in worker processes, without showing them."""
+    confs = {"venue": re_structure(["24", "25"], _counter_dict())}
+    with _start_renderers(2) as pool:
+        plot_data(confs, "lines", tmp_path, formats=["png"], pool=pool)
+    figures = sum(len(keys) for _, keys in LINE_PLOTS)
+    assert len(list(tmp_path.glob("lines*.png"))) == figures
+    assert (tmp_path / "lines_requirements_requirements_txt.png").exists()
+
+
+def test_plot_manifest(tmp_path: Path) -> None:
+    """Only figures whose data changed are rendered again."""
+    counter_dict = _counter_dict()
+    confs = {"venue": re_structure(["24", "25"], counter_dict)}
+    manifest = load_plot_manifest(tmp_path)
+    figures = sum(len(keys) for _, keys in LINE_PLOTS)
+    render = partial(plot_data, out_dir=tmp_path, formats=["png"], show=False)
+    assert render(confs, "lines", manifest=manifest) == figures
+    assert render(confs, "lines", manifest=manifest) == 0
+
+    counter_dict["25"]["files"][("readme.rst", True)] += 1
+    confs = {"venue": re_structure(["24", "25"], counter_dict)}
+    assert render(confs, "lines", manifest=manifest) == 1
+    (tmp_path / "lines_LICENSE.png").unlink()
+    assert render(confs, "lines", manifest=manifest) == 1
+
+
+def test_missing_and_empty_venues(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Venues which are not stored or have no Python repositories are skipped."""
+    monkeypatch.chdir(tmp_path)
+    columns = ["/".join(column) for column in FEATURE_COLUMNS]
+    store = ResultsStore(tmp_path / "results.sqlite")
+    matrix = np.zeros((3, len(FEATURE_COLUMNS)), dtype=bool)
+    store.store_venue("icml2023", None, ["a", "b", "c"], matrix, columns)
+    store.store_venue("tmlr", [None], [], matrix[:0], columns)
+
+    assert store_counters(store, "mloss") is None
+    for venue in ["icml2023", "tmlr"]:
+        counters = store_counters(store, venue)
+        assert counters is not None and counters["page_total"] == 0
+        assert not counters["files"] and not counters["language"]
+    assert series_counters(store, "icml", range(2017, 2026)) == {}
+    assert count_stats(matrix)["page_total"] == 0
+    store.close()
+
+
+def test_pickled_venues(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Venues from runs before the results store are plotted from their pickles."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "storage").mkdir()
+    columns = ["/".join(column) for column in FEATURE_COLUMNS]
+    store = ResultsStore(tmp_path / "results.sqlite")
+    matrix = np.ones((2, len(FEATURE_COLUMNS)), dtype=bool)
+    store.store_venue("icml2024", None, ["a", "b"], matrix, columns)
+    pickled = _counter_dict()["25"]
+    for venue in ["icml2023", "icml2024", "mloss"]:
+        with open(tmp_path / "storage" / f"{venue}_stored_counters.pkl", "wb") as f:
+            pickle.dump(pickled, f)
+
+    assert store_counters(store, "mloss") == pickled
+    assert store_counters(store, "tmlr") is None
+    counters = series_counters(store, "icml", range(2017, 2026))
+    assert list(counters) == ["23", "24"]
+    assert counters["23"] == pickled
+    # the results store wins over the pickle.
+    assert counters["24"]["page_total"] == 2
+    store.close()
@@ -3,10 +3,20 @@
 # import urllib
 # from bs4 import BeautifulSoup
 import urllib
+from collections import Counter
+from pathlib import Path
 
 from paper_crawler.crawl_jmlr import _parse_links, mloss_link
 from paper_crawler.filter_and_download_links import process_repo_link
-from paper_crawler.process_pages import extract_stats, python_filter
+from paper_crawler.process_pages import (
+    FEATURE_COLUMNS,
+    count_stats,
+    extract_stats,
+    load_stats_matrix,
+    python_filter,
+    save_stats_matrix,
+    stats_matrix,
+)
 
 
 def test_requirements_txt() -> None:
@@ -179,6 +189,14 @@ def test_nested_test_folder_packet() -> None:
     assert stats_in_pkg["folders"]["package/tests"] is True
 
 
+def test_nested_test_folder_http_only() -> None:
+    """Make sure nested tests are found without a browser."""
+    test_in_src_url = "https://github.com/bd2kccd/causal-compare"
+    loaded_test_in_src = process_repo_link(test_in_src_url)
+    stats_in_src = extract_stats(loaded_test_in_src, resolver="http-only")
+    assert stats_in_src["folders"]["src/test"] is True
+
+
 def test_pylock_toml() -> None:
     """Check if we can find pylock.toml files."""
     test_pylock_url = "https://github.com/BonnBytes/paper_crawler"
@@ -207,3 +225,39 @@ def test_python_filter() -> None:
     stats = [extract_stats(proc) for proc in processed]
     filtered = python_filter(stats)
     assert all([filt["python"]["uses_python"] is True for filt in filtered])
+
+
+def test_stats_matrix(tmp_path: Path) -> None:
+    """Count features with the matrix and store it."""
+    results = [
+        {
+            "files": {"setup.py": True, "README.md": False},
+            "folders": {"tests": False, "src/tests": True},
+            "python": {"uses_python": True},
+        },
+        {
+            "files": {"README.md": True, "setup.py": True},
+            "folders": {"tests": True},
+            "python": {"uses_python": True},
+        },
+        {"files": {"LICENSE": True}, "folders": {}, "python": {}},
+    ]
+    matrix = stats_matrix(results)
+    assert matrix.shape == (3, len(FEATURE_COLUMNS))
+    assert matrix.sum() == 8
+
+    counters = count_stats(matrix)
+    assert counters["page_total"] == 2
+    # counted in the order the features first appear.
+    assert list(counters["files"].items()) == [
+        (("setup.py", True), 2),
+        (("README.md", True), 1),
+    ]
+    assert counters["folders"] == Counter({("src/tests", True): 1, ("tests", True): 1})
+    assert counters["language"] == Counter({("uses_python", True): 2})
+
+    path = tmp_path / "stats.npz"
+    save_stats_matrix(path, matrix, ["a", "b", "c"])
+    loaded, links = load_stats_matrix(path)
+    assert (loaded == matrix).all()
+    assert links == ["a", "b", "c"]
@@ -0,0 +1,65 @@
+"""Test the compact storage of repository front pages."""
+
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from paper_crawler.repo_pages import (
+    extract_page_record,
+    get_folder_names,
+    load_repo_pages,
+    write_repo_pages,
+)
+
+REPO_HTML = """
+<html><body>
+<span class="color-fg-default text-bold mr-1">Python</span>
+<table aria-labelledby="folders-and-files">
+<tr><td class="react-directory-row-name-cell-large-screen"><svg class="icon-directory">\
+</svg><a aria-label="src, (Directory)" href="/owner/repo/tree/main/src">src</a></td></tr>
+<tr><td class="react-directory-row-name-cell-large-screen"><svg class="icon-file"></svg>\
+<a aria-label="setup.py, (File)" href="/owner/repo/blob/main/setup.py">setup.py</a></td></tr>
+</table>
+</body></html>
+"""
+
+
+def test_extract_page_record() -> None:
+    """Check the record of a synthetic repository page."""
+    record = extract_page_record(BeautifulSoup(REPO_HTML, "html.parser"))
+    assert record["folders"] == ["src"]
+    assert record["files"] == ["setup.py"]
+    assert record["cell_links"][0][1] == "/owner/repo/tree/main/src"
+    assert record["python"] is True
+
+
+PAYLOAD_HTML = """
+<html><body><react-app app-name="react-code-view">
+<script type="application/json" data-target="react-app.embeddedData">
+{"payload": {"tree": {"items": [
+{"name": "tests", "path": "src/tests", "contentType": "directory"},
+{"name": "setup.py", "path": "src/setup.py", "contentType": "file"}]}}}
+</script></react-app></body></html>
+"""
+
+
+def test_get_folder_names() -> None:
+    """Check both the table and the embedded JSON folder listings."""
+    assert get_folder_names(BeautifulSoup(REPO_HTML, "html.parser")) == ["src"]
+    assert get_folder_names(BeautifulSoup(PAYLOAD_HTML, "html.parser")) == ["tests"]
+
+
+def test_write_and_load(tmp_path: Path) -> None:
+    """Make sure the stored pages come back in order, errors included."""
+    link = "https://github.com/owner/repo"
+    soup = BeautifulSoup(REPO_HTML, "html.parser")
+    no_table = BeautifulSoup("<html><span>Python</span></html>", "html.parser")
+    path = tmp_path / "test_filtered.jsonl.gz"
+
+    count = write_repo_pages(path, iter([(soup, link), None, (no_table, link)]))
+    assert count == 3
+
+    loaded = list(load_repo_pages(path))
+    assert loaded[0] == (extract_page_record(soup), link)
+    assert loaded[1] is None
+    assert loaded[2] is None
@@ -0,0 +1,128 @@
+"""Test the repository store shared by all venues."""
+
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from paper_crawler import filter_and_download_links, process_pages
+from paper_crawler._repo_store import RepoStore, configure_repo_store
+
+RECORD = {"folders": ["tests"], "files": ["setup.py"], "cell_links": [], "python": True}
+STATS = {"python": {"uses_python": True}, "folders": {"tests": True}}
+
+
+def test_store(tmp_path: Path) -> None:
+    """Check lookups, staleness and that new pages drop old statistics."""
+    store = RepoStore(tmp_path / "repos.sqlite")
+    assert store.page("owner/repo") == (False, None)
+    link = "https://github.com/Owner/Repo"
+    store.store_page("owner/repo", (RECORD, link), link)
+    store.store_page("owner/profile", None, "https://github.com/owner/profile")
+    assert store.page("owner/repo") == (True, (RECORD, link))
+    assert store.page("owner/profile") == (True, None)
+
+    assert store.stats("owner/repo") is None
+    store.store_stats("owner/repo", STATS)
+    assert store.stats("owner/repo") == STATS
+    store.store_page("owner/repo", (RECORD, link), link)
+    assert store.stats("owner/repo") is None
+
+    # statistics are kept per resolver.
+    assert store.stats("owner/repo", "browser") is None
+    store.store_stats("owner/repo", STATS, resolver="browser")
+    assert store.stats("owner/repo", "browser") == STATS
+    assert store.stats("owner/repo", "http") is None
+
+    # statistics of pages from older runs come with their page.
+    store.store_stats("other/repo", STATS)
+    assert store.page("other/repo") == (False, None)
+    store.store_stats("other/repo", STATS, (RECORD, "https://github.com/other/repo"))
+    assert store.page("other/repo")[0]
+    # a second writer with a page must not fail on the existing row.
+    store.store_stats(
+        "other/repo",
+        STATS,
+        (RECORD, "https://github.com/other/repo"),
+        resolver="http-only",
+    )
+    assert store.stats("other/repo") == STATS
+    assert store.stats("other/repo", "http-only") == STATS
+    store.close()
+
+    stale = RepoStore(tmp_path / "repos.sqlite", max_age=0.01)
+    time.sleep(0.02)
+    assert stale.page("owner/repo") == (False, None)
+    stale.close()
+
+
+def test_shared_across_venues(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A second venue neither downloads nor analyses a known repository."""
+    downloaded = []
+    analysed = []
+
+    def _fake_process_repo_link(
+        repo_link: str, page: object = None, raise_errors: bool = False
+    ) -> tuple[dict[str, Any], str]:
+        downloaded.append(repo_link)
+        return (RECORD, repo_link)
+
+    def _fake_extract_stats(page: Any, resolver: str = "http") -> Any:
+        analysed.append(page[1])
+        return STATS
+
+    monkeypatch.setattr(
+        filter_and_download_links, "process_repo_link", _fake_process_repo_link
+    )
+    monkeypatch.setattr(process_pages, "extract_stats", _fake_extract_stats)
+    configure_repo_store(tmp_path / "repos.sqlite")
+    try:
+        for venue_links in [
+            ["https://github.com/owner/repo", "https://github.com/a/b"],
+            ["https://github.com/Owner/Repo/", "https://github.com/c/d"],
+        ]:
+            for page in filter_and_download_links.download_repo_pages(venue_links):
+                assert process_pages._stats_or_error(page) == STATS
+    finally:
+        configure_repo_store(None)
+    assert downloaded == [
+        "https://github.com/owner/repo",
+        "https://github.com/a/b",
+        "https://github.com/c/d",
+    ]
+    assert analysed == downloaded
+
+
+def test_failed_downloads_not_stored(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A failed download is tried again, pages without a branch picker are not."""
+    attempts = []
+
+    def _flaky_process_repo_link(
+        repo_link: str, page: object = None, raise_errors: bool = False
+    ) -> Any:
+        attempts.append(repo_link)
+        if repo_link.endswith("flaky") and attempts.count(repo_link) == 1:
+            raise TimeoutError("timed out")
+        if repo_link.endswith("profile"):
+            return None
+        return (
+            {"folders": [], "files": [], "cell_links": [], "python": False},
+            repo_link,
+        )
+
+    monkeypatch.setattr(
+        filter_and_download_links, "process_repo_link", _flaky_process_repo_link
+    )
+    configure_repo_store(tmp_path / "repos.sqlite")
+    links = ["https://github.com/owner/flaky", "https://github.com/owner/profile"]
+    try:
+        first = list(filter_and_download_links.download_repo_pages(links))
+        second = list(filter_and_download_links.download_repo_pages(links))
+    finally:
+        configure_repo_store(None)
+    assert first == [None, None]
+    assert second[0] is not None and second[1] is None
+    assert attempts == links + ["https://github.com/owner/flaky"]
@@ -0,0 +1,116 @@
+"""Test the results store of all venues."""
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from paper_crawler import _results_store
+from paper_crawler._results_store import ResultsStore, venue_series_and_year
+from paper_crawler.process_pages import (
+    FEATURE_COLUMNS,
+    backfill_results_store,
+    count_stats,
+    save_stats_matrix,
+    store_results,
+)
+
+COLUMNS = ["/".join(column) for column in FEATURE_COLUMNS]
+
+
+def test_series_and_year() -> None:
+    """Storage ids are split into series and year."""
+    assert venue_series_and_year("icml2024") == ("icml", 2024)
+    assert venue_series_and_year("ICLR.cc_2017_conference") == ("iclr", 2017)
+    assert venue_series_and_year("nips2019") == ("nips", 2019)
+    assert venue_series_and_year("tmlr") == ("tmlr", None)
+
+
+def test_store(tmp_path: Path) -> None:
+    """Store two venues, load them back and query across them."""
+    store = ResultsStore(tmp_path / "results.sqlite")
+    rng = np.random.default_rng(0)
+    matrices = {
+        "icml2023": rng.random((20, len(COLUMNS))) < 0.5,
+        "ICML.cc_2025_Conference": rng.random((7, len(COLUMNS))) < 0.5,
+    }
+    for venue, matrix in matrices.items():
+        links = [f"https://github.com/owner/{venue}{row}" for row in range(len(matrix))]
+        papers = [links[:2], None, links[2:]]
+        store.store_venue(venue, papers, links, matrix, COLUMNS)
+    # storing again replaces the repositories, None keeps the papers.
+    links = [f"https://github.com/other/{row}" for row in range(20)]
+    store.store_venue("icml2023", None, links, matrices["icml2023"], COLUMNS)
+
+    assert store.venues("icml") == [
+        ("icml2023", 2023),
+        ("ICML.cc_2025_Conference", 2025),
+    ]
+    assert store.venues("nips") == []
+    matrix, stored_links = store.stats_matrix("icml2023", COLUMNS)
+    assert (matrix == matrices["icml2023"]).all()
+    assert stored_links == links
+
+    # features which were not tracked yet are False.
+    matrix, _ = store.stats_matrix("icml2023", ["files/justfile"] + COLUMNS[:2])
+    assert not matrix[:, 0].any()
+    assert (matrix[:, 1:] == matrices["icml2023"][:, :2]).all()
+
+    readme = COLUMNS.index("files/README.md")
+    assert store.query(
+        "SELECT year, COUNT(*) FROM repos JOIN features USING (venue, repo)"
+        " WHERE series = ? AND feature = ? GROUP BY year ORDER BY year",
+        ("icml", "files/README.md"),
+    ) == [
+        (2023, matrices["icml2023"][:, readme].sum()),
+        (2025, matrices["ICML.cc_2025_Conference"][:, readme].sum()),
+    ]
+    assert store.query("SELECT COUNT(*) FROM papers WHERE venue = 'icml2023'") == [(3,)]
+    assert store.query("SELECT COUNT(*) FROM links WHERE venue = 'icml2023'") == [(20,)]
+    store.close()
+
+
+def test_store_results(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """process_pages writes the venue and its papers into the store."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "storage").mkdir()
+    with open(tmp_path / "storage" / "aistats2024.json", "w") as f_write:
+        json.dump([[["https", "github.com", "/owner/repo", "", "", ""]], None], f_write)
+    monkeypatch.setattr(
+        _results_store, "_store", ResultsStore(tmp_path / "storage" / "results.sqlite")
+    )
+    results = [
+        {"files": {"README.md": True}, "folders": {}, "python": {"uses_python": True}},
+        {"files": {"README.md": False}, "folders": {}, "python": {}},
+    ]
+    links = ["https://github.com/owner/repo", "https://github.com/other/repo"]
+    counters = store_results("aistats2024", results, links)
+
+    store = ResultsStore(tmp_path / "storage" / "results.sqlite")
+    matrix, stored_links = store.stats_matrix("aistats2024", COLUMNS)
+    assert stored_links == links
+    assert count_stats(matrix, verbose=False) == counters
+    assert store.query("SELECT paper, link FROM links") == [
+        (0, "https://github.com/owner/repo")
+    ]
+    store.close()
+
+
+def test_backfill(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Stats matrices of earlier runs are imported, stored venues are kept."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "storage").mkdir()
+    store = ResultsStore(tmp_path / "storage" / "results.sqlite")
+    matrix = np.zeros((2, len(COLUMNS)), dtype=bool)
+    matrix[0, COLUMNS.index("python/uses_python")] = True
+    links = ["https://github.com/owner/repo", "https://github.com/other/repo"]
+    save_stats_matrix(tmp_path / "storage" / "icml2023_stats.npz", matrix, links)
+    save_stats_matrix(tmp_path / "storage" / "icml2024_stats.npz", matrix, links)
+    store.store_venue("icml2024", None, links[:1], matrix[:1], COLUMNS)
+
+    assert backfill_results_store(store) == ["icml2023"]
+    assert backfill_results_store(store) == []
+    assert store.stats_matrix("icml2023", COLUMNS)[1] == links
+    assert store.stats_matrix("icml2024", COLUMNS)[1] == links[:1]
+    store.close()
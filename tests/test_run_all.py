@@ -0,0 +1,120 @@
+"""Test the venue orchestrator."""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from paper_crawler._results_store import configure_results_store
+from paper_crawler.run_all import Budget, Task, build_tasks, run_tasks
+
+
+def test_run_tasks(tmp_path: Path) -> None:
+    """Check dependencies, up to date outputs and failures."""
+    order: list[str] = []
+
+    def _write(name: str, path: Path) -> None:
+        order.append(name)
+        path.write_text(name)
+
+    def _fail() -> None:
+        raise RuntimeError("no network")
+
+    fresh = tmp_path / "fresh.json"
+    fresh.write_text("fresh")
+    papers, pages = tmp_path / "papers.json", tmp_path / "pages.json"
+    tasks = [
+        Task("a:papers", lambda: _write("a:papers", papers), [], [papers], [], {}),
+        Task(
+            "a:pages",
+            lambda: _write("a:pages", pages),
+            [papers],
+            [pages],
+            ["a:papers"],
+            {},
+        ),
+        Task("b:papers", lambda: _write("b", fresh), [], [fresh], [], {}),
+        Task("c:papers", _fail, [], [tmp_path / "c.json"], [], {}),
+        Task("c:pages", lambda: None, [], [], ["c:papers"], {}),
+    ]
+    status = run_tasks(tasks, Budget({}), jobs=4)
+    assert order == ["a:papers", "a:pages"]
+    assert status == {
+        "a:papers": "done",
+        "a:pages": "done",
+        "b:papers": "up to date",
+        "c:papers": "failed",
+        "c:pages": "blocked",
+    }
+    # the output is older than its input now.
+    time.sleep(0.01)
+    papers.write_text("new")
+    assert run_tasks(tasks[:2], Budget({}), dry_run=True) == {
+        "a:papers": "up to date",
+        "a:pages": "would run",
+    }
+
+
+def test_budget() -> None:
+    """Make sure tasks never hold more than the budget."""
+    budget = Budget({"network": 3})
+    held = []
+    lock = threading.Lock()
+    current = [0]
+
+    def _download(amount: int) -> None:
+        with budget.reserve({"network": amount}):
+            with lock:
+                current[0] += min(amount, 3)
+                held.append(current[0])
+            time.sleep(0.01)
+            with lock:
+                current[0] -= min(amount, 3)
+
+    workers = [
+        threading.Thread(target=_download, args=(amount,)) for amount in [2, 2, 1, 5]
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert max(held) <= 3
+
+
+def test_build_tasks() -> None:
+    """Check the stages of a venue depend on each other."""
+    tasks = {task.name: task for task in build_tasks(["icml2024", "tmlr", "mloss"])}
+    assert tasks["icml2024:pages"].deps == ["icml2024:papers"]
+    assert tasks["icml2024:stats"].deps == ["icml2024:pages"]
+    assert tasks["tmlr:pages"].deps == tasks["mloss:pages"].deps == ["jmlr:papers"]
+    assert len(tasks) == 8
+    # stats stages may open browsers for sub-folders.
+    assert tasks["icml2024:stats"].needs == {"network": 1, "browser": 1}
+    tasks = {
+        task.name: task for task in build_tasks(["icml2024"], resolver="http-only")
+    }
+    assert tasks["icml2024:stats"].needs["browser"] == 0
+
+
+def test_stats_missing_from_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A stats stage with its files but without rows in the store runs again."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "storage").mkdir()
+    for name in ["icml2024_filtered.jsonl.gz", "icml2024_stored_counters.pkl"]:
+        (tmp_path / "storage" / name).write_text("")
+
+    def _stats_status() -> str:
+        tasks = [
+            task for task in build_tasks(["icml2024"]) if task.name.endswith("stats")
+        ]
+        return run_tasks(tasks, Budget({}), dry_run=True)["icml2024:stats"]
+
+    configure_results_store(tmp_path / "storage" / "results.sqlite")
+    try:
+        assert _stats_status() == "would run"
+    finally:
+        configure_results_store(None)
+    assert _stats_status() == "up to date"
@@ -1,14 +1,23 @@
 """Test the pdfs from html crawl code."""
 
+import time
 import urllib
+from pathlib import Path
+from typing import Union
 
+import pytest
+
+import paper_crawler.crawl_links_soup
+from paper_crawler._pdf_links import PDF_EXTRACTORS, configure_pdf_extractor
 from paper_crawler.crawl_links_selenium import get_iclr_pdf_2018, get_iclr_pdf_2019
 from paper_crawler.crawl_links_soup import (
+    _derive_nips_pdf,
     get_iclr_2016_pdf,
     get_icml_2023_pdf,
     get_icml_2024_pdf,
     get_nips_pdf,
     process_link,
+    process_links,
 )
 
 
@@ -49,6 +58,30 @@ def test_nips_pdf() -> None:
     assert len(pdf_list) == 94
 
 
+def test_nips_pdf_concurrent() -> None:
+    """Check the concurrent links match the sequential ones."""
+    pdf_list = get_nips_pdf(1988)
+    assert get_nips_pdf(1988, concurrency=4) == pdf_list
+    # derived links only miss the supplementary PDFs.
+    derived = get_nips_pdf(1988, concurrency=4, derive_urls=True)
+    assert [link for link in pdf_list if link in derived] == derived
+    assert all("Supplemental" in link for link in set(pdf_list) - set(derived))
+
+
+def test_derive_nips_pdf() -> None:
+    """Check the PDF link is derived from the abstract link."""
+    folder = "/paper_files/paper/2023"
+    assert (
+        _derive_nips_pdf(f"{folder}/hash/0a1b-Abstract-Conference.html")
+        == f"https://papers.nips.cc{folder}/file/0a1b-Paper-Conference.pdf"
+    )
+    assert (
+        _derive_nips_pdf(f"{folder}/hash/0a1b-Abstract.html")
+        == f"https://papers.nips.cc{folder}/file/0a1b-Paper.pdf"
+    )
+    assert _derive_nips_pdf("/paper/1988/other.html") is None
+
+
 def test_iclr_pdf_2019() -> None:
     """Check if the soup crawler works for ICLR 2019."""
     pdf_list = get_iclr_pdf_2019()
@@ -65,3 +98,70 @@ def test_iclr_pdf_2016() -> None:
     """Check if the soup crawler works for ICLR 2016."""
     pdf_list = get_iclr_2016_pdf()
     assert len(pdf_list) == 65 + 15  # 65 poster papers, 15 orals
+
+
+def _fake_process_link(url: str, pdf: bytes) -> Union[list[str], None]:
+    if url == "stuck":
+        time.sleep(60)
+    return [pdf.decode()]
+
+
+def _fake_download_pdf(url: str) -> bytes:
+    if url == "missing":
+        raise ValueError("Not found.")
+    return f"pdf {url}".encode()
+
+
+def test_process_links_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Check the pool keeps the order and skips PDFs that take too long."""
+    monkeypatch.setattr(
+        paper_crawler.crawl_links_soup, "process_link", _fake_process_link
+    )
+    monkeypatch.setattr(
+        paper_crawler.crawl_links_soup, "download_pdf", _fake_download_pdf
+    )
+    links = ["a", "stuck", "b", "missing", "c"]
+    res = list(process_links(links, workers=2, timeout=1, concurrency=3))
+    assert res == [["pdf a"], None, ["pdf b"], None, ["pdf c"]]
+
+
+def _minimal_pdf(uri: bytes) -> bytes:
+    """Build a one-page PDF with a link annotation and a valid xref table."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Annots [4 0 R] >>",
+        b"<< /Type /Annot /Subtype /Link /Rect [0 0 100 20] /A << /S /URI /URI ("
+        + uri
+        + b") >> >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, content in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + content + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    return pdf + b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+
+
+def test_process_downloaded_pdf(tmp_path: Path) -> None:
+    """Parse a PDF from memory and from a memory-mapped file, with both extractors."""
+    pdf = _minimal_pdf(b"https://github.com/owner/repo")
+    path = tmp_path / "paper.pdf"
+    path.write_bytes(pdf)
+    try:
+        for extractor in PDF_EXTRACTORS:
+            configure_pdf_extractor(extractor)
+            for source in [pdf, path]:
+                links = process_link("https://example.com/paper.pdf", source)
+                assert links is not None
+                assert (
+                    urllib.parse.urlunparse(links[0]) == "https://github.com/owner/repo"
+                )
+    finally:
+        configure_pdf_extractor("pdfx")